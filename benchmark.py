@@ -3,17 +3,69 @@ Módulo de Benchmark - Staircase Problem
 
 Realiza benchmark das implementações com:
 - Conjunto fixo de dados (inputs.txt)
-- 30 execuções para cada tamanho
-- Cálculo da mediana do tempo e memória
+- Amostragem por tamanho: 30 execuções por padrão (num_executions) ou,
+  com --adaptive, de DEFAULT_MIN_EXECUTIONS a DEFAULT_MAX_EXECUTIONS
+  amostras, até o IC da mediana ficar dentro de --target-ci ou o
+  orçamento --time-budget acabar; o cabeçalho de cada execução imprime a
+  política em uso
+- Cálculo da mediana do tempo e memória, e dos percentis p90/p99, com
+  esboços de quantis (sketch.TDigest) de memória limitada e combináveis
+- Modo modular opcional (--mod M), medido ao lado do modo exato
+- Modo lote opcional (--batch): todas as consultas em uma chamada
+- Modo vetorizado opcional (--vectorized): lotes modulares com NumPy
+- Instrumentação opcional (--instrument): chamadas e profundidade da recursão
+- Escalabilidade da força bruta paralela (--parallel) com 1..N processos
+- Protocolo de medição registrado nas saídas (--protocol, ver measurement.py):
+  por padrão, aquecimento, tempo sem tracemalloc e com gc desligado, e
+  memória em passagens próprias
+- Execuções curtas demais (< 100 µs) são agrupadas em lotes, no estilo do
+  timeit, e o tempo registrado é o tempo por chamada
+- Ajuste empírico de complexidade (complexity.py) de cada série medida,
+  comparado com a complexidade declarada em ABORDAGENS.md; o modelo
+  ajustado prevê o tempo dos próximos N, e testes previstos acima do limite
+  de tempo são registrados como timeout sem executar
+- Cada execução é gravada no histórico SQLite (history.py), onde
+  `python history.py compare` detecta regressões entre commits
+- Resultados reaproveitados do cache (resultcache.py) quando o código da
+  implementação, o N, o protocolo e o interpretador não mudaram; --force
+  mede tudo de novo
+- Cada par (algoritmo, N) concluído vai para um diário em disco
+  (journal.py); --resume retoma uma execução interrompida
+- Medições distribuídas entre núcleos (--jobs), cada processo preso ao seu
+  núcleo, das mais longas para as mais curtas (scheduler.py)
+- Resultados também no formato binário por colunas (--npz, columnar.py),
+  lido coluna a coluna por generate_graphs.py
+- Cada medição roda em um subprocesso novo, com limite de tempo (--timeout);
+  medições interrompidas ficam registradas como TIMEOUT
 """
 
+import argparse
+import multiprocessing
+import os
 import statistics
 import time
 import tracemalloc
-from dpclimb import climb_stairs_dp
-from recursiveclimb import climb_stairs_recursive
-from executiontime import format_time
-from memoryconsumer import format_memory
+from functools import partial
+from dpclimb import (climb_stairs_dp, climb_stairs_fast, climb_stairs_checkpointed, parse_modulus,
+                     climb_stairs_dp_many, climb_stairs_fast_many)
+from recursiveclimb import (climb_stairs_recursive, climb_stairs_iterative_stack, instrumentation_for,
+                            climb_stairs_recursive_parallel, DEFAULT_FRONTIER_DEPTH)
+from stepclimb import climb_stairs_steps, climb_stairs_steps_kitamasa
+from complexity import RuntimePredictor, fit_complexity, CALIBRATION_NS, EXPONENTIAL_MODEL
+from journal import DEFAULT_JOURNAL, Journal
+from scheduler import DEFAULT_RESERVED_CORES, Task, available_cores, run_tasks
+from resultcache import DEFAULT_CACHE, ResultCache, cache_key
+from history import DEFAULT_DATABASE, record_run
+from executiontime import (format_time, autorange, measure_per_call_time, SHORT_RUN_THRESHOLD,
+                           DEFAULT_MIN_SAMPLE_TIME)
+from memoryconsumer import measure_memory, format_memory
+from measurement import (PROTOCOLS, PROTOCOL_SEPARATE, DEFAULT_PROTOCOL, DEFAULT_WARMUP,
+                         DEFAULT_MEMORY_EXECUTIONS, DEFAULT_CONFIDENCE, DEFAULT_TARGET_CI,
+                         DEFAULT_TIME_BUDGET, DEFAULT_MIN_EXECUTIONS, DEFAULT_MAX_EXECUTIONS,
+                         check_protocol, describe_protocol, warm_up, measure_time_without_gc,
+                         median_confidence_interval, relative_ci_width,
+                         digest_confidence_interval, digest_relative_ci_width)
+from sketch import DEFAULT_PERCENTILES, RunningStats, TDigest
 
 
 def read_inputs(filename='inputs.txt'):
@@ -49,7 +101,10 @@ def read_inputs(filename='inputs.txt'):
 
 def measure_single_execution(func, n):
     """
-    Mede tempo e memória de uma única execução.
+    Mede tempo e memória de uma única execução (protocolo 'combinado').
+    
+    O tempo inclui o custo do tracemalloc; o protocolo 'separado' de
+    run_benchmark evita essa distorção.
     
     Args:
         func: Função a ser executada
@@ -76,64 +131,400 @@ def measure_single_execution(func, n):
     return execution_time, memory_used
 
 
-def run_benchmark(func, n, num_executions=30):
+def run_benchmark(func, n, num_executions=30, protocol=DEFAULT_PROTOCOL, warmup=DEFAULT_WARMUP,
+                  memory_executions=DEFAULT_MEMORY_EXECUTIONS, adaptive=False,
+                  target_ci=DEFAULT_TARGET_CI, time_budget=DEFAULT_TIME_BUDGET,
+                  min_executions=DEFAULT_MIN_EXECUTIONS, max_executions=DEFAULT_MAX_EXECUTIONS,
+                  confidence=DEFAULT_CONFIDENCE, batch_short_runs=True,
+                  min_sample_time=DEFAULT_MIN_SAMPLE_TIME):
     """
     Executa benchmark com múltiplas execuções.
     
+    No protocolo 'separado', as execuções de aquecimento são descartadas,
+    as passagens de tempo rodam com o gc desligado e sem tracemalloc, e a
+    memória vem de memory_executions passagens próprias. No protocolo
+    'combinado', cada execução mede tempo e memória juntos
+    (measure_single_execution).
+    
+    No modo adaptativo, num_executions é ignorado: a amostragem continua
+    até o intervalo de confiança da mediana ter largura relativa
+    <= target_ci (com ao menos min_executions amostras), até o orçamento
+    time_budget acabar ou até max_executions amostras. Em qualquer modo, o
+    IC alcançado é devolvido nas estatísticas.
+    
+    Se uma execução dura menos que SHORT_RUN_THRESHOLD (protocolo
+    'separado'), cada amostra passa a ser um lote de chamadas com duração
+    >= min_sample_time (executiontime.measure_per_call_time) e os tempos
+    são por chamada; 'calls_per_sample' registra o tamanho do lote.
+    
+    Os tempos ficam em memória (no máximo max_executions floats) para que
+    a mediana e seu IC, inclusive o critério de parada adaptativo, sejam
+    calculados da amostra exata: os centróides internos de um t-digest são
+    grossos demais para isso. Cada amostra alimenta também um t-digest e
+    um acumulador de Welford; os esboços vão junto nas estatísticas
+    ('time_sketch' e 'memory_sketch'), para combinar resultados de vários
+    processos (combine_stats).
+    
     Args:
         func: Função a ser testada
         n (int): Tamanho da entrada
-        num_executions (int): Número de execuções (padrão: 30)
+        num_executions (int): Número de execuções de tempo (padrão: 30)
+        protocol (str): Protocolo de medição ('separado' ou 'combinado')
+        warmup (int): Execuções de aquecimento (protocolo 'separado')
+        memory_executions (int): Passagens de memória (protocolo 'separado')
+        adaptive (bool): Se True, escolhe o número de execuções sozinho
+        target_ci (float): Largura relativa alvo do IC da mediana (ex.: 0.05)
+        time_budget (float): Orçamento de tempo da amostragem, em segundos
+        min_executions (int): Mínimo de amostras no modo adaptativo
+        max_executions (int): Máximo de amostras no modo adaptativo
+        confidence (float): Nível de confiança do IC
+        batch_short_runs (bool): Se False, nunca agrupa chamadas
+        min_sample_time (float): Duração mínima de uma amostra agrupada
         
     Returns:
         dict: Dicionário com estatísticas
     """
-    times = []
-    memories = []
+    check_protocol(protocol)
+    if protocol != PROTOCOL_SEPARATE:
+        warmup = 0
+    
+    times, time_stats = TDigest(), RunningStats()
+    memories, memory_stats = TDigest(), RunningStats()
+    samples = []
     
-    print(f"  Executando {num_executions} vezes...", end='', flush=True)
+    if adaptive:
+        print(f"  Amostragem adaptativa (IC alvo ±{target_ci / 2:.1%}, "
+              f"orçamento {format_time(time_budget)})...", end='', flush=True)
+    else:
+        print(f"  Executando {num_executions} vezes...", end='', flush=True)
     
-    for i in range(num_executions):
-        exec_time, memory = measure_single_execution(func, n)
-        times.append(exec_time)
-        memories.append(memory)
+    warm_up(func, n, runs=warmup)
+    
+    # Execução curta demais para o cronômetro: agrupa chamadas por amostra
+    calls_per_sample = 1
+    if protocol == PROTOCOL_SEPARATE and batch_short_runs:
+        _, probe = measure_time_without_gc(func, n)
+        if probe < SHORT_RUN_THRESHOLD:
+            calls_per_sample = autorange(func, n, min_time=min_sample_time)
+            print(f" [{calls_per_sample} chamadas/amostra]", end='', flush=True)
+    
+    start = time.perf_counter()
+    next_check = min_executions
+    while True:
+        if calls_per_sample > 1:
+            _, exec_time, _ = measure_per_call_time(func, n, number=calls_per_sample)
+        elif protocol == PROTOCOL_SEPARATE:
+            _, exec_time = measure_time_without_gc(func, n)
+        else:
+            exec_time, memory = measure_single_execution(func, n)
+            memories.add(memory)
+            memory_stats.add(memory)
+        samples.append(exec_time)
+        times.add(exec_time)
+        time_stats.add(exec_time)
+        count = time_stats.count
         
         # Indicador de progresso
-        if (i + 1) % 10 == 0:
-            print(f" {i+1}", end='', flush=True)
+        if not adaptive and count % 10 == 0:
+            print(f" {count}", end='', flush=True)
+        
+        if not adaptive:
+            if count >= num_executions:
+                break
+            continue
+        
+        if count >= max_executions or time.perf_counter() - start >= time_budget:
+            break
+        # Ordenar a cada amostra custaria O(n² log n): reavalia o IC a cada ~10%
+        if count >= next_check:
+            if relative_ci_width(samples, confidence) <= target_ci:
+                break
+            next_check = max(count + 1, int(count * 1.1))
+    
+    num_executions = time_stats.count
     
-    print(" ✓")
+    # Passagens de memória, separadas das de tempo
+    if protocol == PROTOCOL_SEPARATE:
+        memory_executions = max(1, min(memory_executions, num_executions))
+        for _ in range(memory_executions):
+            _, memory = measure_memory(func, n)
+            memories.add(memory)
+            memory_stats.add(memory)
+    else:
+        memory_executions = num_executions
     
-    # Calcular estatísticas
+    stats = summarize_samples(times, time_stats, memories, memory_stats, confidence,
+                              samples=samples)
+    if adaptive:
+        print(f" ✓ ({num_executions} execuções, IC ±{stats['ci_relative_width'] / 2:.1%})")
+    else:
+        print(" ✓")
+    
+    stats.update({
+        'num_executions': num_executions,
+        'calls_per_sample': calls_per_sample,
+        'adaptive': adaptive,
+        'protocol': protocol,
+        'warmup': warmup,
+        'memory_executions': memory_executions
+    })
+    
+    return stats
+
+
+def summarize_samples(times, time_stats, memories, memory_stats, confidence=DEFAULT_CONFIDENCE,
+                      samples=None):
+    """
+    Estatísticas de tempo e memória a partir dos esboços das amostras.
+    
+    Args:
+        times (TDigest): Esboço dos tempos
+        time_stats (RunningStats): Média e variância dos tempos
+        memories (TDigest): Esboço das memórias
+        memory_stats (RunningStats): Média e variância das memórias
+        confidence (float): Nível de confiança do IC da mediana
+        samples (list): Tempos brutos, se disponíveis: a mediana e o IC
+            saem deles, exatos (sem eles, do esboço, como em combine_stats)
+        
+    Returns:
+        dict: Mediana, IC, média, extremos, desvio, percentis
+            (p50/p90/p99) e os esboços serializados
+    """
+    if samples:
+        ci_low, ci_high = median_confidence_interval(samples, confidence)
+        median_time = statistics.median(samples)
+        ci_width = relative_ci_width(samples, confidence)
+    else:
+        ci_low, ci_high = digest_confidence_interval(times, confidence)
+        median_time = times.quantile(0.5)
+        ci_width = digest_relative_ci_width(times, confidence)
     stats = {
-        'median_time': statistics.median(times),
-        'mean_time': statistics.mean(times),
-        'min_time': min(times),
-        'max_time': max(times),
-        'stdev_time': statistics.stdev(times) if len(times) > 1 else 0,
-        'median_memory': statistics.median(memories),
-        'mean_memory': statistics.mean(memories),
-        'min_memory': min(memories),
-        'max_memory': max(memories),
-        'stdev_memory': statistics.stdev(memories) if len(memories) > 1 else 0,
-        'num_executions': num_executions
+        'median_time': median_time,
+        'ci_low_time': ci_low,
+        'ci_high_time': ci_high,
+        'ci_relative_width': ci_width,
+        'confidence': confidence,
+        'mean_time': time_stats.mean,
+        'min_time': times.min,
+        'max_time': times.max,
+        'stdev_time': time_stats.stdev,
+        'median_memory': memories.quantile(0.5),
+        'mean_memory': memory_stats.mean,
+        'min_memory': memories.min,
+        'max_memory': memories.max,
+        'stdev_memory': memory_stats.stdev,
     }
+    for p, value in times.percentiles(DEFAULT_PERCENTILES).items():
+        stats[f'p{p}_time'] = value
+    for p, value in memories.percentiles(DEFAULT_PERCENTILES).items():
+        stats[f'p{p}_memory'] = value
+    stats['time_sketch'] = times.to_dict()
+    stats['memory_sketch'] = memories.to_dict()
+    return stats
+
+
+def combine_stats(stats_list):
+    """
+    Combina as estatísticas de várias medições do mesmo par (algoritmo, N).
+    
+    Útil quando as execuções de um teste são divididas entre processos ou
+    máquinas: os esboços (t-digest) e os acumuladores de Welford são
+    combinados sem as amostras originais.
+    
+    Args:
+        stats_list (list): Estatísticas de run_benchmark (com 'time_sketch'
+            e 'memory_sketch'), do mesmo protocolo
+        
+    Returns:
+        dict: Estatísticas combinadas, no formato de run_benchmark
+    """
+    if not stats_list:
+        raise ValueError("é preciso ao menos um resultado")
+    times, time_stats = TDigest(), RunningStats()
+    memories, memory_stats = TDigest(), RunningStats()
+    for stats in stats_list:
+        times.merge(TDigest.from_dict(stats['time_sketch']))
+        memories.merge(TDigest.from_dict(stats['memory_sketch']))
+        time_stats.merge(RunningStats.from_summary(
+            stats['num_executions'], stats['mean_time'], stats['stdev_time']))
+        memory_stats.merge(RunningStats.from_summary(
+            stats['memory_executions'], stats['mean_memory'], stats['stdev_memory']))
     
+    first = stats_list[0]
+    combined = summarize_samples(times, time_stats, memories, memory_stats,
+                                 first.get('confidence', DEFAULT_CONFIDENCE))
+    combined.update({
+        'num_executions': time_stats.count,
+        'calls_per_sample': first.get('calls_per_sample', 1),
+        'adaptive': any(stats.get('adaptive') for stats in stats_list),
+        'protocol': first.get('protocol', DEFAULT_PROTOCOL),
+        'warmup': first.get('warmup', 0),
+        'memory_executions': memory_stats.count
+    })
+    return combined
+
+
+def timeout_stats(timeout, protocol=DEFAULT_PROTOCOL, predicted_time=None):
+    """
+    Estatísticas de uma medição interrompida pelo limite de tempo.
+    
+    Args:
+        timeout (float): Limite de tempo que foi excedido, em segundos
+        protocol (str): Protocolo de medição que estava em uso
+        predicted_time (float): Se informado, a medição nem foi executada:
+            o tempo previsto por execução já excedia o limite
+        
+    Returns:
+        dict: Registro com status 'timeout' (ou 'timeout_previsto') e
+            nenhuma execução concluída
+    """
+    stats = {'status': 'timeout', 'timeout': timeout, 'num_executions': 0, 'protocol': protocol}
+    if predicted_time is not None:
+        stats.update(status='timeout_previsto', predicted_time=predicted_time)
     return stats
 
 
-def print_benchmark_header():
-    """Imprime o cabeçalho do benchmark."""
+def is_timeout(stats):
+    """Indica se as estatísticas registram uma medição interrompida ou prevista como tal."""
+    return stats.get('status') in ('timeout', 'timeout_previsto')
+
+
+def _isolated_worker(conn, func, n, num_executions, instrument, protocol_options):
+    """
+    Corpo do subprocesso de run_isolated_benchmark.
+    
+    Envia pelo pipe ('ok', stats) ou ('error', mensagem).
+    """
+    try:
+        stats = run_benchmark(func, n, num_executions, **protocol_options)
+        if instrument:
+            add_recursion_counters(stats, func, n)
+        conn.send(('ok', stats))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_isolated_benchmark(func, n, num_executions=30, timeout=None, instrument=False,
+                           **protocol_options):
+    """
+    Executa run_benchmark em um subprocesso novo, com limite de tempo.
+    
+    O subprocesso é criado com o método 'spawn', então começa com um heap
+    limpo e sem estado de tracemalloc de medições anteriores. Se o limite
+    for excedido, o subprocesso é encerrado e a medição é registrada como
+    timeout em vez de bloquear o benchmark.
+    
+    Args:
+        func: Função a ser testada (deve ser serializável: função de
+            módulo ou functools.partial de uma)
+        n (int): Tamanho da entrada
+        num_executions (int): Número de execuções
+        timeout (float): Limite de tempo total em segundos (None: sem limite)
+        instrument (bool): Se True, coleta também os contadores da recursão
+        **protocol_options: protocol, warmup e memory_executions de run_benchmark
+        
+    Returns:
+        dict: Estatísticas de run_benchmark, ou timeout_stats(timeout)
+    """
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_isolated_worker,
+                              args=(sender, func, n, num_executions, instrument, protocol_options))
+    process.start()
+    sender.close()
+    
+    try:
+        # poll() retorna quando há resposta ou quando o subprocesso morre (EOF)
+        if not receiver.poll(timeout):
+            process.terminate()
+            process.join()
+            print(" ⏱")
+            return timeout_stats(timeout, protocol_options.get('protocol', DEFAULT_PROTOCOL))
+        try:
+            status, payload = receiver.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(f"subprocesso encerrado com código {process.exitcode}")
+    finally:
+        receiver.close()
+    
+    process.join()
+    if status == 'error':
+        raise RuntimeError(payload)
+    return payload
+
+
+def benchmark_configuration(protocol=DEFAULT_PROTOCOL, warmup=DEFAULT_WARMUP,
+                            memory_executions=DEFAULT_MEMORY_EXECUTIONS, adaptive=False,
+                            target_ci=DEFAULT_TARGET_CI, time_budget=DEFAULT_TIME_BUDGET,
+                            batch_short_runs=True, num_executions=30,
+                            min_executions=DEFAULT_MIN_EXECUTIONS,
+                            max_executions=DEFAULT_MAX_EXECUTIONS, confidence=DEFAULT_CONFIDENCE,
+                            min_sample_time=DEFAULT_MIN_SAMPLE_TIME, input_file='inputs.txt',
+                            inputs=None):
+    """
+    Descreve a configuração do benchmark: o protocolo de medição e a
+    política de amostragem efetivamente usada (mesmos parâmetros de
+    run_benchmark) e o conjunto de dados.
+    
+    Args:
+        input_file (str): Arquivo dos tamanhos das escadas
+        inputs (list): Tamanhos lidos do arquivo (None: não listados)
+        
+    Returns:
+        list: Linhas da configuração, sem marcador
+    """
+    if adaptive:
+        lines = [f"Número de execuções por teste: adaptativo, de {min_executions} a "
+                 f"{max_executions} (até o IC {confidence:.0%} da mediana ter largura "
+                 f"<= {target_ci:.0%}; orçamento {format_time(time_budget)})"]
+    else:
+        lines = [f"Número de execuções por teste: {num_executions}"]
+    lines.append("Métrica principal: MEDIANA")
+    lines.append(f"Conjunto de dados: {input_file}" +
+                 (f" ({', '.join(map(str, inputs))})" if inputs else ""))
+    lines.append(f"Protocolo: {describe_protocol(protocol, warmup, memory_executions)}")
+    if batch_short_runs and protocol == PROTOCOL_SEPARATE:
+        lines.append(f"Execuções < {format_time(SHORT_RUN_THRESHOLD)}: agrupadas em amostras "
+                     f">= {format_time(min_sample_time)} (tempo por chamada)")
+    return lines
+
+
+def print_benchmark_header(*args, **kwargs):
+    """Imprime o cabeçalho do benchmark (argumentos de benchmark_configuration)."""
     print("\n" + "="*80)
     print(" "*20 + "BENCHMARK - STAIRCASE PROBLEM")
     print("="*80)
     print("\nConfiguração:")
-    print("  • Número de execuções por teste: 30")
-    print("  • Métrica principal: MEDIANA")
-    print("  • Conjunto de dados: inputs.txt")
+    for line in benchmark_configuration(*args, **kwargs):
+        print(f"  • {line}")
     print("="*80 + "\n")
 
 
+def protocols_used(results):
+    """
+    Lista as descrições dos protocolos presentes nos resultados.
+    
+    Args:
+        results (dict): Resultados do benchmark
+        
+    Returns:
+        list: Descrições distintas (describe_protocol), na ordem de aparição
+    """
+    descriptions = []
+    for algo_results in results.values():
+        for stats in algo_results.values():
+            if 'protocol' not in stats or is_timeout(stats):
+                continue
+            description = describe_protocol(stats['protocol'], stats['warmup'],
+                                             stats['memory_executions'])
+            if description not in descriptions:
+                descriptions.append(description)
+    return descriptions
+
+
 def print_results_table(results):
     """
     Imprime tabela com os resultados do benchmark.
@@ -145,6 +536,8 @@ def print_results_table(results):
     
     print("\n" + "="*80)
     print("RESULTADOS DO BENCHMARK (MEDIANA)")
+    for description in protocols_used(results):
+        print(f"Protocolo: {description}")
     print("="*80 + "\n")
     
     for algo_name, algo_results in results.items():
@@ -153,9 +546,18 @@ def print_results_table(results):
         
         table_data = []
         for n, stats in algo_results.items():
+            if is_timeout(stats):
+                if 'predicted_time' in stats:
+                    label = f"TIMEOUT previsto (~{format_time(stats['predicted_time'])}/execução)"
+                else:
+                    label = f"TIMEOUT (> {format_time(stats['timeout'])})"
+                table_data.append([n, label, '-', '-', '-', '-', '-', 0])
+                continue
             row = [
                 n,
                 format_time(stats['median_time']),
+                format_time(stats['p90_time']) if 'p90_time' in stats else '-',
+                format_time(stats['p99_time']) if 'p99_time' in stats else '-',
                 format_memory(int(stats['median_memory'])),
                 format_time(stats['mean_time']),
                 format_time(stats['stdev_time']),
@@ -163,27 +565,32 @@ def print_results_table(results):
             ]
             table_data.append(row)
         
-        headers = ['N', 'Tempo (Mediana)', 'Memória (Mediana)', 
+        headers = ['N', 'Tempo (Mediana)', 'Tempo (p90)', 'Tempo (p99)', 'Memória (Mediana)',
                    'Tempo (Média)', 'Desvio Padrão', 'Execuções']
         print(tabulate(table_data, headers=headers, tablefmt='grid'))
 
 
-def save_results_to_file(results, filename='benchmark_results.txt'):
+def save_results_to_file(results, filename='benchmark_results.txt', fits=None,
+                         configuration=None):
     """
     Salva os resultados detalhados em arquivo texto.
     
     Args:
         results (dict): Resultados do benchmark
         filename (str): Nome do arquivo de saída
+        fits (dict): Ajustes de complexidade (fit_results), opcional
+        configuration (list): Linhas de benchmark_configuration da execução
+            (None: só os protocolos presentes nos resultados)
     """
+    if configuration is None:
+        configuration = [f"Protocolo: {description}" for description in protocols_used(results)]
     with open(filename, 'w', encoding='utf-8') as f:
         f.write("="*80 + "\n")
         f.write("RESULTADOS DO BENCHMARK - STAIRCASE PROBLEM\n")
         f.write("="*80 + "\n\n")
         f.write("Configuração:\n")
-        f.write("  • Número de execuções por teste: 30\n")
-        f.write("  • Métrica principal: MEDIANA\n")
-        f.write("  • Conjunto de dados: inputs.txt (100, 1000, 10000)\n")
+        for line in configuration:
+            f.write(f"  • {line}\n")
         f.write("\n" + "="*80 + "\n\n")
         
         for algo_name, algo_results in results.items():
@@ -194,89 +601,599 @@ def save_results_to_file(results, filename='benchmark_results.txt'):
             for n, stats in algo_results.items():
                 f.write(f"Tamanho da Escada (N): {n}\n")
                 f.write(f"{'-'*40}\n")
+                if is_timeout(stats):
+                    if 'predicted_time' in stats:
+                        f.write(f"TIMEOUT PREVISTO: não executado (previsão de "
+                                f"{format_time(stats['predicted_time'])} por execução)\n\n")
+                    else:
+                        f.write(f"TIMEOUT: interrompido após {format_time(stats['timeout'])}\n\n")
+                    continue
                 f.write(f"Tempo de Execução:\n")
                 f.write(f"  • Mediana: {format_time(stats['median_time'])}\n")
+                if 'ci_low_time' in stats:
+                    f.write(f"  • IC {stats['confidence']:.0%} da mediana: "
+                            f"[{format_time(stats['ci_low_time'])}, "
+                            f"{format_time(stats['ci_high_time'])}] "
+                            f"(largura relativa {stats['ci_relative_width']:.1%})\n")
                 f.write(f"  • Média:   {format_time(stats['mean_time'])}\n")
                 f.write(f"  • Mínimo:  {format_time(stats['min_time'])}\n")
                 f.write(f"  • Máximo:  {format_time(stats['max_time'])}\n")
                 f.write(f"  • Desvio:  {format_time(stats['stdev_time'])}\n")
+                if 'p90_time' in stats:
+                    f.write(f"  • p90:     {format_time(stats['p90_time'])}\n")
+                    f.write(f"  • p99:     {format_time(stats['p99_time'])}\n")
                 f.write(f"\nConsumo de Memória:\n")
                 f.write(f"  • Mediana: {format_memory(int(stats['median_memory']))}\n")
                 f.write(f"  • Média:   {format_memory(int(stats['mean_memory']))}\n")
                 f.write(f"  • Mínimo:  {format_memory(int(stats['min_memory']))}\n")
                 f.write(f"  • Máximo:  {format_memory(int(stats['max_memory']))}\n")
                 f.write(f"  • Desvio:  {format_memory(int(stats['stdev_memory']))}\n")
+                if 'p90_memory' in stats:
+                    f.write(f"  • p90:     {format_memory(int(stats['p90_memory']))}\n")
+                    f.write(f"  • p99:     {format_memory(int(stats['p99_memory']))}\n")
+                if 'calls' in stats:
+                    f.write(f"\nInstrumentação da Recursão:\n")
+                    f.write(f"  • Chamadas:               {stats['calls']}\n")
+                    f.write(f"  • Subproblemas repetidos: {stats['repeated_calls']}\n")
+                    f.write(f"  • Profundidade máxima:    {stats['max_depth']}\n")
                 f.write(f"\nNúmero de Execuções: {stats['num_executions']}\n")
+                if stats.get('calls_per_sample', 1) > 1:
+                    f.write(f"Chamadas por Amostra: {stats['calls_per_sample']} "
+                            f"(tempos por chamada)\n")
+                if 'memory_executions' in stats:
+                    f.write(f"Aquecimento: {stats['warmup']} | "
+                            f"Passagens de Memória: {stats['memory_executions']}\n")
                 f.write(f"\n")
+        
+        if fits:
+            f.write(f"\n{'='*80}\n")
+            f.write("AJUSTE EMPÍRICO DE COMPLEXIDADE\n")
+            f.write(f"{'='*80}\n\n")
+            for row in complexity_rows(fits, results):
+                for header, value in zip(COMPLEXITY_HEADERS, row):
+                    f.write(f"{header}: {value}\n")
+                f.write("\n")
     
     print(f"\n✓ Resultados detalhados salvos em: {filename}")
 
 
+# Colunas dos resultados (CSV e .npz), na ordem do CSV
+RESULT_FIELDS = [
+    'Algoritmo', 'N', 
+    'Mediana_Tempo_s', 'IC_Inf_Tempo_s', 'IC_Sup_Tempo_s', 'IC_Largura_Rel',
+    'Media_Tempo_s', 'Min_Tempo_s', 'Max_Tempo_s', 'DP_Tempo_s',
+    'P90_Tempo_s', 'P99_Tempo_s',
+    'Mediana_Memoria_bytes', 'Media_Memoria_bytes', 'Min_Memoria_bytes', 
+    'Max_Memoria_bytes', 'DP_Memoria_bytes', 'P90_Memoria_bytes', 'P99_Memoria_bytes',
+    'Chamadas', 'Profundidade_Max', 'Subproblemas_Repetidos',
+    'Num_Execucoes', 'Chamadas_por_Amostra', 'Protocolo', 'Aquecimento', 'Execucoes_Memoria',
+    'Tempo_Previsto_s', 'Status'
+]
+
+# Colunas de texto; no .npz as demais (exceto N) são float64, com NaN no lugar de vazio
+TEXT_RESULT_FIELDS = ('Algoritmo', 'Protocolo', 'Status')
+
+
+def result_rows(results):
+    """
+    Linhas dos resultados, uma por par (algoritmo, N), com as colunas de RESULT_FIELDS.
+    
+    Valores ausentes (timeouts, contadores não coletados) são ''.
+    
+    Args:
+        results (dict): Resultados do benchmark
+        
+    Yields:
+        dict: Coluna -> valor
+    """
+    for algo_name, algo_results in results.items():
+        for n, stats in algo_results.items():
+            if is_timeout(stats):
+                # Colunas numéricas vazias: a medição não terminou
+                row = dict.fromkeys(RESULT_FIELDS, '')
+                row.update({'Algoritmo': algo_name, 'N': n, 'Num_Execucoes': 0,
+                            'Protocolo': stats.get('protocol', ''),
+                            'Tempo_Previsto_s': stats.get('predicted_time', ''),
+                            'Status': stats['status']})
+                yield row
+                continue
+            yield {
+                'Algoritmo': algo_name,
+                'N': n,
+                'Mediana_Tempo_s': stats['median_time'],
+                'IC_Inf_Tempo_s': stats.get('ci_low_time', ''),
+                'IC_Sup_Tempo_s': stats.get('ci_high_time', ''),
+                'IC_Largura_Rel': stats.get('ci_relative_width', ''),
+                'Media_Tempo_s': stats['mean_time'],
+                'Min_Tempo_s': stats['min_time'],
+                'Max_Tempo_s': stats['max_time'],
+                'DP_Tempo_s': stats['stdev_time'],
+                'P90_Tempo_s': stats.get('p90_time', ''),
+                'P99_Tempo_s': stats.get('p99_time', ''),
+                'Mediana_Memoria_bytes': int(stats['median_memory']),
+                'Media_Memoria_bytes': int(stats['mean_memory']),
+                'Min_Memoria_bytes': int(stats['min_memory']),
+                'Max_Memoria_bytes': int(stats['max_memory']),
+                'DP_Memoria_bytes': int(stats['stdev_memory']),
+                'P90_Memoria_bytes': int(stats['p90_memory']) if 'p90_memory' in stats else '',
+                'P99_Memoria_bytes': int(stats['p99_memory']) if 'p99_memory' in stats else '',
+                'Chamadas': stats.get('calls', ''),
+                'Profundidade_Max': stats.get('max_depth', ''),
+                'Subproblemas_Repetidos': stats.get('repeated_calls', ''),
+                'Num_Execucoes': stats['num_executions'],
+                'Chamadas_por_Amostra': stats.get('calls_per_sample', 1),
+                'Protocolo': stats.get('protocol', ''),
+                'Aquecimento': stats.get('warmup', ''),
+                'Execucoes_Memoria': stats.get('memory_executions', ''),
+                'Tempo_Previsto_s': stats.get('predicted_time', ''),
+                'Status': 'ok'
+            }
+
+
 def save_results_to_csv(results, filename='benchmark_results.csv'):
     """
     Salva os resultados em formato CSV.
     
+    Um nome terminado em .npz grava o formato binário por colunas
+    (save_results_to_npz).
+    
     Args:
         results (dict): Resultados do benchmark
         filename (str): Nome do arquivo CSV
     """
     import csv
     
+    if filename.lower().endswith('.npz'):
+        save_results_to_npz(results, filename)
+        return
+    
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = [
-            'Algoritmo', 'N', 
-            'Mediana_Tempo_s', 'Media_Tempo_s', 'Min_Tempo_s', 'Max_Tempo_s', 'DP_Tempo_s',
-            'Mediana_Memoria_bytes', 'Media_Memoria_bytes', 'Min_Memoria_bytes', 
-            'Max_Memoria_bytes', 'DP_Memoria_bytes',
-            'Num_Execucoes'
-        ]
-        
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=RESULT_FIELDS)
         writer.writeheader()
-        
-        for algo_name, algo_results in results.items():
-            for n, stats in algo_results.items():
-                row = {
-                    'Algoritmo': algo_name,
-                    'N': n,
-                    'Mediana_Tempo_s': stats['median_time'],
-                    'Media_Tempo_s': stats['mean_time'],
-                    'Min_Tempo_s': stats['min_time'],
-                    'Max_Tempo_s': stats['max_time'],
-                    'DP_Tempo_s': stats['stdev_time'],
-                    'Mediana_Memoria_bytes': int(stats['median_memory']),
-                    'Media_Memoria_bytes': int(stats['mean_memory']),
-                    'Min_Memoria_bytes': int(stats['min_memory']),
-                    'Max_Memoria_bytes': int(stats['max_memory']),
-                    'DP_Memoria_bytes': int(stats['stdev_memory']),
-                    'Num_Execucoes': stats['num_executions']
-                }
-                writer.writerow(row)
+        writer.writerows(result_rows(results))
     
     print(f"✓ Resultados salvos em CSV: {filename}")
 
 
-def run_full_benchmark(input_file='inputs.txt', num_executions=30):
+def save_results_to_npz(results, filename='benchmark_results.npz'):
+    """
+    Salva os resultados no formato binário por colunas (ver columnar.py).
+    
+    Mesmas colunas do CSV; generate_graphs.py lê só as que cada gráfico usa.
+    
+    Args:
+        results (dict): Resultados do benchmark
+        filename (str): Nome do arquivo .npz
+    """
+    import numpy as np
+    from columnar import save_npz
+    
+    rows = list(result_rows(results))
+    columns = {}
+    for field in RESULT_FIELDS:
+        values = [row[field] for row in rows]
+        if field in TEXT_RESULT_FIELDS:
+            columns[field] = np.array([str(value) for value in values], dtype=str)
+        elif field == 'N':
+            columns[field] = np.array(values, dtype=np.int64)
+        else:
+            columns[field] = np.array([np.nan if value == '' else value for value in values],
+                                      dtype=np.float64)
+    save_npz(filename, columns)
+    
+    print(f"✓ Resultados salvos em formato colunar: {filename}")
+
+
+def add_recursion_counters(stats, func, n):
+    """
+    Acrescenta às estatísticas os contadores da recursão, se houver
+    versão instrumentada da implementação.
+    
+    A execução instrumentada é separada das medições, para não afetar
+    tempo e memória.
+    
+    Args:
+        stats (dict): Estatísticas de run_benchmark (modificado in-place)
+        func: Implementação medida
+        n (int): Tamanho da entrada
+        
+    Returns:
+        bool: True se os contadores foram coletados
+    """
+    profiler = instrumentation_for(func)
+    if profiler is None:
+        return False
+    _, counters = profiler(n)
+    stats.update(counters.as_dict())
+    return True
+
+
+# Complexidade de tempo declarada (ABORDAGENS.md e docstrings): algoritmo -> modelo
+CLAIMED_COMPLEXITY = {
+    '1. Recursão Pura (FORÇA BRUTA)': EXPONENTIAL_MODEL,
+    '2. Programação Dinâmica BOTTOM-UP': 'O(n)',
+    '3. Fast Doubling O(log n)': 'O(log n)',
+    '4. DP com Checkpoints (√n)': 'O(n)',
+    '5. Passos Genéricos (janela deslizante)': 'O(n)',
+    '6. Passos Genéricos (Kitamasa)': 'O(log n)',
+    '8. Força Bruta (pilha explícita)': EXPONENTIAL_MODEL,
+}
+
+
+def claimed_complexity(algo_name):
+    """Complexidade declarada de um algoritmo (ignora o sufixo [mod M])."""
+    return CLAIMED_COMPLEXITY.get(algo_name.split(' [mod ')[0])
+
+
+def exponential_predictor(algo_name, min_seconds=None):
+    """
+    Preditor de tempo de um algoritmo, só se ele for exponencial.
+    
+    Como em main.build_predictor, o modelo O(φ^n) é imposto aos algoritmos
+    declarados exponenciais (CLAIMED_COMPLEXITY). Os demais não têm
+    preditor e nunca são pulados por previsão: seus tempos de
+    microssegundos são ruidosos, e um ajuste livre pode escolher O(φ^n) e
+    prever séculos para N = 1000.
+    
+    Args:
+        algo_name (str): Nome do algoritmo (com ou sem o sufixo [mod M])
+        min_seconds (float): Piso de tempo do preditor (None: o padrão)
+        
+    Returns:
+        RuntimePredictor | None: Preditor sem medições, ou None
+    """
+    if claimed_complexity(algo_name) != EXPONENTIAL_MODEL:
+        return None
+    if min_seconds is None:
+        return RuntimePredictor(models=[EXPONENTIAL_MODEL])
+    return RuntimePredictor(models=[EXPONENTIAL_MODEL], min_seconds=min_seconds)
+
+
+def fit_results(results, min_points=3):
+    """
+    Ajusta a série de medianas de cada algoritmo aos modelos de complexidade.
+    
+    Args:
+        results (dict): Resultados do benchmark
+        min_points (int): Mínimo de N medidos para ajustar
+        
+    Returns:
+        dict: Nome do algoritmo -> lista de ModelFit (melhor primeiro)
+    """
+    fits = {}
+    for algo_name, algo_results in results.items():
+        measured = [(n, stats['median_time']) for n, stats in algo_results.items()
+                    if not is_timeout(stats)]
+        if len(measured) < min_points:
+            continue
+        ns, times = zip(*measured)
+        algo_fits = fit_complexity(ns, times)
+        if algo_fits:
+            fits[algo_name] = algo_fits
+    return fits
+
+
+def complexity_rows(fits, results):
+    """
+    Linhas do relatório de complexidade (uma por algoritmo).
+    
+    Returns:
+        list: [algoritmo, declarado, melhor ajuste, erro RMS, confere, resíduos, 2º melhor]
+    """
+    rows = []
+    for algo_name, algo_fits in fits.items():
+        best = algo_fits[0]
+        claimed = claimed_complexity(algo_name)
+        ns = [n for n, stats in results[algo_name].items() if not is_timeout(stats)]
+        residuals = ', '.join(f"{n}: {r:+.0%}" for n, r in zip(ns, best.residuals))
+        runner_up = (f"{algo_fits[1].model} ({algo_fits[1].rms_residual:.0%})"
+                     if len(algo_fits) > 1 else '-')
+        matches = '-' if claimed is None else ('sim' if claimed == best.model else 'NÃO')
+        rows.append([algo_name, claimed or '-', best.model, f"{best.rms_residual:.1%}",
+                     matches, residuals, runner_up])
+    return rows
+
+
+COMPLEXITY_HEADERS = ['Algoritmo', 'Declarado', 'Melhor Ajuste', 'Erro RMS', 'Confere',
+                      'Resíduos (N: relativo)', '2º Melhor']
+
+
+def print_complexity_report(fits, results):
+    """
+    Imprime o melhor modelo de complexidade de cada algoritmo, com resíduos.
+    
+    Args:
+        fits (dict): Saída de fit_results
+        results (dict): Resultados do benchmark
+    """
+    from tabulate import tabulate
+    
+    if not fits:
+        return
+    print("\n" + "="*80)
+    print("AJUSTE EMPÍRICO DE COMPLEXIDADE (t(n) = a + c·g(n), erro relativo)")
+    print("="*80 + "\n")
+    print(tabulate(complexity_rows(fits, results), headers=COMPLEXITY_HEADERS, tablefmt='grid'))
+    print("\nObs.: com inteiros grandes, cada soma custa O(n) bits; a DP tende a O(n²)"
+          " para N grande.")
+
+
+def calibrated_predictor(algo_name, func):
+    """
+    Preditor de tempo calibrado em CALIBRATION_NS, antes de qualquer medição.
+    
+    Só os algoritmos exponenciais têm preditor (exponential_predictor).
+    Execuções curtas são cronometradas em lotes (measure_per_call_time);
+    por isso o piso de tempo do preditor (MIN_RELIABLE_SECONDS, pensado
+    para execuções únicas) não se aplica.
+    
+    Args:
+        algo_name (str): Nome do algoritmo
+        func: Implementação a calibrar
+        
+    Returns:
+        RuntimePredictor | None: Preditor com os N de calibração, ou None
+            se o algoritmo não for exponencial
+    """
+    predictor = exponential_predictor(algo_name, min_seconds=0)
+    if predictor is not None:
+        predictor.calibrate(func, CALIBRATION_NS,
+                            timer=lambda f, n: measure_per_call_time(f, n)[:2])
+    return predictor
+
+
+def run_scheduled_benchmark(algorithms, inputs, num_executions=30, timeout=None, instrument=False,
+                            jobs=None, reserved_cores=DEFAULT_RESERVED_CORES, cache=None,
+                            force=False, cache_options=None, runs_per_test=1, journal=None,
+                            **protocol_options):
+    """
+    Mede os pares (algoritmo, N) em paralelo, com o escalonador de scheduler.py.
+    
+    O custo de cada par dos algoritmos exponenciais é previsto pelo modelo
+    O(φ^n) calibrado em N pequenos (calibrated_predictor); os pares mais
+    longos começam primeiro (os de custo desconhecido, antes de todos),
+    cada um em um subprocesso novo preso a um núcleo próprio. Pares
+    previstos acima do limite de tempo não rodam (timeout previsto), e um
+    timeout em N
+    cancela os N maiores do mesmo algoritmo que ainda não começaram. Pares
+    já presentes no diário não rodam de novo.
+    
+    Args:
+        algorithms (dict): Nome -> (função, N máximo ou None)
+        inputs (list): Tamanhos das escadas
+        num_executions (int): Número de execuções por teste
+        timeout (float): Limite de tempo por par (None: sem limite)
+        instrument (bool): Se True, coleta os contadores da recursão
+        jobs (int): Máximo de medições simultâneas (None: todos os núcleos
+            disponíveis)
+        reserved_cores (int): Núcleos deixados ociosos
+        cache (ResultCache): Cache de resultados (None: sempre mede)
+        force (bool): Se True, ignora o cache
+        cache_options (dict): Opções de medição que compõem a chave do cache
+        runs_per_test (int): Execuções de um teste (converte a previsão por
+            execução em custo total)
+        journal (Journal): Diário onde cada par concluído é registrado
+        **protocol_options: Opções de run_benchmark
+        
+    Returns:
+        dict: Resultados no mesmo formato do caminho serial
+    """
+    protocol = protocol_options.get('protocol', DEFAULT_PROTOCOL)
+    cores = available_cores(reserved_cores)[:jobs]
+    print(f"Escalonador: {len(cores)} processo(s) simultâneo(s), núcleos {cores} "
+          f"({reserved_cores} reservado(s)), mais longos primeiro\n")
+    
+    cells = {}  # (algoritmo, N) -> estatísticas
+    keys = {}
+    tasks = []
+    resumed = 0
+    
+    def record(cell, stats):
+        cells[cell] = stats
+        if journal is not None:
+            journal.record(*cell, stats)
+    
+    for algo_name, (func, max_n) in algorithms.items():
+        predictor = None
+        calibrated = False
+        for n in inputs:
+            if max_n is not None and n > max_n:
+                continue
+            journaled = journal.get(algo_name, n) if journal is not None else None
+            if journaled is not None:
+                cells[algo_name, n] = journaled
+                resumed += 1
+                continue
+            key = cache_key(func, n, cache_options) if cache is not None else None
+            cached = cache.get(key) if key is not None and not force else None
+            if cached is not None:
+                cached['cached'] = True
+                record((algo_name, n), cached)
+                continue
+            
+            if not calibrated:
+                predictor = calibrated_predictor(algo_name, func)
+                calibrated = True
+            predicted = predictor.predict(n) if predictor is not None else None
+            if timeout is not None and predicted is not None and predicted * runs_per_test > timeout:
+                record((algo_name, n), timeout_stats(timeout, protocol, predicted_time=predicted))
+                continue
+            keys[algo_name, n] = (key, predicted)
+            tasks.append(Task((algo_name, n), _isolated_worker,
+                              (func, n, num_executions, instrument, protocol_options),
+                              cost=None if predicted is None else predicted * runs_per_test))
+    
+    cached_count = sum(1 for stats in cells.values() if stats.get('cached'))
+    print(f"{len(tasks)} medição(ões) a executar, {resumed} retomada(s) do diário, "
+          f"{cached_count} do cache, {len(cells) - cached_count - resumed} com timeout previsto\n")
+    
+    def timed_out_before(task):
+        # Um N menor do mesmo algoritmo já excedeu o limite
+        algo_name, n = task.key
+        return any(name == algo_name and m < n and stats.get('status') == 'timeout'
+                   for (name, m), stats in cells.items())
+    
+    def on_done(task, outcome):
+        algo_name, n = task.key
+        status, payload = outcome
+        if status == 'ok':
+            key, predicted = keys[task.key]
+            if key is not None:
+                cache.put(key, dict(payload), algo_name, n)
+            if predicted is not None:
+                payload['predicted_time'] = predicted
+            record(task.key, payload)
+            print(f"  ✓ {algo_name}, N = {n}: mediana {format_time(payload['median_time'])}")
+        elif status in ('timeout', 'skipped'):
+            record(task.key, timeout_stats(timeout, protocol))
+            reason = ("interrompido após " + format_time(timeout) if status == 'timeout'
+                      else "N menor já excedeu o limite")
+            print(f"  ✗ {algo_name}, N = {n}: TIMEOUT ({reason})")
+        else:
+            print(f"  ✗ {algo_name}, N = {n}: Erro: {payload}")
+    
+    run_tasks(tasks, cores, timeout, skip=timed_out_before, on_done=on_done)
+    
+    # Mesma forma do caminho serial: algoritmos e N na ordem de entrada
+    results = {}
+    for algo_name in algorithms:
+        results[algo_name] = {n: cells[algo_name, n] for n in inputs if (algo_name, n) in cells}
+    return results
+
+
+def report_full_benchmark(results, configuration=None):
+    """
+    Imprime as tabelas e o ajuste de complexidade e salva os arquivos.
+    
+    Args:
+        results (dict): Resultados do benchmark completo
+        configuration (list): Linhas de benchmark_configuration da execução
+        
+    Returns:
+        dict: Os próprios resultados
+    """
+    print_results_table(results)
+    fits = fit_results(results)
+    print_complexity_report(fits, results)
+    
+    save_results_to_file(results, fits=fits, configuration=configuration)
+    save_results_to_csv(results)
+    
+    return results
+
+
+def run_full_benchmark(input_file='inputs.txt', num_executions=30, mod=None, instrument=False,
+                       timeout=None, isolate=True, protocol=DEFAULT_PROTOCOL, warmup=DEFAULT_WARMUP,
+                       memory_executions=DEFAULT_MEMORY_EXECUTIONS, cache=None, force=False,
+                       jobs=1, reserved_cores=DEFAULT_RESERVED_CORES, journal_file=DEFAULT_JOURNAL,
+                       resume=False, **sampling_options):
     """
     Executa o benchmark completo.
     
+    Cada par (algoritmo, N) é medido em um subprocesso próprio (ver
+    run_isolated_benchmark). Quando um algoritmo excede o limite de tempo
+    em um N, os N maiores também são marcados como timeout sem executar,
+    já que só levariam mais tempo.
+    
+    Antes de cada N de um algoritmo exponencial, o tempo é previsto pelo
+    modelo O(φ^n) ajustado aos N já medidos (exponential_predictor); os
+    demais algoritmos nunca são pulados por previsão. Se a previsão
+    para todas as execuções do teste passar do limite, o teste é marcado
+    como timeout previsto sem rodar. Ao final, cada série é ajustada aos
+    modelos candidatos e comparada com a complexidade declarada.
+    
+    Com um cache (resultcache.ResultCache), cada par (algoritmo, N) cuja
+    chave confere (mesmo código, N, opções de medição e interpretador) é
+    reaproveitado sem executar. Timeouts não são guardados.
+    
+    Cada par concluído é acrescentado ao diário (journal.Journal) na hora;
+    com resume=True, os pares já registrados por uma execução interrompida
+    com as mesmas opções não rodam de novo.
+    
+    Com jobs != 1, os pares são distribuídos entre núcleos pelo escalonador
+    (run_scheduled_benchmark), sempre em subprocessos isolados; os
+    resultados têm a mesma forma do caminho serial.
+    
     Args:
         input_file (str): Arquivo com os tamanhos das escadas
         num_executions (int): Número de execuções por teste
+        mod (int): Se informado, cada algoritmo também é medido no modo
+            modular (f(n) mod mod), logo após o modo exato
+        instrument (bool): Se True, registra chamadas, subproblemas
+            repetidos e profundidade máxima da recursão pura
+        timeout (float): Limite de tempo em segundos por par (algoritmo, N)
+            (None: sem limite)
+        isolate (bool): Se False, mede no próprio processo (sem limite de tempo)
+        protocol (str): Protocolo de medição (ver measurement.py)
+        warmup (int): Execuções de aquecimento (protocolo 'separado')
+        memory_executions (int): Passagens de memória (protocolo 'separado')
+        cache (ResultCache): Cache de resultados (None: sempre mede)
+        force (bool): Se True, ignora o cache e mede de novo (o cache é
+            atualizado com as novas medições)
+        jobs (int): Medições simultâneas (1: serial; None: todos os núcleos
+            disponíveis)
+        reserved_cores (int): Núcleos deixados ociosos no modo paralelo
+        journal_file (str): Arquivo do diário (None: sem diário)
+        resume (bool): Se True, retoma o diário em vez de começar um novo
+        **sampling_options: adaptive, target_ci, time_budget etc. de run_benchmark
     """
-    print_benchmark_header()
+    protocol_options = {'protocol': protocol, 'warmup': warmup,
+                        'memory_executions': memory_executions, **sampling_options}
+    print_benchmark_header(protocol, warmup, memory_executions, num_executions=num_executions,
+                           input_file=input_file, **sampling_options)
+    
+    # Execuções de um teste, para converter a previsão por execução em custo total
+    timing_executions = (sampling_options.get('min_executions', DEFAULT_MIN_EXECUTIONS)
+                         if sampling_options.get('adaptive') else num_executions)
+    runs_per_test = warmup + timing_executions + memory_executions
+    if timeout is not None:
+        print(f"Limite de tempo por medição: {format_time(timeout)}\n")
     
     # Ler inputs
     inputs = read_inputs(input_file)
-    print(f"Tamanhos das escadas (inputs.txt): {inputs}\n")
+    print(f"Tamanhos das escadas ({input_file}): {inputs}\n")
+    configuration = benchmark_configuration(protocol, warmup, memory_executions,
+                                            num_executions=num_executions, input_file=input_file,
+                                            inputs=inputs, **sampling_options)
     
     # Definir algoritmos a serem testados
     algorithms = {
         '1. Recursão Pura (FORÇA BRUTA)': (climb_stairs_recursive, None),
         '2. Programação Dinâmica BOTTOM-UP': (climb_stairs_dp, None),
+        '3. Fast Doubling O(log n)': (climb_stairs_fast, None),
+        '4. DP com Checkpoints (√n)': (climb_stairs_checkpointed, None),
+        '5. Passos Genéricos (janela deslizante)': (climb_stairs_steps, None),
+        '6. Passos Genéricos (Kitamasa)': (climb_stairs_steps_kitamasa, None),
+        '8. Força Bruta (pilha explícita)': (climb_stairs_iterative_stack, None),
     }
     
+    if mod is not None:
+        with_mod = {}
+        for algo_name, (func, max_n) in algorithms.items():
+            with_mod[algo_name] = (func, max_n)
+            with_mod[f"{algo_name} [mod {mod}]"] = (partial(func, mod=mod), max_n)
+        algorithms = with_mod
+    
     results = {}
+    # Opções que afetam o resultado de uma medição, para a chave do cache
+    cache_options = {'num_executions': num_executions, 'instrument': instrument, **protocol_options}
+    cache_hits = 0
+    
+    journal = None
+    if journal_file is not None:
+        journal = Journal(journal_file, {**cache_options, 'timeout': timeout}, resume)
+        if resume:
+            print(f"Retomando {journal_file}: {len(journal)} par(es) já concluído(s)\n")
+    
+    if jobs != 1:
+        return report_full_benchmark(run_scheduled_benchmark(
+            algorithms, inputs, num_executions, timeout, instrument, jobs, reserved_cores, cache,
+            force, cache_options, runs_per_test, journal, **protocol_options), configuration)
+    
+    def record(algo_name, n, stats):
+        results[algo_name][n] = stats
+        if journal is not None:
+            journal.record(algo_name, n, stats)
     
     # Executar benchmark para cada algoritmo
     for algo_name, (func, max_n) in algorithms.items():
@@ -285,6 +1202,9 @@ def run_full_benchmark(input_file='inputs.txt', num_executions=30):
         print(f"{'='*80}")
         
         results[algo_name] = {}
+        previous_calls = None
+        timed_out_at = None
+        predictor = exponential_predictor(algo_name)
         
         for n in inputs:
             # Verificar se n excede o limite para o algoritmo
@@ -292,42 +1212,430 @@ def run_full_benchmark(input_file='inputs.txt', num_executions=30):
                 print(f"\nN = {n}: PULADO (muito lento para este algoritmo)")
                 continue
             
-            print(f"\nN = {n}:")
+            journaled = journal.get(algo_name, n) if journal is not None else None
+            if journaled is not None:
+                results[algo_name][n] = journaled
+                if is_timeout(journaled):
+                    timed_out_at = n
+                elif predictor is not None:
+                    predictor.add(n, journaled['median_time'])
+                print(f"\nN = {n}: retomado do diário")
+                continue
+            
+            if timed_out_at is not None and n >= timed_out_at:
+                print(f"\nN = {n}: TIMEOUT (N = {timed_out_at} já excedeu o limite)")
+                record(algo_name, n, timeout_stats(timeout, protocol))
+                continue
+            
+            key = cache_key(func, n, cache_options) if cache is not None else None
+            cached = cache.get(key) if key is not None and not force else None
+            if cached is not None:
+                cached['cached'] = True
+                record(algo_name, n, cached)
+                if predictor is not None:
+                    predictor.add(n, cached['median_time'])
+                cache_hits += 1
+                print(f"\nN = {n}: do cache → Mediana Tempo: {format_time(cached['median_time'])}")
+                continue
+            
+            predicted = predictor.predict(n) if predictor is not None else None
+            if timeout is not None and predicted is not None and predicted * runs_per_test > timeout:
+                print(f"\nN = {n}: TIMEOUT PREVISTO ({format_time(predicted)} por execução pelo "
+                      f"modelo {predictor.best_fit().model}; {runs_per_test} execuções excedem "
+                      f"{format_time(timeout)})")
+                record(algo_name, n, timeout_stats(timeout, protocol, predicted_time=predicted))
+                timed_out_at = n
+                continue
+            
+            print(f"\nN = {n}:" + (f" (previsão: {format_time(predicted)})" if predicted else ""))
             try:
-                stats = run_benchmark(func, n, num_executions)
-                results[algo_name][n] = stats
+                if isolate:
+                    stats = run_isolated_benchmark(func, n, num_executions, timeout, instrument,
+                                                   **protocol_options)
+                else:
+                    stats = run_benchmark(func, n, num_executions, **protocol_options)
+                    if instrument:
+                        add_recursion_counters(stats, func, n)
+                if is_timeout(stats):
+                    record(algo_name, n, stats)
+                    print(f"  ✗ TIMEOUT: interrompido após {format_time(timeout)}")
+                    timed_out_at = n
+                    continue
+                
+                if key is not None:
+                    cache.put(key, dict(stats), algo_name, n)
+                if predicted is not None:
+                    stats['predicted_time'] = predicted
+                record(algo_name, n, stats)
+                if predictor is not None:
+                    predictor.add(n, stats['median_time'])
                 
                 # Mostrar resultado imediato
                 print(f"  → Mediana Tempo: {format_time(stats['median_time'])}")
                 print(f"  → Mediana Memória: {format_memory(int(stats['median_memory']))}")
                 
+                if 'calls' in stats:
+                    line = (f"  → Chamadas: {stats['calls']} "
+                            f"(repetidas: {stats['repeated_calls']}, "
+                            f"profundidade máx.: {stats['max_depth']})")
+                    # Crescimento por degrau: deve se aproximar de φ ≈ 1.618
+                    if previous_calls is not None and n > previous_calls[0]:
+                        growth = (stats['calls'] / previous_calls[1]) ** (1 / (n - previous_calls[0]))
+                        line += f" | crescimento por degrau ≈ {growth:.3f}"
+                    previous_calls = (n, stats['calls'])
+                    print(line)
+                
             except Exception as e:
                 print(f"  ✗ Erro: {str(e)}")
     
-    # Imprimir resultados
+    if cache_hits:
+        print(f"\n{cache_hits} medição(ões) reaproveitada(s) do cache {cache.path} "
+              f"(use --force para medir de novo)")
+    
+    return report_full_benchmark(results, configuration)
+
+
+def dp_per_query(ns, mod=None):
+    """
+    Referência do modo lote: uma chamada de climb_stairs_dp por consulta.
+    
+    Args:
+        ns (list): Valores de n
+        mod (int): Se informado, calcula f(n) mod mod
+        
+    Returns:
+        list: f(n) para cada n, na ordem de entrada
+    """
+    return [climb_stairs_dp(n, mod=mod) for n in ns]
+
+
+def run_batch_benchmark(input_file='inputs.txt', num_executions=30, mod=None,
+                        filename='benchmark_batch_results.csv', **protocol_options):
+    """
+    Compara o custo de responder todas as consultas de inputs.txt em lote
+    com o de uma chamada por consulta.
+    
+    Cada medição recebe a lista inteira de N; a coluna N do CSV guarda o
+    número de consultas do lote.
+    
+    Args:
+        input_file (str): Arquivo com os tamanhos das escadas (as consultas)
+        num_executions (int): Número de execuções por teste
+        mod (int): Se informado, calcula f(n) mod mod
+        filename (str): Nome do arquivo CSV de saída
+        **protocol_options: protocol, warmup e memory_executions de run_benchmark
+        
+    Returns:
+        dict: Resultados no mesmo formato de run_full_benchmark
+    """
+    inputs = read_inputs(input_file)
+    print(f"\nModo lote: {len(inputs)} consultas, max N = {max(inputs)}\n")
+    
+    algorithms = {
+        '1. Uma chamada por N (climb_stairs_dp)': dp_per_query,
+        '2. Lote: varredura única (climb_stairs_dp_many)': climb_stairs_dp_many,
+        '3. Lote: fast doubling compartilhado (climb_stairs_fast_many)': climb_stairs_fast_many,
+    }
+    
+    results = {}
+    for algo_name, func in algorithms.items():
+        if mod is not None:
+            func = partial(func, mod=mod)
+        print(f"{algo_name}")
+        stats = run_benchmark(func, inputs, num_executions, **protocol_options)
+        results[algo_name] = {len(inputs): stats}
+        print(f"  → Mediana Tempo: {format_time(stats['median_time'])}")
+    
     print_results_table(results)
+    save_results_to_csv(results, filename)
+    return results
+
+
+def fast_per_query(ns, mod):
+    """
+    Referência do modo vetorizado: um climb_stairs_fast por consulta.
     
-    # Salvar resultados
-    save_results_to_file(results)
-    save_results_to_csv(results)
+    Args:
+        ns (iterable): Valores de n
+        mod (int): Módulo
+        
+    Returns:
+        list: f(n) mod mod para cada n
+    """
+    return [climb_stairs_fast(int(n), mod=mod) for n in ns]
+
+
+def run_vectorized_benchmark(batch_sizes=(10**3, 10**4, 10**5, 10**6, 10**7),
+                             num_executions=30, mod=10**9 + 7, max_n=10**12,
+                             per_query_limit=10**4,
+                             filename='benchmark_vectorized_results.csv', **protocol_options):
+    """
+    Compara a avaliação NumPy em lote com um climb_stairs_fast por consulta.
+    
+    Cada lote contém n aleatórios (semente fixa) em [1, max_n]. A coluna N
+    do CSV guarda o tamanho do lote.
+    
+    Args:
+        batch_sizes (tuple): Tamanhos de lote a medir
+        num_executions (int): Número de execuções por teste
+        mod (int): Módulo das consultas
+        max_n (int): Maior n sorteado
+        per_query_limit (int): Maior lote medido pelo caminho por consulta
+            (acima disso ele é pulado por ser lento demais)
+        filename (str): Nome do arquivo CSV de saída
+        **protocol_options: protocol, warmup e memory_executions de run_benchmark
+        
+    Returns:
+        dict: Resultados no mesmo formato de run_full_benchmark
+    """
+    import numpy as np
+    from vectorclimb import climb_stairs_mod_vectorized
+    
+    print(f"\nModo vetorizado: mod = {mod}, n aleatório em [1, {max_n}]\n")
+    
+    algorithms = {
+        '1. Por consulta (climb_stairs_fast)': (fast_per_query, per_query_limit),
+        '2. Vetorizado NumPy (climb_stairs_mod_vectorized)': (climb_stairs_mod_vectorized, None),
+    }
+    rng = np.random.default_rng(42)
+    batches = {size: rng.integers(1, max_n, size=size, endpoint=True) for size in batch_sizes}
+    
+    results = {}
+    for algo_name, (func, limit) in algorithms.items():
+        print(f"{algo_name}")
+        results[algo_name] = {}
+        for size, ns in batches.items():
+            if limit is not None and size > limit:
+                print(f"  Lote = {size}: PULADO (muito lento para este algoritmo)")
+                continue
+            print(f"  Lote = {size}:", end='')
+            stats = run_benchmark(partial(func, mod=mod), ns, num_executions, **protocol_options)
+            results[algo_name][size] = stats
+            print(f"  → Mediana Tempo: {format_time(stats['median_time'])} "
+                  f"({format_time(stats['median_time'] / size)} por consulta)")
     
+    print_results_table(results)
+    save_results_to_csv(results, filename)
     return results
 
 
+def run_parallel_benchmark(n=35, max_workers=None, num_executions=30, frontier_depth=None,
+                           filename='benchmark_parallel_results.csv', **protocol_options):
+    """
+    Mede a escalabilidade da força bruta paralela com 1..max_workers processos.
+    
+    Todos os números de processos usam a mesma frontier_depth: o trabalho
+    total depende da profundidade (as subárvores repetidas da fronteira
+    são resolvidas uma só vez), e variá-la junto com os processos mediria
+    essa fusão, não o paralelismo. O speedup de cada número de processos é
+    calculado sobre a execução paralela com 1 processo; a recursão pura
+    sequencial é medida como referência e sua razão para 1 processo é o
+    ganho da fusão da fronteira. O resultado de cada execução paralela é
+    conferido com o da versão sequencial.
+    
+    Args:
+        n (int): Tamanho da escada
+        max_workers (int): Maior número de processos (padrão: os.cpu_count())
+        num_executions (int): Número de execuções por teste
+        frontier_depth (int): Profundidade da fronteira, a mesma para todos
+            os números de processos (padrão: max(DEFAULT_FRONTIER_DEPTH,
+            max_workers), para haver ao menos uma tarefa por processo)
+        filename (str): Nome do arquivo CSV de saída
+        **protocol_options: protocol, warmup e memory_executions de run_benchmark
+        
+    Returns:
+        dict: Resultados no mesmo formato de run_full_benchmark
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if frontier_depth is None:
+        frontier_depth = max(DEFAULT_FRONTIER_DEPTH, max_workers)
+    
+    print(f"\nForça bruta paralela: N = {n}, 1..{max_workers} processos, "
+          f"fronteira com {frontier_depth} níveis\n")
+    expected = climb_stairs_recursive(n)
+    
+    algorithms = {'1. Recursão Pura (FORÇA BRUTA)': climb_stairs_recursive}
+    for workers in range(1, max_workers + 1):
+        algorithms[f"9. Força Bruta Paralela ({workers} processo(s))"] = partial(
+            climb_stairs_recursive_parallel, workers=workers, frontier_depth=frontier_depth)
+    
+    results = {}
+    sequential = None
+    baseline = None  # 1 processo, mesma fronteira
+    for algo_name, func in algorithms.items():
+        print(f"{algo_name}:", end='')
+        if func(n) != expected:
+            print(f"  ✗ Erro: resultado diferente da versão sequencial")
+            continue
+        stats = run_benchmark(func, n, num_executions, **protocol_options)
+        results[algo_name] = {n: stats}
+        median = stats['median_time']
+        if sequential is None:
+            sequential = median
+            print(f"  → Mediana Tempo: {format_time(median)} (referência)")
+            continue
+        if baseline is None:
+            baseline = median
+            fusion = sequential / median if median > 0 else float('inf')
+            print(f"  → Mediana Tempo: {format_time(median)} (fusão da fronteira: "
+                  f"{fusion:.2f}x sobre a recursão pura)")
+            continue
+        speedup = baseline / median if median > 0 else float('inf')
+        print(f"  → Mediana Tempo: {format_time(median)} (speedup {speedup:.2f}x sobre 1 processo)")
+    
+    print_results_table(results)
+    save_results_to_csv(results, filename)
+    return results
+
+
+def parse_batch_sizes(text):
+    """Converte "1000,1e5" na tupla de tamanhos de lote (1000, 100000)."""
+    return tuple(parse_modulus(part) for part in text.split(','))
+
+
+def parse_args(argv=None):
+    """
+    Interpreta os argumentos da linha de comando.
+    
+    Args:
+        argv (list): Argumentos (padrão: sys.argv[1:])
+        
+    Returns:
+        argparse.Namespace: Argumentos interpretados
+    """
+    parser = argparse.ArgumentParser(description='Benchmark do Staircase Problem.')
+    parser.add_argument('num_executions', nargs='?', type=int, default=30,
+                        help='Número de execuções por teste (padrão: 30)')
+    parser.add_argument('--mod', type=parse_modulus,
+                        help='Mede também o modo modular f(n) mod M (ex.: 1e9+7, 2^64)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Mede as consultas de inputs.txt em lote vs. uma chamada por N')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='Mede lotes modulares com NumPy vs. uma chamada por consulta')
+    parser.add_argument('--batch-sizes', type=parse_batch_sizes,
+                        default=(10**3, 10**4, 10**5, 10**6, 10**7),
+                        help='Tamanhos de lote do modo vetorizado (padrão: 1e3,1e4,1e5,1e6,1e7)')
+    parser.add_argument('--instrument', action='store_true',
+                        help='Registra chamadas, repetições e profundidade da recursão pura')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Mede a força bruta paralela com 1..--workers processos')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Maior número de processos do modo --parallel (padrão: núcleos da CPU)')
+    parser.add_argument('--parallel-n', type=int, default=35,
+                        help='Tamanho da escada do modo --parallel (padrão: 35)')
+    parser.add_argument('--timeout', type=float, default=120,
+                        help='Limite de tempo em segundos por algoritmo e N (padrão: 120; 0 = sem limite)')
+    parser.add_argument('--protocol', choices=list(PROTOCOLS), default=DEFAULT_PROTOCOL,
+                        help="Protocolo de medição: 'separado' (padrão) mede tempo sem tracemalloc e "
+                             "memória à parte; 'combinado' mede os dois juntos")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                        help=f'Execuções de aquecimento descartadas (padrão: {DEFAULT_WARMUP})')
+    parser.add_argument('--memory-executions', type=int, default=DEFAULT_MEMORY_EXECUTIONS,
+                        help=f'Passagens de memória por teste (padrão: {DEFAULT_MEMORY_EXECUTIONS})')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Repete até o IC da mediana atingir --target-ci ou o orçamento acabar '
+                             '(ignora num_executions)')
+    parser.add_argument('--target-ci', type=float, default=DEFAULT_TARGET_CI,
+                        help=f'Largura relativa alvo do IC {DEFAULT_CONFIDENCE:.0%} da mediana '
+                             f'(padrão: {DEFAULT_TARGET_CI})')
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET,
+                        help=f'Orçamento de tempo da amostragem adaptativa por teste, em segundos '
+                             f'(padrão: {DEFAULT_TIME_BUDGET:g})')
+    parser.add_argument('--no-autorange', action='store_true',
+                        help='Não agrupa chamadas curtas: uma chamada por amostra sempre')
+    parser.add_argument('--history', default=DEFAULT_DATABASE, metavar='ARQUIVO',
+                        help=f'Banco SQLite onde a execução é gravada (padrão: {DEFAULT_DATABASE})')
+    parser.add_argument('--no-history', action='store_true',
+                        help='Não grava a execução no histórico')
+    parser.add_argument('--cache', default=DEFAULT_CACHE, metavar='ARQUIVO',
+                        help=f'Cache de resultados do benchmark completo (padrão: {DEFAULT_CACHE})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Não lê nem grava o cache de resultados')
+    parser.add_argument('--force', action='store_true',
+                        help='Mede tudo de novo, ignorando resultados em cache')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL, metavar='ARQUIVO',
+                        help=f'Diário dos pares concluídos do benchmark completo '
+                             f'(padrão: {DEFAULT_JOURNAL})')
+    parser.add_argument('--resume', action='store_true',
+                        help='Retoma uma execução interrompida, pulando os pares já no diário')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Medições simultâneas do benchmark completo, cada uma presa a um núcleo '
+                             '(padrão: 1 = serial; 0 = todos os núcleos disponíveis)')
+    parser.add_argument('--reserved-cores', type=int, default=DEFAULT_RESERVED_CORES,
+                        help=f'Núcleos deixados ociosos com --jobs (padrão: {DEFAULT_RESERVED_CORES})')
+    parser.add_argument('--npz', action='store_true',
+                        help='Grava também benchmark_results.npz (formato binário por colunas)')
+    parser.add_argument('--no-isolation', action='store_true',
+                        help='Mede no próprio processo, sem subprocessos nem limite de tempo')
+    return parser.parse_args(argv)
+
+
+def save_history(results, args, label):
+    """
+    Grava os resultados no histórico, a menos que --no-history tenha sido usado.
+    
+    Args:
+        results (dict): Resultados do benchmark
+        args (argparse.Namespace): Argumentos da linha de comando
+        label (str): Modo do benchmark ('completo', 'lote', ...)
+    """
+    if args.no_history:
+        return
+    run_id = record_run(results, args.history, label=label)
+    print(f"✓ Execução #{run_id} gravada no histórico: {args.history} "
+          f"(compare com: python history.py compare)")
+
+
 def main():
     """Função principal."""
-    import sys
+    args = parse_args()
+    protocol_options = {'protocol': args.protocol, 'warmup': args.warmup,
+                        'memory_executions': args.memory_executions}
+    if args.no_autorange:
+        protocol_options['batch_short_runs'] = False
+    if args.adaptive:
+        protocol_options.update(adaptive=True, target_ci=args.target_ci,
+                                time_budget=args.time_budget)
     
-    # Verificar argumentos
-    num_executions = 30
-    if len(sys.argv) > 1:
-        try:
-            num_executions = int(sys.argv[1])
-        except ValueError:
-            print(f"Aviso: Argumento inválido '{sys.argv[1]}', usando padrão (30)")
+    if args.batch:
+        print_benchmark_header(num_executions=args.num_executions, **protocol_options)
+        results = run_batch_benchmark(num_executions=args.num_executions, mod=args.mod,
+                                      **protocol_options)
+        save_history(results, args, 'lote')
+        return
+    
+    if args.parallel:
+        print_benchmark_header(num_executions=args.num_executions, **protocol_options)
+        results = run_parallel_benchmark(args.parallel_n, args.workers, args.num_executions,
+                                         **protocol_options)
+        save_history(results, args, 'paralelo')
+        return
     
-    # Executar benchmark
-    results = run_full_benchmark(num_executions=num_executions)
+    if args.vectorized:
+        print_benchmark_header(num_executions=args.num_executions, **protocol_options)
+        results = run_vectorized_benchmark(args.batch_sizes, num_executions=args.num_executions,
+                                           mod=args.mod if args.mod is not None else 10**9 + 7,
+                                           **protocol_options)
+        save_history(results, args, 'vetorizado')
+        return
+    
+    # Executar benchmark (Ctrl-C preserva o diário para --resume)
+    try:
+        results = run_full_benchmark(num_executions=args.num_executions, mod=args.mod,
+                                     instrument=args.instrument, timeout=args.timeout or None,
+                                     isolate=not args.no_isolation,
+                                     cache=None if args.no_cache else ResultCache(args.cache),
+                                     force=args.force, jobs=args.jobs or None,
+                                     reserved_cores=args.reserved_cores, journal_file=args.journal,
+                                     resume=args.resume, **protocol_options)
+    except KeyboardInterrupt:
+        print(f"\n\nInterrompido. Pares concluídos estão em {args.journal}; "
+              f"repita o comando com --resume")
+        raise SystemExit(130)
+    save_history(results, args, 'completo')
+    if args.npz:
+        save_results_to_npz(results)
     
     print("\n" + "="*80)
     print("BENCHMARK CONCLUÍDO!")
@@ -335,6 +1643,8 @@ def main():
     print("\nArquivos gerados:")
     print("  • benchmark_results.txt - Resultados detalhados")
     print("  • benchmark_results.csv - Dados em formato CSV")
+    if args.npz:
+        print("  • benchmark_results.npz - Dados em formato binário por colunas")
     print("\n")
 
 
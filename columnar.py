@@ -0,0 +1,150 @@
+"""
+Formato binário por colunas (.npz) dos resultados.
+
+Os CSVs guardam tudo como texto: os resultados exatos de N grandes viram
+dezenas de milhares de dígitos decimais por linha (e a conversão
+int -> str é quadrática), e pd.read_csv precisa ler e converter o
+arquivo inteiro mesmo quando um gráfico usa só três colunas.
+
+Aqui cada coluna é um array NumPy gravado em um .npz (np.savez):
+
+- colunas numéricas em arrays tipados (int64/float64)
+- textos (algoritmo, protocolo, status) em arrays unicode, sem pickle
+- inteiros grandes como bytes brutos (int.to_bytes, little-endian)
+  concatenados em um único array uint8 (`<coluna>_raw`), com um array de
+  deslocamentos (`<coluna>_offsets`) e a contagem de dígitos decimais
+  (`<coluna>_digits`), calculada a partir de bit_length sem converter o
+  número para texto (resultformat.decimal_digits)
+
+np.load abre o .npz sem ler as colunas; cada coluna só é lida (e
+descompactada) quando acessada, então load_columns lê apenas o que foi
+pedido.
+"""
+
+import numpy as np
+
+from resultformat import decimal_digits
+
+
+# Sufixos das colunas de inteiros grandes que não são tabulares
+# (comprimentos diferentes do número de linhas)
+BLOB_SUFFIXES = ('_raw', '_offsets')
+
+
+def encode_big_ints(values):
+    """
+    Codifica inteiros não negativos como bytes brutos concatenados.
+
+    Args:
+        values (iterable): Inteiros não negativos
+
+    Returns:
+        tuple: (dados uint8, deslocamentos int64 com len(values) + 1
+            posições, dígitos decimais int64)
+
+    Raises:
+        ValueError: Se algum valor for negativo
+    """
+    chunks = []
+    offsets = [0]
+    digits = []
+    for value in values:
+        if value < 0:
+            raise ValueError("só inteiros não negativos podem ser codificados")
+        chunk = value.to_bytes((value.bit_length() + 7) // 8, 'little')
+        chunks.append(chunk)
+        offsets.append(offsets[-1] + len(chunk))
+        digits.append(decimal_digits(value))
+    data = np.frombuffer(b''.join(chunks), dtype=np.uint8)
+    return data, np.array(offsets, dtype=np.int64), np.array(digits, dtype=np.int64)
+
+
+def decode_big_ints(data, offsets):
+    """
+    Inverso de encode_big_ints.
+
+    Args:
+        data (numpy.ndarray): Bytes concatenados (uint8)
+        offsets (numpy.ndarray): Deslocamentos de cada valor
+
+    Returns:
+        list: Inteiros decodificados
+    """
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [int.from_bytes(raw[start:end], 'little')
+            for start, end in zip(bounds, bounds[1:])]
+
+
+def big_int_columns(name, values):
+    """
+    Colunas .npz de uma coluna de inteiros grandes.
+
+    Args:
+        name (str): Nome da coluna
+        values (iterable): Inteiros não negativos
+
+    Returns:
+        dict: `<name>_raw`, `<name>_offsets` e `<name>_digits`
+    """
+    data, offsets, digits = encode_big_ints(values)
+    return {f'{name}_raw': data, f'{name}_offsets': offsets, f'{name}_digits': digits}
+
+
+def load_big_ints(filename, name):
+    """
+    Lê uma coluna de inteiros grandes de um .npz.
+
+    Args:
+        filename (str): Arquivo .npz
+        name (str): Nome da coluna (sem sufixo)
+
+    Returns:
+        list: Inteiros decodificados
+    """
+    with np.load(filename, allow_pickle=False) as archive:
+        return decode_big_ints(archive[f'{name}_raw'], archive[f'{name}_offsets'])
+
+
+def save_npz(filename, columns, compressed=True):
+    """
+    Grava um dicionário de colunas em um .npz.
+
+    Args:
+        filename (str): Arquivo de saída (.npz)
+        columns (dict): Nome da coluna -> array (ou sequência)
+        compressed (bool): Se True, usa np.savez_compressed
+    """
+    writer = np.savez_compressed if compressed else np.savez
+    writer(filename, **{name: np.asarray(values) for name, values in columns.items()})
+
+
+def load_columns(filename, columns=None):
+    """
+    Lê as colunas pedidas de um .npz ou de um CSV.
+
+    Colunas pedidas que não existem no arquivo são ignoradas, como as
+    colunas opcionais (Status, Protocolo) de resultados antigos. Sem
+    columns, um .npz fornece todas as colunas tabulares (os bytes brutos
+    de inteiros grandes ficam de fora; ver load_big_ints).
+
+    Args:
+        filename (str): Arquivo .npz ou .csv
+        columns (iterable): Colunas desejadas (None: todas)
+
+    Returns:
+        pandas.DataFrame: Uma coluna por coluna encontrada
+    """
+    import pandas as pd
+
+    wanted = None if columns is None else set(columns)
+    if not str(filename).lower().endswith('.npz'):
+        usecols = None if wanted is None else (lambda name: name in wanted)
+        return pd.read_csv(filename, usecols=usecols)
+
+    with np.load(filename, allow_pickle=False) as archive:
+        if wanted is None:
+            names = [name for name in archive.files if not name.endswith(BLOB_SUFFIXES)]
+        else:
+            names = [name for name in archive.files if name in wanted]
+        return pd.DataFrame({name: archive[name] for name in names})
@@ -0,0 +1,258 @@
+"""
+Módulo de ajuste empírico de complexidade e previsão de tempo de execução.
+
+Ajusta uma série medida (n, tempo) a modelos candidatos de crescimento e
+escolhe o que melhor descreve os dados. O modelo ajustado prevê o tempo de
+um n ainda não executado, o que permite pular (ou tratar como timeout)
+execuções que levariam tempo demais ANTES de rodá-las.
+
+MODELOS CANDIDATOS: t(n) = a + c · g(n), com a, c >= 0
+- O(log n):   fast doubling (contando operações aritméticas)
+- O(n):       DP bottom-up com inteiros pequenos
+- O(n log n)
+- O(n²):      DP com inteiros grandes (cada soma custa O(n) bits)
+- O(φ^n):     recursão pura (φ ≈ 1.618)
+
+AJUSTE: mínimos quadrados ponderados por 1/t², ou seja, minimiza o erro
+RELATIVO, pois os tempos variam de nanossegundos a minutos. Os resíduos
+reportados são relativos: (previsto - medido) / medido.
+"""
+
+import math
+
+
+# Razão áurea: a recursão pura faz ~φ^n chamadas
+PHI = (1 + math.sqrt(5)) / 2
+
+
+def _exponential(n):
+    """φ^n, ou infinito se não couber em um float."""
+    try:
+        return math.exp(n * math.log(PHI))
+    except OverflowError:
+        return math.inf
+
+
+# Modelos candidatos: nome -> g(n)
+MODELS = {
+    'O(log n)': lambda n: math.log2(n) if n > 1 else 0.0,
+    'O(n)': lambda n: float(n),
+    'O(n log n)': lambda n: n * math.log2(n) if n > 1 else 0.0,
+    'O(n²)': lambda n: float(n) * n,
+    'O(φ^n)': _exponential,
+}
+
+# Modelo da recursão pura, imposto aos preditores das implementações exponenciais
+EXPONENTIAL_MODEL = 'O(φ^n)'
+
+# Mínimo de pontos para ajustar a + c·g(n) (com menos, só c·g(n))
+MIN_POINTS_WITH_INTERCEPT = 3
+
+# N pequenos, baratos até para a recursão pura, usados para calibrar previsões
+CALIBRATION_NS = (12, 14, 16, 18, 20, 22)
+
+# Séries em que nem a medição mais longa chega a este tempo são dominadas
+# por ruído (resolução do relógio, cache, gc) e não servem para extrapolar
+MIN_RELIABLE_SECONDS = 1e-3
+
+
+class ModelFit:
+    """Resultado do ajuste de uma série a um modelo t(n) = a + c · g(n)."""
+
+    def __init__(self, model, intercept, coefficient, residuals):
+        """
+        Inicializa o ajuste.
+
+        Args:
+            model (str): Nome do modelo (chave de MODELS)
+            intercept (float): Termo constante a (segundos)
+            coefficient (float): Coeficiente c (segundos por unidade de g(n))
+            residuals (list): Resíduos relativos de cada ponto da série
+        """
+        self.model = model
+        self.intercept = intercept
+        self.coefficient = coefficient
+        self.residuals = residuals
+
+    @property
+    def rms_residual(self):
+        """Raiz do erro quadrático médio relativo (0.1 = erro típico de 10%)."""
+        return math.sqrt(sum(r * r for r in self.residuals) / len(self.residuals))
+
+    def predict(self, n):
+        """
+        Prevê o tempo de execução para n.
+
+        Args:
+            n (int): Tamanho da entrada
+
+        Returns:
+            float: Tempo previsto em segundos (inf se estourar um float)
+        """
+        growth = MODELS[self.model](n)
+        if math.isinf(growth):
+            return math.inf
+        return self.intercept + self.coefficient * growth
+
+    def __repr__(self):
+        return (f"ModelFit({self.model!r}, a={self.intercept:.3g}, c={self.coefficient:.3g}, "
+                f"rms={self.rms_residual:.3f})")
+
+
+def fit_model(model, ns, times):
+    """
+    Ajusta uma série a um modelo t(n) = a + c · g(n).
+
+    Resolve as equações normais dos mínimos quadrados ponderados por 1/t².
+    Se o termo constante sair negativo, reajusta com a = 0.
+
+    Args:
+        model (str): Nome do modelo (chave de MODELS)
+        ns (list): Valores de n
+        times (list): Tempos medidos (segundos, > 0)
+
+    Returns:
+        ModelFit | None: Ajuste, ou None se o modelo não se aplica à série
+            (g(n) infinito ou coeficiente não positivo)
+    """
+    growth = [MODELS[model](n) for n in ns]
+    if any(math.isinf(g) for g in growth):
+        return None
+    weights = [1 / (t * t) for t in times]
+
+    intercept = 0.0
+    coefficient = None
+    if len(ns) >= MIN_POINTS_WITH_INTERCEPT:
+        # Equações normais de  min Σ w (a + c·g - t)²
+        sw = sum(weights)
+        sg = sum(w * g for w, g in zip(weights, growth))
+        sgg = sum(w * g * g for w, g in zip(weights, growth))
+        st = sum(w * t for w, t in zip(weights, times))
+        sgt = sum(w * g * t for w, g, t in zip(weights, growth, times))
+        det = sw * sgg - sg * sg
+        if det > 0:
+            intercept = (sgg * st - sg * sgt) / det
+            coefficient = (sw * sgt - sg * st) / det
+    if coefficient is None or intercept < 0:
+        # Só o coeficiente:  min Σ w (c·g - t)²
+        intercept = 0.0
+        sgg = sum(w * g * g for w, g in zip(weights, growth))
+        if sgg == 0:
+            return None
+        coefficient = sum(w * g * t for w, g, t in zip(weights, growth, times)) / sgg
+    if coefficient <= 0:
+        return None
+
+    residuals = [(intercept + coefficient * g - t) / t for g, t in zip(growth, times)]
+    return ModelFit(model, intercept, coefficient, residuals)
+
+
+def fit_complexity(ns, times, models=None):
+    """
+    Ajusta uma série a todos os modelos candidatos.
+
+    Args:
+        ns (list): Valores de n
+        times (list): Tempos medidos (segundos)
+        models (list): Nomes dos modelos a testar (padrão: todos de MODELS)
+
+    Returns:
+        list: ModelFit ordenados do melhor (menor resíduo) para o pior
+    """
+    if len(ns) != len(times):
+        raise ValueError("ns e times devem ter o mesmo tamanho")
+    points = [(n, t) for n, t in zip(ns, times) if t > 0]
+    if not points:
+        return []
+    ns, times = zip(*points)
+
+    fits = []
+    for model in models or MODELS:
+        fit = fit_model(model, ns, times)
+        if fit is not None:
+            fits.append(fit)
+    fits.sort(key=lambda fit: fit.rms_residual)
+    return fits
+
+
+class RuntimePredictor:
+    """Acumula medições de uma implementação e prevê o tempo de novos n."""
+
+    def __init__(self, models=None, min_points=MIN_POINTS_WITH_INTERCEPT,
+                 min_seconds=MIN_RELIABLE_SECONDS):
+        """
+        Inicializa o preditor sem medições.
+
+        Args:
+            models (list): Modelos candidatos (padrão: todos de MODELS);
+                com um único modelo, a complexidade é imposta e não escolhida
+            min_points (int): Medições necessárias antes de prever
+            min_seconds (float): Só prevê se a medição mais longa atingir
+                este tempo (0: sempre; para tempos cronometrados em lotes)
+        """
+        self.models = models
+        self.min_points = min_points
+        self.min_seconds = min_seconds
+        self.ns = []
+        self.times = []
+        self._best = None
+
+    def add(self, n, seconds):
+        """Registra o tempo medido para n."""
+        self.ns.append(n)
+        self.times.append(seconds)
+        self._best = None
+
+    def calibrate(self, func, ns, timer=None):
+        """
+        Mede a função em alguns n pequenos para alimentar o modelo.
+
+        Args:
+            func: Implementação a calibrar
+            ns (iterable): Valores de n, baratos o bastante para rodar já
+            timer: Função (func, n) -> (resultado, segundos)
+                (padrão: measurement.measure_time_without_gc)
+        """
+        if timer is None:
+            from measurement import measure_time_without_gc as timer
+        for n in ns:
+            _, seconds = timer(func, n)
+            self.add(n, seconds)
+
+    def best_fit(self):
+        """
+        Retorna o modelo que melhor descreve as medições.
+
+        Returns:
+            ModelFit | None: Melhor ajuste, ou None com poucas medições ou
+                medições curtas demais
+        """
+        if len(self.ns) < self.min_points or max(self.times) < self.min_seconds:
+            return None
+        if self._best is None:
+            fits = fit_complexity(self.ns, self.times, self.models)
+            self._best = fits[0] if fits else None
+        return self._best
+
+    def predict(self, n):
+        """
+        Prevê o tempo de execução para n.
+
+        Uma previsão infinita (g(n) estoura um float) só é aceita quando o
+        modelo foi imposto (models com um único modelo): escolhido entre
+        vários, o O(φ^n) pode vencer por acaso em tempos ruidosos, e a
+        extrapolação infinita seria um artefato do ajuste.
+
+        Args:
+            n (int): Tamanho da entrada
+
+        Returns:
+            float | None: Segundos previstos, ou None sem previsão confiável
+        """
+        fit = self.best_fit()
+        if fit is None:
+            return None
+        predicted = fit.predict(n)
+        if math.isinf(predicted) and (self.models is None or len(self.models) > 1):
+            return None
+        return predicted
@@ -1,21 +1,154 @@
 """
 Módulo para coletar, armazenar e exibir dados de desempenho dos algoritmos.
+
+Os registros são guardados por coluna, em arrays tipados (módulo array),
+e não como um dicionário por registro: com milhões de registros isso usa
+uma fração da memória. Os nomes dos algoritmos são internados (cada nome
+vira um id inteiro) e cada algoritmo mantém contagem, média e variância
+acumuladas (algoritmo de Welford), então o resumo custa O(#algoritmos) e
+não O(#registros). Cada algoritmo mantém ainda esboços de quantis
+(sketch.TDigest) do tempo e da memória, para os percentis p50/p90/p99, de
+tamanho limitado. Percentis por par (algoritmo, N) são opcionais
+(percentiles_by_n=True): custam dois esboços por par, e a memória passa a
+crescer com o número de pares.
+
+`DataSheet.data` continua disponível como uma visão somente leitura em que
+cada registro é montado como dicionário na hora do acesso.
+
+Com um coletor (recordsink.py), cada registro também é gravado em disco
+assim que chega; com keep_records=False a planilha nem guarda os
+registros, só os agregados (sem percentis por N), e a memória fica
+constante em execuções longas.
+
+Os resultados são exibidos e gravados via resultformat.py: na tabela,
+resultados longos aparecem resumidos (primeiros e últimos dígitos); no
+CSV, completos, com a conversão decimal por divisão e conquista.
 """
 
 import csv
+import operator
+from array import array
 from datetime import datetime
 from tabulate import tabulate
 
+from resultformat import DEFAULT_RESULT_FORMAT, format_result, to_decimal
+from sketch import DEFAULT_PERCENTILES, RunningStats, TDigest
+
+
+# Valor guardado nas colunas de contadores quando o registro não os tem
+MISSING = -1
+
+# Faixa das colunas array('q')
+INT64_RANGE = range(-2**63, 2**63)
+
+
+def _int64(value, field):
+    """Valida um valor de coluna array('q') antes de qualquer append."""
+    value = operator.index(value)
+    if value not in INT64_RANGE:
+        raise ValueError(f"{field} fora da faixa de 64 bits: {value}")
+    return value
+
+
+class RecordView:
+    """Visão somente leitura dos registros de uma DataSheet, como dicionários."""
+    
+    def __init__(self, sheet):
+        self._sheet = sheet
+    
+    def __len__(self):
+        return len(self._sheet._n)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._sheet._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de registro fora do intervalo")
+        return self._sheet._record(index)
+    
+    def __iter__(self):
+        return (self._sheet._record(i) for i in range(len(self)))
+    
+    def __bool__(self):
+        return len(self) > 0
+
 
 class DataSheet:
     """Classe para gerenciar dados de desempenho dos algoritmos."""
     
-    def __init__(self):
-        """Inicializa a planilha de dados."""
-        self.data = []
+    # Contadores opcionais da instrumentação da recursão (coluna -> cabeçalho)
+    COUNTER_FIELDS = {
+        'calls': 'Chamadas',
+        'max_depth': 'Profundidade Máx.',
+        'repeated_calls': 'Subproblemas Repetidos',
+    }
+    
+    def __init__(self, protocol=None, sink=None, keep_records=True,
+                 result_format=DEFAULT_RESULT_FORMAT, percentiles_by_n=False):
+        """
+        Inicializa a planilha de dados.
+        
+        Args:
+            protocol (str): Descrição do protocolo de medição (opcional);
+                exibida na tabela e gravada em uma coluna do CSV
+            sink (RecordSink): Coletor que grava cada registro ao chegar
+                (opcional, ver recordsink.py)
+            keep_records (bool): Se False, os registros não ficam em memória
+                (só no coletor); resumo e percentis continuam disponíveis
+            result_format (str): Exibição dos resultados na tabela
+                ('auto', 'completo' ou 'pontas'; ver resultformat.py)
+            percentiles_by_n (bool): Se True, mantém também percentis por
+                par (algoritmo, N); a memória cresce com o número de pares
+        """
+        self.protocol = protocol
+        self.sink = sink
+        self.keep_records = keep_records
+        self.result_format = result_format
+        self.last_record = None
+        self._count = 0
         self.headers = ['Algoritmo', 'N', 'Resultado', 'Tempo (s)', 'Memória (bytes)']
+        
+        # Nomes internados: id -> nome e nome -> id
+        self._algorithm_names = []
+        self._algorithm_ids = {}
+        
+        # Colunas tipadas (resultados são inteiros de tamanho arbitrário;
+        # a coluna de N vira lista se aparecer um N além de 64 bits)
+        self._algorithm = array('I')
+        self._n = array('q')
+        self._result = []
+        self._execution_time = array('d')
+        self._memory_usage = array('q')
+        self._counters = {field: array('q') for field in self.COUNTER_FIELDS}
+        self._with_counters = False
+        
+        # Agregados por id de algoritmo: (tempo, memória)
+        self._running = []
+        # Esboços de quantis por id de algoritmo: (tempo, memória)
+        self._sketches = []
+        # Opcional: esboços por (id de algoritmo, N)
+        self._sketches_by_n = {} if percentiles_by_n else None
     
-    def add_record(self, algorithm, n, result, execution_time, memory_usage):
+    @property
+    def data(self):
+        """Registros como uma sequência somente leitura de dicionários."""
+        return RecordView(self)
+    
+    def _intern(self, algorithm):
+        """Retorna o id do algoritmo, criando-o na primeira ocorrência."""
+        algorithm_id = self._algorithm_ids.get(algorithm)
+        if algorithm_id is None:
+            algorithm_id = len(self._algorithm_names)
+            self._algorithm_ids[algorithm] = algorithm_id
+            self._algorithm_names.append(algorithm)
+            self._running.append((RunningStats(), RunningStats()))
+            self._sketches.append((TDigest(), TDigest()))
+        return algorithm_id
+    
+    def add_record(self, algorithm, n, result, execution_time, memory_usage,
+                   calls=None, max_depth=None, repeated_calls=None):
         """
         Adiciona um registro de execução.
         
@@ -25,57 +158,219 @@ class DataSheet:
             result (int): Resultado obtido
             execution_time (float): Tempo de execução em segundos
             memory_usage (int): Uso de memória em bytes
+            calls (int): Total de chamadas recursivas (instrumentação, opcional)
+            max_depth (int): Profundidade máxima da pilha (instrumentação, opcional)
+            repeated_calls (int): Chamadas a subproblemas já resolvidos (opcional)
+        
+        Raises:
+            TypeError: Se um valor não for do tipo da coluna
+            ValueError: Se memória ou contadores não couberem em 64 bits
+        
+        Complexidade:
+            Tempo: O(1) amortizado
         """
+        # Valida tudo antes de alterar qualquer coluna: um erro no meio dos
+        # appends deixaria as colunas desalinhadas
+        n = operator.index(n)
+        execution_time = float(execution_time)
+        memory_usage = _int64(memory_usage, 'memory_usage')
+        counters = {field: None if value is None else _int64(value, field)
+                    for field, value in (('calls', calls), ('max_depth', max_depth),
+                                         ('repeated_calls', repeated_calls))}
+        if self.keep_records and isinstance(self._n, array) and n not in INT64_RANGE:
+            # N além de 64 bits (ex.: consultas de Pisano): coluna de inteiros Python
+            self._n = list(self._n)
+        
+        algorithm_id = self._intern(algorithm)
+        if self.keep_records:
+            self._algorithm.append(algorithm_id)
+            self._n.append(n)
+            self._result.append(result)
+            self._execution_time.append(execution_time)
+            self._memory_usage.append(memory_usage)
+            for field, value in counters.items():
+                self._counters[field].append(MISSING if value is None else value)
+        if any(value is not None for value in counters.values()):
+            self._with_counters = True
+        self._count += 1
+        
+        self.last_record = {'algorithm': algorithm, 'n': n, 'result': result,
+                            'execution_time': execution_time, 'memory_usage': memory_usage,
+                            **counters}
+        if self.sink is not None:
+            self.sink.write({**self.last_record, 'protocol': self.protocol})
+        
+        time_stats, memory_stats = self._running[algorithm_id]
+        time_stats.add(execution_time)
+        memory_stats.add(memory_usage)
+        
+        time_sketch, memory_sketch = self._sketches[algorithm_id]
+        time_sketch.add(execution_time)
+        memory_sketch.add(memory_usage)
+        if self._sketches_by_n is not None:
+            sketches = self._sketches_by_n.get((algorithm_id, n))
+            if sketches is None:
+                sketches = self._sketches_by_n[algorithm_id, n] = (TDigest(), TDigest())
+            sketches[0].add(execution_time)
+            sketches[1].add(memory_usage)
+    
+    def _record(self, index):
+        """Monta o registro index como dicionário."""
         record = {
-            'algorithm': algorithm,
-            'n': n,
-            'result': result,
-            'execution_time': execution_time,
-            'memory_usage': memory_usage
+            'algorithm': self._algorithm_names[self._algorithm[index]],
+            'n': self._n[index],
+            'result': self._result[index],
+            'execution_time': self._execution_time[index],
+            'memory_usage': self._memory_usage[index],
         }
-        self.data.append(record)
+        for field, column in self._counters.items():
+            value = column[index]
+            record[field] = None if value == MISSING else value
+        return record
+    
+    def column(self, name):
+        """
+        Retorna uma coluna inteira, sem montar registros.
+        
+        Args:
+            name (str): 'algorithm', 'n', 'result', 'execution_time',
+                'memory_usage' ou um contador de COUNTER_FIELDS
+        
+        Returns:
+            array | list: A coluna tipada (contadores ausentes valem MISSING);
+                para 'algorithm', a lista de nomes
+        """
+        if name == 'algorithm':
+            return [self._algorithm_names[i] for i in self._algorithm]
+        if name in self._counters:
+            return self._counters[name]
+        columns = {'n': self._n, 'result': self._result,
+                   'execution_time': self._execution_time, 'memory_usage': self._memory_usage}
+        if name not in columns:
+            raise KeyError(f"coluna desconhecida: {name!r}")
+        return columns[name]
+    
+    def __len__(self):
+        return self._count
+    
+    def close(self):
+        """Fecha o coletor, se houver, gravando o que estiver pendente."""
+        if self.sink is not None:
+            self.sink.close()
+    
+    def _has_counters(self):
+        """Indica se algum registro tem contadores de instrumentação."""
+        return self._with_counters
     
     def display(self):
         """Exibe os dados em formato de tabela."""
+        if not self.keep_records and self._count:
+            where = f" em: {self.sink.path}" if self.sink is not None else " (não guardados)"
+            print(f"\n{self._count} registro(s){where}")
+            return
         if not self.data:
             print("Nenhum dado disponível.")
             return
         
+        with_counters = self._has_counters()
+        headers = list(self.headers)
+        if with_counters:
+            headers += list(self.COUNTER_FIELDS.values())
+        
         table_data = []
         for record in self.data:
             row = [
                 record['algorithm'],
                 record['n'],
-                record['result'],
+                format_result(record['result'], self.result_format),
                 f"{record['execution_time']:.6f}",
                 record['memory_usage']
             ]
+            if with_counters:
+                row += [record[field] if record[field] is not None else '-'
+                        for field in self.COUNTER_FIELDS]
             table_data.append(row)
         
         print("\n" + "="*80)
         print("RESULTADOS DA ANÁLISE DE DESEMPENHO")
+        if self.protocol is not None:
+            print(f"Protocolo: {self.protocol}")
         print("="*80)
-        print(tabulate(table_data, headers=self.headers, tablefmt='grid'))
+        print(tabulate(table_data, headers=headers, tablefmt='grid'))
         print("="*80 + "\n")
     
     def save_to_csv(self, filename=None):
         """
         Salva os dados em um arquivo CSV.
         
+        Só inclui os registros guardados em memória (keep_records=True);
+        para gravar durante a execução, use um coletor (sink). Um nome
+        terminado em .npz grava o formato binário por colunas (save_to_npz).
+        
         Args:
             filename (str): Nome do arquivo (opcional)
         """
+        if filename is not None and filename.lower().endswith('.npz'):
+            self.save_to_npz(filename)
+            return
+        
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"staircase_results_{timestamp}.csv"
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['algorithm', 'n', 'result', 'execution_time', 'memory_usage']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            if self._has_counters():
+                fieldnames += list(self.COUNTER_FIELDS)
+            if self.protocol is not None:
+                fieldnames.append('protocol')
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
             
             writer.writeheader()
             for record in self.data:
-                writer.writerow(record)
+                writer.writerow({**record, 'result': to_decimal(record['result']),
+                                 'protocol': self.protocol})
+        
+        print(f"Dados salvos em: {filename}")
+    
+    def save_to_npz(self, filename=None):
+        """
+        Salva os dados no formato binário por colunas (ver columnar.py).
+        
+        As colunas tipadas vão direto para arrays NumPy, sem passar por
+        texto; os resultados são gravados como bytes brutos com a contagem
+        de dígitos (result_raw, result_offsets e result_digits), sem a
+        conversão para decimal, que é quadrática nos N grandes.
+        
+        Args:
+            filename (str): Nome do arquivo (opcional)
+        """
+        import numpy as np
+        from columnar import big_int_columns, save_npz
+        
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"staircase_results_{timestamp}.npz"
+        
+        names = np.array(self._algorithm_names or [''], dtype=str)
+        columns = {
+            'algorithm': names[np.asarray(self._algorithm, dtype=np.intp)],
+            'execution_time': np.asarray(self._execution_time),
+            'memory_usage': np.asarray(self._memory_usage),
+        }
+        if self._has_counters():
+            # MISSING (-1) marca registros sem contadores
+            for field, values in self._counters.items():
+                columns[field] = np.asarray(values)
+        if self.protocol is not None:
+            columns['protocol'] = np.full(len(self._n), self.protocol)
+        if isinstance(self._n, array):
+            columns['n'] = np.asarray(self._n)
+        else:
+            # N além de 64 bits: mesmo formato dos resultados (n_raw, n_offsets, n_digits)
+            columns.update(big_int_columns('n', self._n))
+        columns.update(big_int_columns('result', self._result))
+        save_npz(filename, columns)
         
         print(f"Dados salvos em: {filename}")
     
@@ -83,36 +378,63 @@ class DataSheet:
         """
         Retorna um resumo estatístico dos dados.
         
+        Lê os agregados acumulados em add_record, sem percorrer os registros.
+        
         Returns:
             dict: Resumo com estatísticas por algoritmo
-        """
-        if not self.data:
-            return {}
         
+        Complexidade:
+            Tempo: O(#algoritmos)
+        """
         summary = {}
+        for algo, (time_stats, memory_stats) in zip(self._algorithm_names, self._running):
+            summary[algo] = {
+                'count': time_stats.count,
+                'total_time': time_stats.total,
+                'total_memory': memory_stats.total,
+                'avg_time': time_stats.mean,
+                'avg_memory': memory_stats.mean,
+                'stdev_time': time_stats.stdev,
+                'stdev_memory': memory_stats.stdev
+            }
+        return summary
+    
+    def get_percentiles(self, percentiles=DEFAULT_PERCENTILES, by_n=False):
+        """
+        Retorna os percentis de tempo e memória por algoritmo (ou por algoritmo e N).
         
-        for record in self.data:
-            algo = record['algorithm']
-            if algo not in summary:
-                summary[algo] = {
-                    'count': 0,
-                    'total_time': 0,
-                    'total_memory': 0,
-                    'avg_time': 0,
-                    'avg_memory': 0
-                }
-            
-            summary[algo]['count'] += 1
-            summary[algo]['total_time'] += record['execution_time']
-            summary[algo]['total_memory'] += record['memory_usage']
+        Args:
+            percentiles (iterable): Percentis, entre 0 e 100
+            by_n (bool): Se True, por par (algoritmo, N); exige
+                percentiles_by_n=True na criação da planilha
         
-        # Calcular médias
-        for algo in summary:
-            count = summary[algo]['count']
-            summary[algo]['avg_time'] = summary[algo]['total_time'] / count
-            summary[algo]['avg_memory'] = summary[algo]['total_memory'] / count
+        Returns:
+            dict: {algoritmo: {'count': ..., 'p50_time': ..., 'p50_memory': ..., ...}},
+                ou com by_n {algoritmo: {n: {...}}}
         
-        return summary
+        Raises:
+            ValueError: Se by_n for pedido sem percentiles_by_n=True
+        
+        Complexidade:
+            Tempo: O(#algoritmos) (ou O(#pares) com by_n), independente de #registros
+        """
+        def row(times, memories):
+            values = {'count': times.count}
+            for p, value in times.percentiles(percentiles).items():
+                values[f'p{p}_time'] = value
+            for p, value in memories.percentiles(percentiles).items():
+                values[f'p{p}_memory'] = value
+            return values
+        
+        if not by_n:
+            return {name: row(*sketches)
+                    for name, sketches in zip(self._algorithm_names, self._sketches)}
+        if self._sketches_by_n is None:
+            raise ValueError("percentis por N exigem DataSheet(percentiles_by_n=True)")
+        result = {}
+        for (algorithm_id, n), sketches in self._sketches_by_n.items():
+            result.setdefault(self._algorithm_names[algorithm_id], {})[n] = row(*sketches)
+        return result
     
     def display_summary(self):
         """Exibe um resumo estatístico dos dados."""
@@ -132,10 +454,33 @@ class DataSheet:
                 algo,
                 stats['count'],
                 f"{stats['avg_time']:.6f}",
+                f"{stats['stdev_time']:.6f}",
                 f"{stats['avg_memory']:.2f}"
             ]
             summary_data.append(row)
         
-        headers = ['Algoritmo', 'Execuções', 'Tempo Médio (s)', 'Memória Média (bytes)']
+        headers = ['Algoritmo', 'Execuções', 'Tempo Médio (s)', 'DP Tempo (s)',
+                   'Memória Média (bytes)']
         print(tabulate(summary_data, headers=headers, tablefmt='grid'))
+        
+        def percentile_cells(row):
+            return ([row['count']] +
+                    [f"{row[f'p{p}_time']:.6f}" for p in DEFAULT_PERCENTILES] +
+                    [f"{row[f'p{p}_memory']:.0f}" for p in DEFAULT_PERCENTILES])
+        
+        headers = (['Execuções'] +
+                   [f'Tempo p{p} (s)' for p in DEFAULT_PERCENTILES] +
+                   [f'Memória p{p} (bytes)' for p in DEFAULT_PERCENTILES])
+        if self._sketches_by_n is None:
+            percentile_data = [[algo] + percentile_cells(row)
+                               for algo, row in self.get_percentiles().items()]
+            print("\nPERCENTIS POR ALGORITMO")
+            print(tabulate(percentile_data, headers=['Algoritmo'] + headers, tablefmt='grid'))
+        else:
+            percentile_data = []
+            for algo, by_n in self.get_percentiles(by_n=True).items():
+                for n, row in sorted(by_n.items()):
+                    percentile_data.append([algo, n] + percentile_cells(row))
+            print("\nPERCENTIS POR ALGORITMO E N")
+            print(tabulate(percentile_data, headers=['Algoritmo', 'N'] + headers, tablefmt='grid'))
         print("="*80 + "\n")
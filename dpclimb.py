@@ -8,10 +8,83 @@ ABORDAGEM: Programação Dinâmica Bottom-up (Tabulação)
 - Constrói a solução de baixo para cima
 - Armazena resultados intermediários em uma tabela
 - Complexidade linear O(n)
+
+ABORDAGEM AUXILIAR: Fast Doubling
+- Usa as identidades de duplicação de Fibonacci
+- Complexidade logarítmica O(log n) em número de operações
+
+ABORDAGEM AUXILIAR: Tabela com Checkpoints
+- Guarda apenas um par de valores a cada k degraus (k ≈ √n)
+- Recalcula qualquer f(i) a partir do checkpoint mais próximo
+- Memória sublinear e acesso aleatório em O(√n)
+
+CONSULTAS EM LOTE: climb_stairs_dp_many e climb_stairs_fast_many respondem
+uma lista de n em uma única varredura (ou com duplicações compartilhadas).
+
+SEQUÊNCIA SOB DEMANDA: climb_stairs_stream gera f(start), f(start+step), ...
+com estado O(1) e write_stream grava a sequência em blocos (arquivo/socket).
+
+MODO MODULAR: todas as funções aceitam mod=m e devolvem f(n) mod m,
+mantendo cada valor intermediário menor que m.
 """
 
+import re
+from math import isqrt
+
+from resultformat import to_decimal
+
+
+def check_modulus(mod):
+    """
+    Valida o parâmetro mod das implementações.
+    
+    Args:
+        mod (int | None): Módulo (None = aritmética exata)
+        
+    Raises:
+        ValueError: Se mod não for um inteiro >= 1
+    """
+    if mod is not None and (not isinstance(mod, int) or mod < 1):
+        raise ValueError(f"mod deve ser um inteiro >= 1 (recebido: {mod!r})")
+
+
+def parse_modulus(text):
+    """
+    Converte o texto da CLI em um módulo inteiro.
+    
+    Aceita inteiros ("1000000007") e somas/subtrações de potências,
+    como "1e9+7", "2^64", "2**61-1".
+    
+    Args:
+        text (str): Texto a converter
+        
+    Returns:
+        int: Módulo (>= 1)
+    """
+    expr = text.replace(' ', '').replace('**', '^')
+    terms = re.findall(r'([+-]?)([^+-]+)', expr)
+    if not terms or ''.join(sign + term for sign, term in terms) != expr:
+        raise ValueError(f"módulo inválido: {text!r}")
+    
+    total = 0
+    for sign, term in terms:
+        match = re.fullmatch(r'(\d+)(?:([eE^])(\d+))?', term)
+        if not match:
+            raise ValueError(f"módulo inválido: {text!r}")
+        base, op, exp = match.groups()
+        if op is None:
+            value = int(base)
+        elif op == '^':
+            value = int(base) ** int(exp)
+        else:
+            value = int(base) * 10 ** int(exp)
+        total += -value if sign == '-' else value
+    
+    check_modulus(total)
+    return total
+
 
-def climb_stairs_dp(n):
+def climb_stairs_dp(n, mod=None):
     """
     Resolve o problema da escada usando PROGRAMAÇÃO DINÂMICA BOTTOM-UP.
     
@@ -20,6 +93,7 @@ def climb_stairs_dp(n):
     
     Args:
         n (int): Número de degraus da escada
+        mod (int): Se informado, devolve o resultado módulo mod
         
     Returns:
         int: Número de formas diferentes de subir a escada
@@ -33,12 +107,13 @@ def climb_stairs_dp(n):
     - dp[i] = número de formas de chegar ao degrau i
     - dp[i] = dp[i-1] + dp[i-2]
     """
+    check_modulus(mod)
     if n <= 0:
         return 0
     if n == 1:
-        return 1
+        return 1 if mod is None else 1 % mod
     if n == 2:
-        return 2
+        return 2 if mod is None else 2 % mod
     
     # dp[i] representa o número de formas de chegar ao degrau i
     dp = [0] * (n + 1)
@@ -46,10 +121,383 @@ def climb_stairs_dp(n):
     dp[2] = 2  # 2 formas de chegar ao degrau 2 (1+1 ou 2)
     
     # Preencher a tabela de baixo para cima
-    for i in range(3, n + 1):
-        dp[i] = dp[i - 1] + dp[i - 2]
+    if mod is None:
+        for i in range(3, n + 1):
+            dp[i] = dp[i - 1] + dp[i - 2]
+    else:
+        dp[1] %= mod
+        dp[2] %= mod
+        for i in range(3, n + 1):
+            dp[i] = (dp[i - 1] + dp[i - 2]) % mod
     
     return dp[n]
 
 
+def _fib_pair(k, mod=None):
+    """
+    Calcula o par (F(k), F(k+1)) da sequência de Fibonacci por fast doubling.
+
+    Identidades usadas:
+        F(2k)   = F(k) * (2*F(k+1) - F(k))
+        F(2k+1) = F(k)^2 + F(k+1)^2
+
+    Args:
+        k (int): Índice (k >= 0)
+        mod (int): Se informado, os valores são reduzidos módulo mod
+
+    Returns:
+        tuple: (F(k), F(k+1))
+    """
+    a, b = 0, 1  # F(0), F(1)
+    # Percorre os bits de k do mais significativo para o menos significativo
+    if mod is None:
+        for bit in bin(k)[2:]:
+            c = a * (2 * b - a)  # F(2m)
+            d = a * a + b * b    # F(2m+1)
+            if bit == '1':
+                a, b = d, c + d
+            else:
+                a, b = c, d
+        return a, b
+    
+    for bit in bin(k)[2:]:
+        c = a * (2 * b - a) % mod
+        d = (a * a + b * b) % mod
+        if bit == '1':
+            a, b = d, (c + d) % mod
+        else:
+            a, b = c, d
+    return a % mod, b % mod
+
+
+def climb_stairs_fast(n, mod=None):
+    """
+    Resolve o problema da escada usando FAST DOUBLING.
+
+    Usa a relação f(n) = F(n+1), onde F é a sequência de Fibonacci
+    (F(0)=0, F(1)=1), e as identidades de duplicação para avançar
+    dois índices de uma vez. Mantém o mesmo contrato de climb_stairs_dp:
+    f(1)=1, f(2)=2 e f(n)=0 para n <= 0.
+
+    Args:
+        n (int): Número de degraus da escada
+        mod (int): Se informado, devolve o resultado módulo mod
+
+    Returns:
+        int: Número de formas diferentes de subir a escada
+
+    Complexidade:
+        Tempo: O(log n) multiplicações de inteiros grandes
+        Espaço: O(1) - apenas dois valores vivos por vez
+    """
+    check_modulus(mod)
+    if n <= 0:
+        return 0
+    return _fib_pair(n, mod)[1]
+
+
+def climb_stairs_dp_many(ns, mod=None):
+    """
+    Responde várias consultas f(n) em uma ÚNICA varredura bottom-up.
+    
+    Ordena os valores distintos de n e avança a recorrência uma só vez
+    até max(ns), registrando o valor ao passar por cada consulta. Evita
+    recalcular o prefixo comum, como aconteceria chamando climb_stairs_dp
+    separadamente para cada n.
+    
+    Args:
+        ns (iterable): Valores de n (podem repetir e vir fora de ordem)
+        mod (int): Se informado, devolve os resultados módulo mod
+        
+    Returns:
+        list: f(n) para cada n, na ordem de entrada
+        
+    Complexidade:
+        Tempo: O(max(ns) + k log k) para k consultas
+        Espaço: O(k) resultados (sem tabela dp[])
+    """
+    check_modulus(mod)
+    ns = list(ns)
+    answers = {}
+    
+    a, b = 1, 1  # g(i-1), g(i) com i = 1 (g(0) = 1 é a forma vazia)
+    if mod is not None:
+        a, b = a % mod, b % mod
+    i = 1
+    for target in sorted({n for n in ns if n > 0}):
+        if mod is None:
+            for _ in range(target - i):
+                a, b = b, a + b
+        else:
+            for _ in range(target - i):
+                a, b = b, (a + b) % mod
+        i = target
+        answers[target] = b
+    
+    return [answers[n] if n > 0 else 0 for n in ns]
+
+
+def climb_stairs_fast_many(ns, mod=None):
+    """
+    Responde várias consultas f(n) por fast doubling com passos compartilhados.
+    
+    Cada consulta percorre a cadeia k -> k//2 -> ... -> 0; os pares
+    (F(k), F(k+1)) já calculados ficam em um dicionário, de modo que
+    prefixos binários comuns entre as consultas são duplicados uma só vez.
+    
+    Args:
+        ns (iterable): Valores de n (podem repetir e vir fora de ordem)
+        mod (int): Se informado, devolve os resultados módulo mod
+        
+    Returns:
+        list: f(n) para cada n, na ordem de entrada
+        
+    Complexidade:
+        Tempo: O(k log max(ns)) no pior caso, menos com prefixos comuns
+        Espaço: O(número de pares distintos calculados)
+    """
+    check_modulus(mod)
+    ns = list(ns)
+    pairs = {0: (0, 1 if mod is None else 1 % mod)}  # k -> (F(k), F(k+1))
+    
+    for n in sorted({n for n in ns if n > 0}):
+        # Sobe a cadeia de metades até encontrar um par já conhecido
+        chain = []
+        k = n
+        while k not in pairs:
+            chain.append(k)
+            k >>= 1
+        
+        for k in reversed(chain):
+            a, b = pairs[k >> 1]
+            c = a * (2 * b - a)  # F(2m)
+            d = a * a + b * b    # F(2m+1)
+            if mod is not None:
+                c, d = c % mod, d % mod
+            if k & 1:
+                pairs[k] = (d, c + d if mod is None else (c + d) % mod)
+            else:
+                pairs[k] = (c, d)
+    
+    # f(n) = F(n+1)
+    return [pairs[n][1] if n > 0 else 0 for n in ns]
+
+
+def climb_stairs_stream(start=1, stop=None, step=1, mod=None):
+    """
+    Gera f(n) para n em range(start, stop, step) sem materializar a tabela.
+    
+    Segue a semântica de fatiamento de itertools.islice: start inclusivo,
+    stop exclusivo (None = sequência infinita) e step >= 1. O primeiro
+    valor é obtido por fast doubling (O(log start)); os seguintes, somando
+    (step = 1) ou saltando step posições com as identidades de Fibonacci.
+    Apenas dois valores ficam vivos por vez, então o pico de memória é
+    definido pelo maior valor gerado, não pela sequência inteira.
+    
+    Args:
+        start (int): Primeiro n (>= 0)
+        stop (int): n final, exclusivo (None = sem fim)
+        step (int): Incremento de n (>= 1)
+        mod (int): Se informado, gera os valores módulo mod
+        
+    Yields:
+        int: f(start), f(start + step), ...
+        
+    Complexidade:
+        Tempo: O(log start) + O(1) operações por valor (O(log step) iniciais)
+        Espaço: O(1) valores vivos
+    """
+    check_modulus(mod)
+    if start < 0:
+        raise ValueError("start deve ser >= 0")
+    if step < 1:
+        raise ValueError("step deve ser >= 1")
+    
+    n = start
+    if n == 0:
+        if stop is not None and stop <= 0:
+            return
+        yield 0
+        n = step
+    
+    # Estado: (a, b) = (F(n), F(n+1)), logo f(n) = b
+    a, b = _fib_pair(n, mod)
+    
+    if step == 1:
+        while stop is None or n < stop:
+            yield b
+            a, b = b, a + b if mod is None else (a + b) % mod
+            n += 1
+        return
+    
+    # Salto de step posições: F(n+s) = F(n)·F(s-1) + F(n+1)·F(s)
+    #                         F(n+s+1) = F(n)·F(s) + F(n+1)·F(s+1)
+    p, q = _fib_pair(step, mod)
+    r = q - p if mod is None else (q - p) % mod  # F(s-1)
+    while stop is None or n < stop:
+        yield b
+        a, b = a * r + b * p, a * p + b * q
+        if mod is not None:
+            a, b = a % mod, b % mod
+        n += step
+
+
+def write_stream(target, start=1, stop=None, step=1, mod=None, chunk_size=1000, sep='\n'):
+    """
+    Grava a sequência de climb_stairs_stream em blocos.
+    
+    Cada bloco de chunk_size valores é convertido (resultformat.to_decimal,
+    sem o limite de dígitos de str) e enviado de uma vez, mantendo a
+    memória limitada a um bloco. Aceita arquivos de texto
+    (qualquer objeto com write) e sockets (objetos com sendall).
+    
+    Args:
+        target: Arquivo de texto aberto ou socket conectado
+        start (int): Primeiro n (>= 0)
+        stop (int): n final, exclusivo (obrigatório para não gravar sem fim)
+        step (int): Incremento de n (>= 1)
+        mod (int): Se informado, grava os valores módulo mod
+        chunk_size (int): Valores por bloco
+        sep (str): Separador gravado após cada valor
+        
+    Returns:
+        int: Número de valores gravados
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser >= 1")
+    
+    if hasattr(target, 'sendall'):
+        def emit(text):
+            target.sendall(text.encode('utf-8'))
+    else:
+        emit = target.write
+    
+    count = 0
+    chunk = []
+    for value in climb_stairs_stream(start, stop, step, mod):
+        chunk.append(f"{to_decimal(value)}{sep}")
+        if len(chunk) == chunk_size:
+            emit(''.join(chunk))
+            count += len(chunk)
+            chunk.clear()
+    if chunk:
+        emit(''.join(chunk))
+        count += len(chunk)
+    
+    return count
+
+
+class CheckpointedDPTable:
+    """
+    Tabela DP com checkpoints: substitui a lista dp[] completa.
+    
+    Em vez de manter os n+1 inteiros grandes vivos (memória ~n² bits),
+    guarda apenas o par (g(j), g(j+1)) para j múltiplo de k, onde
+    g(j) = f(j) para j >= 1 e g(0) = 1 (forma vazia). Qualquer f(i) é
+    recalculado avançando no máximo k-1 passos a partir do checkpoint.
+    
+    O acesso por índice segue a semântica da tabela de climb_stairs_dp:
+    table[0] == 0, table[1] == 1, table[2] == 2, ..., table[n] == f(n).
+    
+    Complexidade:
+        Construção: O(n)
+        Espaço: O(n/k) checkpoints (≈ √n com o k padrão)
+        Acesso: O(k) (≈ √n com o k padrão)
+    """
+    
+    def __init__(self, n, k=None, mod=None):
+        """
+        Constrói os checkpoints até o degrau n.
+        
+        Args:
+            n (int): Maior degrau da tabela (n >= 0)
+            k (int): Intervalo entre checkpoints (padrão: ⌊√n⌋)
+            mod (int): Se informado, a tabela guarda f(i) módulo mod
+        """
+        check_modulus(mod)
+        if n < 0:
+            raise ValueError("n deve ser >= 0")
+        if k is None:
+            k = max(1, isqrt(n))
+        if k < 1:
+            raise ValueError("k deve ser >= 1")
+        
+        self.n = n
+        self.k = k
+        self.mod = mod
+        self._checkpoints = []
+        
+        a, b = 1, 1  # g(0), g(1)
+        if mod is not None:
+            a, b = a % mod, b % mod
+        for j in range(n + 1):
+            if j % k == 0:
+                self._checkpoints.append((a, b))
+            a, b = b, a + b
+            if mod is not None:
+                b %= mod
+    
+    def __len__(self):
+        """Número de posições da tabela (n + 1, como dp[])."""
+        return self.n + 1
+    
+    def __getitem__(self, i):
+        """
+        Retorna f(i), recalculado a partir do checkpoint mais próximo.
+        
+        Args:
+            i (int): Índice (aceita índices negativos, como uma lista)
+            
+        Returns:
+            int: f(i)
+        """
+        if i < 0:
+            i += self.n + 1
+        if not 0 <= i <= self.n:
+            raise IndexError("índice fora da tabela")
+        if i == 0:
+            return 0
+        
+        a, b = self._checkpoints[i // self.k]
+        if self.mod is None:
+            for _ in range(i % self.k):
+                a, b = b, a + b
+        else:
+            for _ in range(i % self.k):
+                a, b = b, (a + b) % self.mod
+        return a
+    
+    def __iter__(self):
+        """Percorre f(0), f(1), ..., f(n) sem materializar a tabela."""
+        for c, (a, b) in enumerate(self._checkpoints):
+            start = c * self.k
+            for j in range(start, min(start + self.k, self.n + 1)):
+                yield a if j > 0 else 0
+                a, b = b, a + b
+                if self.mod is not None:
+                    b %= self.mod
+
+
+def climb_stairs_checkpointed(n, k=None, mod=None):
+    """
+    Resolve o problema da escada usando a tabela DP com checkpoints.
+    
+    Args:
+        n (int): Número de degraus da escada
+        k (int): Intervalo entre checkpoints (padrão: ⌊√n⌋)
+        mod (int): Se informado, devolve o resultado módulo mod
+        
+    Returns:
+        int: Número de formas diferentes de subir a escada
+        
+    Complexidade:
+        Tempo: O(n)
+        Espaço: O(√n) checkpoints em vez de O(n) entradas
+    """
+    check_modulus(mod)
+    if n <= 0:
+        return 0
+    return CheckpointedDPTable(n, k, mod)[n]
+
+
 ## Versão otimizada removida para simplificação do projeto
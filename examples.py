@@ -10,6 +10,7 @@ from dpclimb import climb_stairs_dp
 from recursiveclimb import climb_stairs_recursive
 from executiontime import measure_execution_time, format_time
 from memoryconsumer import measure_memory, format_memory
+from resultformat import format_result
 
 
 def exemplo_basico():
@@ -116,7 +117,7 @@ def exemplo_grande():
     
     for n in [100, 500, 1000]:
         result, time = measure_execution_time(climb_stairs_dp, n)
-        print(f"n = {n:4}: {result} (tempo: {format_time(time)})")
+        print(f"n = {n:4}: {format_result(result)} (tempo: {format_time(time)})")
     
     print("\nNota: A recursão pura seria inviável para esses valores!")
 
@@ -1,11 +1,30 @@
 """
 Módulo para medir o tempo de execução dos algoritmos.
+
+Para execuções muito curtas (n pequeno na DP, por exemplo), o custo de
+chamar time.perf_counter() é da mesma ordem do tempo medido. Nesses casos
+measure_per_call_time agrupa várias chamadas em cada amostra, no estilo do
+módulo timeit: escolhe o tamanho do lote automaticamente (autorange),
+desconta o custo calibrado do laço e do cronômetro e devolve o tempo por
+chamada.
 """
 
+import gc
+import itertools
 import time
 from functools import wraps
 
 
+# Duração mínima de uma amostra agrupada, em segundos
+DEFAULT_MIN_SAMPLE_TIME = 0.002
+
+# Abaixo desta duração uma única chamada é dominada pelo ruído do cronômetro
+SHORT_RUN_THRESHOLD = 0.0001
+
+# Custo calibrado do laço + cronômetro: número de chamadas -> segundos
+_overhead_cache = {}
+
+
 def measure_time(func):
     """
     Decorator para medir o tempo de execução de uma função.
@@ -64,3 +83,99 @@ def format_time(seconds):
         return f"{seconds * 1000:.2f} ms"
     else:
         return f"{seconds:.4f} s"
+
+
+def _noop(*args, **kwargs):
+    """Função vazia usada para calibrar o custo do laço de medição."""
+
+
+def _time_batch(func, args, kwargs, number):
+    """
+    Cronometra number chamadas seguidas de func, com o gc desligado.
+    
+    Returns:
+        tuple: (resultado da última chamada, tempo_total_em_segundos)
+    """
+    result = None
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start_time = time.perf_counter()
+        for _ in itertools.repeat(None, number):
+            result = func(*args, **kwargs)
+        end_time = time.perf_counter()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return result, end_time - start_time
+
+
+def calibrate_overhead(number, repeat=5):
+    """
+    Mede o custo fixo de um lote: laço, despacho da chamada e cronômetro.
+    
+    Usa uma função vazia no lugar da função medida e guarda o menor tempo
+    de repeat lotes (o menos perturbado). O valor fica em cache por
+    tamanho de lote.
+    
+    Args:
+        number (int): Chamadas por lote
+        repeat (int): Lotes cronometrados na calibração
+        
+    Returns:
+        float: Custo total de um lote de number chamadas vazias, em segundos
+    """
+    overhead = _overhead_cache.get(number)
+    if overhead is None:
+        overhead = min(_time_batch(_noop, (), {}, number)[1] for _ in range(repeat))
+        _overhead_cache[number] = overhead
+    return overhead
+
+
+def autorange(func, *args, min_time=DEFAULT_MIN_SAMPLE_TIME, **kwargs):
+    """
+    Escolhe quantas chamadas agrupar para uma amostra durar min_time.
+    
+    Tenta lotes de 1, 2, 5, 10, 20, 50, ... chamadas (como
+    timeit.Timer.autorange) até um lote durar ao menos min_time.
+    
+    Args:
+        func: Função a ser medida
+        *args: Argumentos posicionais para a função
+        min_time (float): Duração mínima de uma amostra, em segundos
+        **kwargs: Argumentos nomeados para a função
+        
+    Returns:
+        int: Número de chamadas por amostra
+    """
+    for exponent in itertools.count():
+        for multiplier in (1, 2, 5):
+            number = multiplier * 10 ** exponent
+            _, elapsed = _time_batch(func, args, kwargs, number)
+            if elapsed >= min_time:
+                return number
+
+
+def measure_per_call_time(func, *args, number=None, min_time=DEFAULT_MIN_SAMPLE_TIME, **kwargs):
+    """
+    Mede o tempo por chamada agrupando várias chamadas em uma amostra.
+    
+    Args:
+        func: Função a ser executada
+        *args: Argumentos posicionais para a função
+        number (int): Chamadas por amostra (padrão: escolhido por autorange)
+        min_time (float): Duração mínima de uma amostra, se number não for dado
+        **kwargs: Argumentos nomeados para a função
+        
+    Returns:
+        tuple: (resultado, tempo_por_chamada_em_segundos, chamadas_por_amostra)
+        
+    Complexidade:
+        Tempo: number execuções de func (mais a calibração, feita uma vez
+        por tamanho de lote)
+    """
+    if number is None:
+        number = autorange(func, *args, min_time=min_time, **kwargs)
+    overhead = calibrate_overhead(number)
+    result, elapsed = _time_batch(func, args, kwargs, number)
+    return result, max(0.0, elapsed - overhead) / number, number
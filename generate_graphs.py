@@ -2,21 +2,32 @@
 """
 Gerador de Gráficos - Análise de Benchmark
 
-Gera gráficos a partir do arquivo benchmark_results.csv:
+Gera gráficos a partir do arquivo benchmark_results.csv (ou do formato
+binário por colunas benchmark_results.npz, de `benchmark.py --npz`):
 1. Gráfico de barras - Comparação de tempo de execução
 2. Gráfico de linhas - Comparação de consumo de memória
 
+Só as colunas usadas pelos gráficos são lidas do arquivo.
+
 Uso:
     python generate_graphs.py
     python generate_graphs.py benchmark_results.csv
+    python generate_graphs.py benchmark_results.npz
 """
 
 import sys
-import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+from columnar import load_columns
+
+
+# Colunas lidas por gráfico, além das usadas para filtrar (Status, Protocolo)
+TIME_COLUMNS = ('Algoritmo', 'N', 'Mediana_Tempo_s')
+MEMORY_COLUMNS = ('Algoritmo', 'N', 'Mediana_Memoria_bytes')
+FILTER_COLUMNS = ('Status', 'Protocolo')
+
 
 def format_time_axis(seconds):
     """Formata tempo para o eixo Y do gráfico."""
@@ -42,6 +53,23 @@ def format_memory_axis(bytes_val):
         return f'{bytes_val/1024**3:.1f} GB'
 
 
+def algorithm_colors(count):
+    """
+    Retorna uma cor por algoritmo.
+    
+    Os dois primeiros mantêm as cores originais (vermelho para Força Bruta,
+    azul para DP); os demais usam a paleta tab10 do matplotlib.
+    """
+    base = ['#e74c3c', '#3498db']
+    extra = [plt.cm.tab10(i % 10) for i in range(2, count)]
+    return (base + extra)[:count]
+
+
+def algorithm_label(algo):
+    """Remove a numeração ("1. ") do nome do algoritmo para a legenda."""
+    return algo.split('. ', 1)[-1]
+
+
 def generate_time_bar_chart(df, output_file='grafico_tempo.png'):
     """
     Gera gráfico de barras comparando tempo de execução.
@@ -59,17 +87,18 @@ def generate_time_bar_chart(df, output_file='grafico_tempo.png'):
     
     # Largura das barras
     x = np.arange(len(n_values))
-    width = 0.35
+    width = 0.7 / max(len(algorithms), 2)
     
     # Cores
-    colors = ['#e74c3c', '#3498db']  # Vermelho para Brute, Azul para DP
+    colors = algorithm_colors(len(algorithms))
     
     # Plotar barras para cada algoritmo
     for i, algo in enumerate(algorithms):
         algo_data = df[df['Algoritmo'] == algo].sort_values('N')
+        positions = x[np.searchsorted(n_values, algo_data['N'].values)]
         times = algo_data['Mediana_Tempo_s'].values
         
-        bars = ax.bar(x + i*width, times, width, label=algo.split('. ')[1], 
+        bars = ax.bar(positions + i*width, times, width, label=algorithm_label(algo), 
                       color=colors[i], alpha=0.8, edgecolor='black', linewidth=0.5)
         
         # Adicionar rótulos nas barras
@@ -84,7 +113,7 @@ def generate_time_bar_chart(df, output_file='grafico_tempo.png'):
     ax.set_ylabel('Tempo de Execução (escala logarítmica)', fontsize=12, fontweight='bold')
     ax.set_title('Comparação de Tempo de Execução - Força Bruta vs Programação Dinâmica',
                  fontsize=14, fontweight='bold', pad=20)
-    ax.set_xticks(x + width / 2)
+    ax.set_xticks(x + width * (len(algorithms) - 1) / 2)
     ax.set_xticklabels(n_values)
     ax.legend(loc='upper left', fontsize=10)
     ax.grid(True, alpha=0.3, axis='y', linestyle='--')
@@ -117,9 +146,9 @@ def generate_memory_line_chart(df, output_file='grafico_memoria.png'):
     fig, ax = plt.subplots(figsize=(12, 7))
     
     # Cores e estilos
-    colors = ['#e74c3c', '#3498db']  # Vermelho para Brute, Azul para DP
-    markers = ['o', 's']  # Círculo e quadrado
-    linestyles = ['-', '--']
+    colors = algorithm_colors(len(algorithms))
+    markers = ['o', 's', '^', 'D', 'v', 'P', 'X', '*']
+    linestyles = ['-', '--', '-.', ':']
     
     # Plotar linhas para cada algoritmo
     for i, algo in enumerate(algorithms):
@@ -128,9 +157,10 @@ def generate_memory_line_chart(df, output_file='grafico_memoria.png'):
         memory = algo_data['Mediana_Memoria_bytes'].values
         
         # Plotar linha
-        ax.plot(n_values, memory, marker=markers[i], linestyle=linestyles[i],
+        ax.plot(n_values, memory, marker=markers[i % len(markers)],
+               linestyle=linestyles[i % len(linestyles)],
                color=colors[i], linewidth=2.5, markersize=8, alpha=0.8,
-               label=algo.split('. ')[1], markeredgecolor='black', markeredgewidth=0.5)
+               label=algorithm_label(algo), markeredgecolor='black', markeredgewidth=0.5)
         
         # Adicionar rótulos nos pontos
         for n, mem in zip(n_values, memory):
@@ -176,14 +206,29 @@ def main():
     print('='*80)
     print(f'\nLendo dados de: {csv_file}')
     
-    # Ler CSV
+    # Ler só as colunas necessárias
     try:
-        df = pd.read_csv(csv_file)
+        df = load_columns(csv_file, {*TIME_COLUMNS, *MEMORY_COLUMNS, *FILTER_COLUMNS})
         print(f'✓ {len(df)} registros carregados')
+        if 'Status' in df.columns:
+            # Medições interrompidas pelo limite de tempo não têm valores
+            timeouts = df[df['Status'] != 'ok']
+            if len(timeouts):
+                print(f'  - Ignorando {len(timeouts)} medição(ões) com TIMEOUT')
+            df = df[df['Status'] == 'ok']
+        if 'Protocolo' in df.columns:
+            # Tempos de protocolos diferentes não são comparáveis
+            protocols = df['Protocolo'].replace('', np.nan).dropna().unique()
+            if len(protocols) > 1:
+                print(f'Erro: o CSV mistura protocolos de medição ({", ".join(protocols)}).')
+                print('Gere os gráficos a partir de um benchmark com um único protocolo.')
+                sys.exit(1)
+            if len(protocols):
+                print(f'  - Protocolo: {protocols[0]}')
         print(f'  - Algoritmos: {", ".join(df["Algoritmo"].unique())}')
         print(f'  - Valores de N: {sorted(df["N"].unique())}')
     except Exception as e:
-        print(f'Erro ao ler CSV: {e}')
+        print(f'Erro ao ler {csv_file}: {e}')
         sys.exit(1)
     
     print('\n' + '-'*80)
@@ -0,0 +1,411 @@
+"""
+Histórico persistente dos benchmarks e detecção de regressões.
+
+Cada execução de benchmark.py é gravada em um banco SQLite local
+(benchmark_history.db), identificada pelo commit do git, pela versão do
+Python e por uma impressão digital da máquina; cada medição é indexada por
+algoritmo e N.
+
+O comando compare confronta uma execução com uma base (baseline) e aponta
+lentidões e aumentos de memória estatisticamente significativos (teste t
+de Welch sobre média, desvio padrão e número de execuções). Sai com
+código 1 se houver regressão, para ser usado como portão de deploy:
+
+    python history.py list
+    python history.py compare --baseline anterior
+    python history.py compare --baseline 3f2a9c1 --candidate 12
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+
+
+DEFAULT_DATABASE = 'benchmark_history.db'
+
+# Nível de significância do teste e menor variação relativa considerada regressão
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_CHANGE = 0.05
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    git_commit TEXT NOT NULL,
+    python_version TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    machine_description TEXT NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    algorithm TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    protocol TEXT,
+    median_time REAL,
+    mean_time REAL,
+    stdev_time REAL,
+    num_executions INTEGER,
+    median_memory REAL,
+    mean_memory REAL,
+    stdev_memory REAL,
+    memory_executions INTEGER,
+    PRIMARY KEY (run_id, algorithm, n)
+);
+"""
+
+
+def git_commit(path='.'):
+    """
+    Identifica o commit atual do repositório.
+
+    Args:
+        path (str): Diretório dentro do repositório
+
+    Returns:
+        str: Hash do commit, com sufixo '-dirty' se houver alterações não
+            commitadas, ou 'desconhecido' fora de um repositório git
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=path, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                cwd=path, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecido'
+    return f"{commit}-dirty" if status.strip() else commit
+
+
+def machine_description():
+    """Descrição legível da máquina: sistema, arquitetura, processador e núcleos."""
+    return (f"{platform.system()} {platform.release()} {platform.machine()} | "
+            f"{platform.processor() or 'cpu desconhecida'} | {os.cpu_count()} núcleo(s)")
+
+
+def machine_fingerprint():
+    """
+    Impressão digital curta da máquina.
+
+    Returns:
+        str: 12 dígitos hexadecimais derivados do nome do host e do hardware
+    """
+    raw = f"{platform.node()}|{machine_description()}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def connect(path=DEFAULT_DATABASE):
+    """
+    Abre (e cria, se preciso) o banco de histórico.
+
+    Args:
+        path (str): Arquivo SQLite
+
+    Returns:
+        sqlite3.Connection: Conexão com as tabelas criadas
+    """
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def record_run(results, path=DEFAULT_DATABASE, label=None, commit=None):
+    """
+    Grava uma execução de benchmark no histórico.
+
+    Args:
+        results (dict): Resultados no formato de benchmark.run_full_benchmark
+        path (str): Arquivo SQLite
+        label (str): Rótulo livre da execução (ex.: 'completo', 'lote')
+        commit (str): Commit a registrar (padrão: git_commit())
+
+    Returns:
+        int: Identificador da execução gravada
+    """
+    connection = connect(path)
+    try:
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (created_at, git_commit, python_version, machine, "
+                "machine_description, label) VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), commit or git_commit(),
+                 platform.python_version(), machine_fingerprint(), machine_description(), label))
+            run_id = cursor.lastrowid
+            for algorithm, algo_results in results.items():
+                for n, stats in algo_results.items():
+                    connection.execute(
+                        "INSERT INTO measurements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (run_id, algorithm, n, stats.get('status', 'ok'), stats.get('protocol'),
+                         stats.get('median_time'), stats.get('mean_time'), stats.get('stdev_time'),
+                         stats.get('num_executions'), stats.get('median_memory'),
+                         stats.get('mean_memory'), stats.get('stdev_memory'),
+                         stats.get('memory_executions', stats.get('num_executions'))))
+    finally:
+        connection.close()
+    return run_id
+
+
+def list_runs(connection):
+    """Retorna todas as execuções gravadas, da mais antiga para a mais recente."""
+    return connection.execute("SELECT * FROM runs ORDER BY id").fetchall()
+
+
+def resolve_run(connection, ref, relative_to=None):
+    """
+    Encontra uma execução a partir de uma referência.
+
+    Args:
+        connection (sqlite3.Connection): Conexão com o histórico
+        ref (str): Id numérico, prefixo de commit, 'ultima' ou 'anterior'
+            ('anterior' = execução anterior a relative_to com a mesma
+            máquina, versão do Python e rótulo)
+        relative_to (sqlite3.Row): Execução de referência para 'anterior'
+
+    Returns:
+        sqlite3.Row: Execução encontrada (a mais recente, se várias casarem)
+
+    Raises:
+        LookupError: Se nenhuma execução casar
+    """
+    if ref == 'ultima':
+        row = connection.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+    elif ref == 'anterior':
+        if relative_to is None:
+            raise LookupError("'anterior' exige uma execução de referência")
+        row = connection.execute(
+            "SELECT * FROM runs WHERE id < ? AND machine = ? AND python_version = ? "
+            "AND label IS ? ORDER BY id DESC LIMIT 1",
+            (relative_to['id'], relative_to['machine'], relative_to['python_version'],
+             relative_to['label'])).fetchone()
+    elif ref.isdigit():
+        row = connection.execute("SELECT * FROM runs WHERE id = ?", (int(ref),)).fetchone()
+    else:
+        row = connection.execute(
+            "SELECT * FROM runs WHERE git_commit LIKE ? ORDER BY id DESC LIMIT 1",
+            (ref + '%',)).fetchone()
+    if row is None:
+        raise LookupError(f"nenhuma execução encontrada para {ref!r}")
+    return row
+
+
+def _betacf(a, b, x):
+    """Fração contínua da função beta incompleta (Numerical Recipes, betacf)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c, d = 1.0, 1 - qab * x / qap
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c if abs(1 + aa / c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c if abs(1 + aa / c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 3e-14:
+            break
+    return h
+
+
+def _regularized_beta(a, b, x):
+    """Função beta incompleta regularizada I_x(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1 - math.exp(log_front) * _betacf(b, a, 1 - x) / b
+
+
+def student_t_sf(t, df):
+    """
+    Probabilidade P(T > t) da distribuição t de Student.
+
+    Args:
+        t (float): Estatística t
+        df (float): Graus de liberdade (> 0, não precisa ser inteiro)
+
+    Returns:
+        float: Probabilidade da cauda superior
+    """
+    tail = 0.5 * _regularized_beta(df / 2, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1 - tail
+
+
+def welch_test(mean_a, stdev_a, count_a, mean_b, stdev_b, count_b):
+    """
+    Teste t de Welch unilateral: a média de b é maior que a de a?
+
+    Args:
+        mean_a, stdev_a, count_a: Média, desvio padrão e tamanho da base
+        mean_b, stdev_b, count_b: Média, desvio padrão e tamanho do candidato
+
+    Returns:
+        float: Valor-p da hipótese "média de b > média de a" (1.0 se não
+            houver dados suficientes)
+    """
+    if count_a < 2 or count_b < 2:
+        return 1.0
+    var_a = stdev_a * stdev_a / count_a
+    var_b = stdev_b * stdev_b / count_b
+    if var_a + var_b == 0:
+        # Sem variação (ex.: memória determinística): diferença é certa
+        return 0.0 if mean_b > mean_a else 1.0
+    t = (mean_b - mean_a) / math.sqrt(var_a + var_b)
+    df = (var_a + var_b) ** 2 / ((var_a ** 2 / (count_a - 1) if var_a else 0)
+                                 + (var_b ** 2 / (count_b - 1) if var_b else 0))
+    return student_t_sf(t, df)
+
+
+def _measurements(connection, run_id):
+    """Medições concluídas de uma execução: (algoritmo, n) -> linha."""
+    rows = connection.execute(
+        "SELECT * FROM measurements WHERE run_id = ? AND status = 'ok'", (run_id,))
+    return {(row['algorithm'], row['n']): row for row in rows}
+
+
+def compare_runs(connection, baseline_id, candidate_id, alpha=DEFAULT_ALPHA,
+                 min_change=DEFAULT_MIN_CHANGE):
+    """
+    Compara duas execuções e aponta regressões.
+
+    Um par (algoritmo, N) medido nas duas execuções é regressão de tempo
+    (ou de memória) quando o teste de Welch rejeita "não ficou mais lento"
+    com valor-p < alpha E a média cresceu mais que min_change.
+
+    Args:
+        connection (sqlite3.Connection): Conexão com o histórico
+        baseline_id (int): Execução base
+        candidate_id (int): Execução avaliada
+        alpha (float): Nível de significância
+        min_change (float): Menor aumento relativo considerado (0.05 = 5%)
+
+    Returns:
+        list: Dicionários com algorithm, n, metric ('tempo' ou 'memória'),
+            baseline, candidate, change (relativa) e p_value, um por regressão
+    """
+    baseline = _measurements(connection, baseline_id)
+    candidate = _measurements(connection, candidate_id)
+
+    regressions = []
+    for key in sorted(baseline.keys() & candidate.keys()):
+        base, cand = baseline[key], candidate[key]
+        checks = [
+            ('tempo', 'mean_time', 'stdev_time', 'num_executions'),
+            ('memória', 'mean_memory', 'stdev_memory', 'memory_executions'),
+        ]
+        for metric, mean_col, stdev_col, count_col in checks:
+            if base[mean_col] is None or cand[mean_col] is None:
+                continue
+            if base[mean_col] > 0:
+                change = cand[mean_col] / base[mean_col] - 1
+            else:
+                change = math.inf if cand[mean_col] > 0 else 0.0
+            if change <= min_change:
+                continue
+            p_value = welch_test(base[mean_col], base[stdev_col] or 0, base[count_col] or 0,
+                                 cand[mean_col], cand[stdev_col] or 0, cand[count_col] or 0)
+            if p_value < alpha:
+                regressions.append({
+                    'algorithm': key[0], 'n': key[1], 'metric': metric,
+                    'baseline': base[mean_col], 'candidate': cand[mean_col],
+                    'change': change, 'p_value': p_value,
+                })
+    return regressions
+
+
+def parse_args(argv=None):
+    """
+    Interpreta os argumentos da linha de comando.
+
+    Args:
+        argv (list): Argumentos (padrão: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Argumentos interpretados
+    """
+    parser = argparse.ArgumentParser(description='Histórico de benchmarks e regressões.')
+    parser.add_argument('--db', default=DEFAULT_DATABASE,
+                        help=f'Banco SQLite do histórico (padrão: {DEFAULT_DATABASE})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='Lista as execuções gravadas')
+    compare = commands.add_parser('compare', help='Compara uma execução com uma base; '
+                                                  'sai com código 1 se houver regressão')
+    compare.add_argument('--baseline', default='anterior',
+                         help="Base: id, prefixo de commit, 'ultima' ou 'anterior' (padrão)")
+    compare.add_argument('--candidate', default='ultima',
+                         help="Execução avaliada: id, prefixo de commit ou 'ultima' (padrão)")
+    compare.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                         help=f'Nível de significância (padrão: {DEFAULT_ALPHA})')
+    compare.add_argument('--min-change', type=float, default=DEFAULT_MIN_CHANGE,
+                         help=f'Menor aumento relativo considerado (padrão: {DEFAULT_MIN_CHANGE})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Função principal.
+
+    Returns:
+        int: Código de saída (0 = sem regressões, 1 = regressões, 2 = erro)
+    """
+    from executiontime import format_time
+    from memoryconsumer import format_memory
+
+    args = parse_args(argv)
+    connection = connect(args.db)
+    try:
+        if args.command == 'list':
+            for run in list_runs(connection):
+                print(f"{run['id']:>4}  {run['created_at']}  {run['git_commit'][:12]:<18} "
+                      f"py{run['python_version']}  {run['machine']}  {run['label'] or ''}")
+            return 0
+
+        try:
+            candidate = resolve_run(connection, args.candidate)
+            baseline = resolve_run(connection, args.baseline, relative_to=candidate)
+        except LookupError as e:
+            print(f"Erro: {e}")
+            return 2
+
+        print(f"Base:      #{baseline['id']} {baseline['git_commit'][:12]} ({baseline['created_at']})")
+        print(f"Candidato: #{candidate['id']} {candidate['git_commit'][:12]} ({candidate['created_at']})")
+        if (baseline['machine'], baseline['python_version']) != (candidate['machine'],
+                                                                 candidate['python_version']):
+            print("AVISO: máquina ou versão do Python diferentes; a comparação pode não ser válida")
+
+        regressions = compare_runs(connection, baseline['id'], candidate['id'],
+                                   args.alpha, args.min_change)
+        if not regressions:
+            print("\n✓ Nenhuma regressão significativa")
+            return 0
+
+        print(f"\n✗ {len(regressions)} regressão(ões) significativa(s):")
+        for r in regressions:
+            fmt = format_time if r['metric'] == 'tempo' else (lambda v: format_memory(int(v)))
+            print(f"  • {r['algorithm']} | N = {r['n']} | {r['metric']}: "
+                  f"{fmt(r['baseline'])} → {fmt(r['candidate'])} "
+                  f"(+{r['change']:.1%}, p = {r['p_value']:.2g})")
+        return 1
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Diário (journal) das medições de um benchmark em andamento.
+
+benchmark.py só grava os arquivos de resultados no final; se a máquina
+reiniciar ou a execução for interrompida (Ctrl-C), as medições concluídas
+se perdem. O diário acrescenta cada par (algoritmo, N) a um arquivo JSONL
+(benchmark_journal.jsonl) assim que ele termina, com flush e fsync, e
+`benchmark.py --resume` pula os pares já registrados.
+
+Formato: a primeira linha descreve a execução (opções de medição); cada
+linha seguinte é um par concluído. Uma linha truncada por uma queda no
+meio da escrita é descartada na retomada (o arquivo é cortado na última
+linha completa antes de receber novos pares).
+
+    {"type": "run", "created_at": "...", "options": {...}}
+    {"type": "cell", "algorithm": "...", "n": 30, "stats": {...}}
+"""
+
+import json
+import os
+from datetime import datetime
+
+from recordsink import truncate_partial_line
+
+
+DEFAULT_JOURNAL = 'benchmark_journal.jsonl'
+
+
+def read_journal(path):
+    """
+    Lê um diário existente.
+
+    Args:
+        path (str): Arquivo JSONL do diário
+
+    Returns:
+        tuple: (opções da execução ou None, dict (algoritmo, n) -> estatísticas)
+    """
+    options = None
+    cells = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # linha truncada por uma interrupção
+                if record.get('type') == 'run':
+                    options = record['options']
+                elif record.get('type') == 'cell':
+                    cells[record['algorithm'], record['n']] = record['stats']
+    except FileNotFoundError:
+        pass
+    return options, cells
+
+
+class Journal:
+    """Diário de medições, gravado em disco a cada par concluído."""
+
+    def __init__(self, path=DEFAULT_JOURNAL, options=None, resume=False):
+        """
+        Abre o diário.
+
+        Com resume=True, os pares de um diário anterior com as mesmas
+        opções são carregados e uma linha final truncada é removida do
+        arquivo, para que o próximo par não seja colado a ela; caso
+        contrário (ou se as opções mudaram), o diário começa vazio.
+
+        Args:
+            path (str): Arquivo JSONL do diário
+            options (dict): Opções de medição da execução (serializáveis)
+            resume (bool): Se True, retoma um diário existente
+        """
+        self.path = path
+        self.options = json.loads(json.dumps(options or {}))
+        self.cells = {}
+        if resume:
+            previous_options, cells = read_journal(path)
+            if previous_options == self.options:
+                truncate_partial_line(path)
+                self.cells = cells
+                return
+            if previous_options is not None:
+                print(f"⚠ {path} foi gravado com outras opções de medição; começando do zero")
+        self._write({'type': 'run', 'created_at': datetime.now().isoformat(timespec='seconds'),
+                     'options': self.options}, mode='w')
+
+    def _write(self, record, mode='a'):
+        """Grava uma linha e força a ida para o disco."""
+        with open(self.path, mode, encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def get(self, algorithm, n):
+        """
+        Estatísticas registradas para o par, se houver.
+
+        Returns:
+            dict | None: Cópia das estatísticas, ou None
+        """
+        stats = self.cells.get((algorithm, n))
+        return dict(stats) if stats is not None else None
+
+    def record(self, algorithm, n, stats):
+        """
+        Registra um par concluído (medido, do cache ou timeout).
+
+        Args:
+            algorithm (str): Nome do algoritmo
+            n (int): Tamanho da entrada
+            stats (dict): Estatísticas do par
+        """
+        self.cells[algorithm, n] = stats
+        self._write({'type': 'cell', 'algorithm': algorithm, 'n': n, 'stats': stats})
+
+    def __len__(self):
+        return len(self.cells)
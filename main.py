@@ -7,15 +7,111 @@ IMPLEMENTAÇÕES PRINCIPAIS (Solicitadas no Trabalho):
 1. Recursão Pura (Força Bruta) - Abordagem Recursiva
 2. Programação Dinâmica Bottom-up - Abordagem com PD
 
-Observação: versões auxiliares foram removidas para simplificação do projeto
+IMPLEMENTAÇÕES AUXILIARES:
+3. Fast Doubling - O(log n), selecionável com --algo fast
+4. DP com Checkpoints - memória O(√n), selecionável com --algo checkpoint
+5. Passos Genéricos (janela deslizante) - --algo steps, passos com --steps
+6. Passos Genéricos (Kitamasa) - --algo kitamasa, passos com --steps
+
+MODO MODULAR: --mod M calcula f(n) mod M em todas as implementações.
+7. Período de Pisano - consultas O(1) com --mod M <= 10^6 (--algo pisano)
+8. Força Bruta com pilha explícita - sem RecursionError (--algo stack)
+
+MODO LOTE: --batch responde todos os N de uma vez (climb_stairs_dp_many e
+climb_stairs_fast_many) e compara com uma chamada por N.
+
+MODO SEQUÊNCIA: --stream ARQUIVO grava f(1), ..., f(max N) sob demanda, em
+blocos, sem materializar a tabela ('-' grava na saída padrão).
+
+MEDIÇÃO: cada teste faz duas execuções (protocolo 'separado',
+measurement.py): primeiro a de memória, sob tracemalloc, que fornece o
+resultado e serve de aquecimento, e depois a de tempo, com o gc desligado
+e sem tracemalloc. Assim a força bruta roda duas vezes por N, não três; em
+troca, a memória é a de uma execução fria (inclui caches preenchidos na
+primeira chamada, como o período de Pisano).
+
+PREVISÃO DE TEMPO: antes de cada execução da força bruta, o tempo é
+previsto pelo modelo O(φ^n) calibrado em n pequenos e ajustado às medições
+anteriores (complexity.py). Execuções previstas acima de --time-limit
+segundos são puladas. As demais implementações nunca são puladas: seus
+tempos de microssegundos são ruidosos demais para extrapolar.
+
+INSTRUMENTAÇÃO: --instrument conta chamadas, subproblemas repetidos e
+profundidade máxima da recursão pura (em uma execução à parte da medição).
+
+SAÍDA INCREMENTAL: --output ARQUIVO (.csv ou .jsonl) grava cada registro
+assim que é medido (recordsink.py), sem guardá-los em memória; o que já foi
+medido sobrevive a uma queda. Sem --output, o CSV é oferecido no final.
+
+RESULTADOS GRANDES: por padrão, resultados com mais de 60 dígitos são
+exibidos só com os primeiros e os últimos dígitos e a contagem
+(resultformat.py), sem a conversão decimal completa, quadrática em n;
+--result-format completo exibe todos os dígitos.
 """
 
+import argparse
 import sys
-from dpclimb import climb_stairs_dp
-from recursiveclimb import climb_stairs_recursive
-from executiontime import measure_execution_time, format_time
+from functools import partial
+from dpclimb import (climb_stairs_dp, climb_stairs_fast, climb_stairs_checkpointed, parse_modulus,
+                     climb_stairs_dp_many, climb_stairs_fast_many, write_stream)
+from recursiveclimb import climb_stairs_recursive, climb_stairs_iterative_stack, instrumentation_for
+from stepclimb import climb_stairs_steps, climb_stairs_steps_kitamasa, parse_steps
+from pisano import climb_stairs_pisano, default_cache as pisano_cache, MAX_MODULUS
+from executiontime import format_time
 from memoryconsumer import measure_memory, format_memory
+from measurement import PROTOCOL_SEPARATE, describe_protocol, warm_up, measure_time_without_gc
 from datasheet import DataSheet
+from resultformat import DEFAULT_RESULT_FORMAT, RESULT_FORMATS, format_result
+from recordsink import DEFAULT_FLUSH_EVERY, DEFAULT_FSYNC_INTERVAL, open_sink
+from complexity import RuntimePredictor, CALIBRATION_NS, EXPONENTIAL_MODEL
+
+
+# Implementações disponíveis: chave da CLI -> (nome exibido, função)
+ALGORITHMS = {
+    'brute': ("1. Recursão Pura (FORÇA BRUTA)", climb_stairs_recursive),
+    'dp': ("2. Programação Dinâmica BOTTOM-UP", climb_stairs_dp),
+    'fast': ("3. Fast Doubling O(log n)", climb_stairs_fast),
+    'checkpoint': ("4. DP com Checkpoints (√n)", climb_stairs_checkpointed),
+    'steps': ("5. Passos Genéricos (janela deslizante)", climb_stairs_steps),
+    'kitamasa': ("6. Passos Genéricos (Kitamasa)", climb_stairs_steps_kitamasa),
+    'pisano': ("7. Período de Pisano (cache)", climb_stairs_pisano),
+    'stack': ("8. Força Bruta (pilha explícita)", climb_stairs_iterative_stack),
+}
+
+# Implementações exponenciais (puladas com skip_recursive)
+EXPONENTIAL_ALGORITHMS = ['brute', 'stack']
+
+# Previsão de tempo: execuções previstas acima do limite são puladas;
+# as exponenciais são calibradas antes em CALIBRATION_NS (alguns milissegundos)
+DEFAULT_TIME_LIMIT = 60.0
+
+# Implementações que aceitam um conjunto arbitrário de passos (--steps)
+STEP_ALGORITHMS = ['steps', 'kitamasa']
+DEFAULT_STEPS = (1, 2)
+
+# Implementações que só existem no modo modular (exigem --mod)
+MODULAR_ALGORITHMS = ['pisano']
+
+
+def default_algorithms(steps=None, mod=None):
+    """
+    Retorna as chaves de ALGORITHMS aplicáveis à configuração.
+    
+    Args:
+        steps (tuple): Passos permitidos (None = 1 e 2)
+        mod (int): Módulo do modo modular (None = aritmética exata)
+        
+    Returns:
+        list: Chaves de ALGORITHMS
+    """
+    if steps is not None and tuple(steps) != DEFAULT_STEPS:
+        # Com passos personalizados, só as implementações genéricas se aplicam
+        return list(STEP_ALGORITHMS)
+    
+    algorithms = [key for key in ALGORITHMS if key not in MODULAR_ALGORITHMS]
+    if mod is not None and mod <= MAX_MODULUS:
+        algorithms += MODULAR_ALGORITHMS
+    return algorithms
 
 
 def print_header():
@@ -31,11 +127,15 @@ def print_header():
     print("  1. Recursão Pura (FORÇA BRUTA) - Abordagem Recursiva")
     print("  2. Programação Dinâmica BOTTOM-UP - Abordagem com PD")
     print("\n" + "-"*80)
-    print("Projeto simplificado: apenas Força Bruta e DP Bottom-up")
+    print("Auxiliares: 3. Fast Doubling O(log n) (--algo fast)")
+    print("            4. DP com Checkpoints (√n) (--algo checkpoint)")
+    print("            5/6. Passos Genéricos (--algo steps/kitamasa --steps 1,3,5)")
+    print("            7. Período de Pisano (--algo pisano --mod M)")
+    print("            8. Força Bruta com pilha explícita (--algo stack)")
     print("="*80 + "\n")
 
 
-def test_algorithm(name, func, n, datasheet):
+def test_algorithm(name, func, n, datasheet, instrument=False):
     """
     Testa um algoritmo e registra os resultados.
     
@@ -44,21 +144,32 @@ def test_algorithm(name, func, n, datasheet):
         func: Função a ser testada
         n (int): Número de degraus
         datasheet (DataSheet): Objeto para armazenar resultados
+        instrument (bool): Se True e houver versão instrumentada, coleta
+            os contadores da recursão em uma execução separada
     """
     print(f"\nTestando: {name} com n={n}")
     print("-" * 60)
     
     try:
-        # Medir tempo e memória
+        # A passagem de memória fornece o resultado e serve de aquecimento para a de tempo
         result, memory = measure_memory(func, n)
-        _, exec_time = measure_execution_time(func, n)
+        _, exec_time = measure_time_without_gc(func, n)
         
-        print(f"Resultado: {result}")
+        print(f"Resultado: {format_result(result, datasheet.result_format)}")
         print(f"Tempo de execução: {format_time(exec_time)}")
         print(f"Consumo de memória: {format_memory(memory)}")
         
+        # Contadores da recursão (fora das medições de tempo e memória)
+        counters = {}
+        profiler = instrumentation_for(func) if instrument else None
+        if profiler is not None:
+            _, stats = profiler(n)
+            counters = stats.as_dict()
+            print(f"Chamadas: {stats.calls} | Repetidas: {stats.repeated_calls} | "
+                  f"Profundidade máx.: {stats.max_depth}")
+        
         # Adicionar ao datasheet
-        datasheet.add_record(name, n, result, exec_time, memory)
+        datasheet.add_record(name, n, result, exec_time, memory, **counters)
         
         return True
     except RecursionError:
@@ -69,15 +180,58 @@ def test_algorithm(name, func, n, datasheet):
         return False
 
 
-def run_comparison(test_values, skip_recursive=False):
+def build_predictor(key, func):
+    """
+    Cria o preditor de tempo de uma implementação exponencial.
+    
+    Só as implementações de EXPONENTIAL_ALGORITHMS têm preditor: o modelo
+    O(φ^n) é imposto (não escolhido entre os candidatos) e calibrado em
+    CALIBRATION_NS, para que haja previsão já no primeiro N. As demais
+    levam microssegundos por execução, tempos ruidosos demais para
+    escolher um modelo e extrapolar; elas nunca são puladas.
+    
+    Args:
+        key (str): Chave de ALGORITHMS
+        func: Implementação (já com passos/módulo fixados)
+        
+    Returns:
+        RuntimePredictor | None: Preditor, ou None se a implementação não
+            for exponencial
+    """
+    if key not in EXPONENTIAL_ALGORITHMS:
+        return None
+    predictor = RuntimePredictor(models=[EXPONENTIAL_MODEL])
+    predictor.calibrate(func, CALIBRATION_NS)
+    return predictor
+
+
+def run_comparison(test_values, skip_recursive=False, algorithms=None, steps=None, mod=None,
+                   instrument=False, time_limit=DEFAULT_TIME_LIMIT, sink=None,
+                   result_format=DEFAULT_RESULT_FORMAT):
     """
     Executa comparação entre os algoritmos.
     
     Args:
         test_values (list): Lista de valores de n para testar
         skip_recursive (bool): Se True, pula recursão pura para valores grandes
+        algorithms (list): Chaves de ALGORITHMS a executar (padrão: todas)
+        steps (tuple): Passos permitidos para STEP_ALGORITHMS (padrão: 1 e 2)
+        mod (int): Se informado, calcula f(n) mod mod em todas as implementações
+        instrument (bool): Se True, registra os contadores da recursão pura
+        time_limit (float): Pula execuções da força bruta com tempo previsto
+            acima deste limite em segundos (None: nunca pula)
+        sink (RecordSink): Se informado, cada registro é gravado nele ao
+            ser medido, e a planilha não guarda os registros em memória
+        result_format (str): Exibição dos resultados (ver resultformat.py)
     """
-    datasheet = DataSheet()
+    if algorithms is None:
+        algorithms = default_algorithms(steps, mod)
+    predictors = {}
+    
+    protocol = (f"{describe_protocol(PROTOCOL_SEPARATE, warmup=0, memory_executions=1)}; "
+                "a passagem de memória roda antes e serve de aquecimento")
+    datasheet = DataSheet(protocol=protocol,
+                          sink=sink, keep_records=sink is None, result_format=result_format)
     
     for n in test_values:
         print(f"\n{'='*80}")
@@ -87,35 +241,131 @@ def run_comparison(test_values, skip_recursive=False):
         print("\n" + ">>> IMPLEMENTAÇÕES PRINCIPAIS <<<".center(60))
         print("-"*60)
         
-        # 1. RECURSÃO PURA (FORÇA BRUTA) - Abordagem Recursiva
-        if not skip_recursive:
-            test_algorithm("1. Recursão Pura (FORÇA BRUTA)", climb_stairs_recursive, n, datasheet)
-        else:
-            print(f"\n1. Recursão Pura (FORÇA BRUTA): Pulada (skip_recursive=True)")
-        
-        # 2. PROGRAMAÇÃO DINÂMICA BOTTOM-UP
-        test_algorithm("2. Programação Dinâmica BOTTOM-UP", climb_stairs_dp, n, datasheet)
-        
-    # Implementações auxiliares removidas
+        for key in algorithms:
+            name, func = ALGORITHMS[key]
+            if steps is not None and key in STEP_ALGORITHMS:
+                func = partial(func, steps=steps)
+                name = f"{name} passos={list(steps)}"
+            if mod is not None:
+                func = partial(func, mod=mod)
+                name = f"{name} mod {mod}"
+            
+            # A força bruta pode ser pulada para valores grandes
+            if key in EXPONENTIAL_ALGORITHMS and skip_recursive:
+                print(f"\n{name}: Pulada (skip_recursive=True)")
+                continue
+            
+            # Previsão da força bruta pelo modelo O(φ^n) calibrado e ajustado
+            if time_limit is not None and key in EXPONENTIAL_ALGORITHMS:
+                if key not in predictors:
+                    predictors[key] = build_predictor(key, func)
+                predicted = predictors[key].predict(n)
+                if predicted is not None and predicted > time_limit:
+                    print(f"\n{name}: Pulada (previsão: {format_time(predicted)} pelo modelo "
+                          f"{predictors[key].best_fit().model}, limite {format_time(time_limit)})")
+                    continue
+            
+            if test_algorithm(name, func, n, datasheet, instrument) and key in predictors:
+                predictors[key].add(n, datasheet.last_record['execution_time'])
     
     # Exibir resultados
     datasheet.display()
     datasheet.display_summary()
     
+    if 'pisano' in algorithms:
+        info = pisano_cache.cache_info()
+        print(f"Cache de Pisano: {info['hits']} acertos, {info['misses']} faltas, "
+              f"{info['currsize']} módulo(s), {format_memory(info['bytes'])}")
+    
+    if sink is not None:
+        datasheet.close()
+        print(f"Registros gravados em: {sink.path}")
+        return
+    
     # Salvar em CSV
     save = input("\nDeseja salvar os resultados em CSV? (s/n): ").strip().lower()
     if save == 's':
-        filename = input("Nome do arquivo (Enter para nome padrão): ").strip()
+        filename = input("Nome do arquivo (.csv ou .npz; Enter para nome padrão): ").strip()
         if filename:
-            if not filename.endswith('.csv'):
+            if not filename.endswith(('.csv', '.npz')):
                 filename += '.csv'
             datasheet.save_to_csv(filename)
         else:
             datasheet.save_to_csv()
 
 
-def interactive_mode():
-    """Modo interativo para testar valores específicos."""
+def run_batch(test_values, mod=None, result_format=DEFAULT_RESULT_FORMAT):
+    """
+    Responde todas as consultas em lote e compara com uma chamada por N.
+    
+    Args:
+        test_values (list): Lista de valores de n (consultas)
+        mod (int): Se informado, calcula f(n) mod mod
+        result_format (str): Exibição dos resultados (ver resultformat.py)
+    """
+    print(f"\n{'='*80}")
+    print(f"MODO LOTE: {len(test_values)} consultas (max N = {max(test_values)})")
+    print(f"{'='*80}\n")
+    
+    def per_query(ns):
+        return [climb_stairs_dp(n, mod=mod) for n in ns]
+    
+    engines = [
+        ("Uma chamada por N (climb_stairs_dp)", per_query),
+        ("Lote: varredura única (climb_stairs_dp_many)",
+         lambda ns: climb_stairs_dp_many(ns, mod=mod)),
+        ("Lote: fast doubling compartilhado (climb_stairs_fast_many)",
+         lambda ns: climb_stairs_fast_many(ns, mod=mod)),
+    ]
+    
+    results = None
+    for name, func in engines:
+        values = warm_up(func, test_values)
+        _, exec_time = measure_time_without_gc(func, test_values)
+        print(f"{name}: {format_time(exec_time)}")
+        if results is None:
+            results = values
+        elif values != results:
+            print("  ERRO: resultados diferentes da chamada por N!")
+    
+    print()
+    for n, result in zip(test_values, results):
+        print(f"  f({n}) = {format_result(result, result_format)}")
+
+
+def run_stream(stop, filename, mod=None):
+    """
+    Grava a sequência f(1), ..., f(stop) em um arquivo, em blocos.
+    
+    Args:
+        stop (int): Último n da sequência
+        filename (str): Arquivo de saída ('-' para a saída padrão; a
+            contagem vai para stderr, sem misturar com os valores)
+        mod (int): Se informado, grava os valores módulo mod
+    """
+    if filename == '-':
+        count = write_stream(sys.stdout, 1, stop + 1, mod=mod)
+        sys.stdout.flush()
+        print(f"{count} valores gravados na saída padrão", file=sys.stderr)
+        return
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        count = write_stream(f, 1, stop + 1, mod=mod)
+    print(f"{count} valores gravados em: {filename}")
+
+
+def interactive_mode(algorithms=None, steps=None, mod=None, instrument=False,
+                     result_format=DEFAULT_RESULT_FORMAT):
+    """
+    Modo interativo para testar valores específicos.
+    
+    Args:
+        algorithms (list): Chaves de ALGORITHMS a executar (padrão: todas)
+        steps (tuple): Passos permitidos para STEP_ALGORITHMS
+        mod (int): Módulo do modo modular (None = aritmética exata)
+        instrument (bool): Se True, registra os contadores da recursão pura
+        result_format (str): Exibição dos resultados (ver resultformat.py)
+    """
     print_header()
     
     print("MODO INTERATIVO")
@@ -137,37 +387,121 @@ def interactive_mode():
             print("ERRO: Entrada inválida. Usando valores padrão.")
             test_values = [5, 10, 15, 20]
     
-    # Verificar se há valores grandes
+    # Verificar se há valores grandes: prevê o tempo da força bruta
     max_value = max(test_values)
     skip_recursive = False
     
-    if max_value > 35:
-        print(f"\nAVISO: Valor máximo = {max_value}")
-        print("A recursão pura será muito lenta para valores > 35")
-        skip = input("Deseja pular a recursão pura? (s/n): ").strip().lower()
-        skip_recursive = (skip == 's')
+    selected = algorithms or default_algorithms(steps, mod)
+    brute = [key for key in selected if key in EXPONENTIAL_ALGORITHMS]
+    
+    if brute:
+        func = ALGORITHMS[brute[0]][1]
+        if mod is not None:
+            func = partial(func, mod=mod)
+        predictor = build_predictor(brute[0], func)
+        predicted = predictor.predict(max_value)
+        if predicted is not None and predicted > DEFAULT_TIME_LIMIT:
+            print(f"\nAVISO: Valor máximo = {max_value}")
+            print(f"A recursão pura deve levar cerca de {format_time(predicted)} "
+                  f"(modelo {predictor.best_fit().model} ajustado em n = "
+                  f"{CALIBRATION_NS[0]}..{CALIBRATION_NS[-1]})")
+            skip = input("Deseja pular a recursão pura? (s/n): ").strip().lower()
+            skip_recursive = (skip == 's')
     
-    run_comparison(test_values, skip_recursive)
+    # Se o usuário optou por rodar, não pula pela previsão
+    run_comparison(test_values, skip_recursive, algorithms, steps, mod, instrument,
+                   time_limit=None, result_format=result_format)
+
+
+def parse_args(argv=None):
+    """
+    Interpreta os argumentos da linha de comando.
+    
+    Args:
+        argv (list): Argumentos (padrão: sys.argv[1:])
+        
+    Returns:
+        argparse.Namespace: Argumentos interpretados
+    """
+    parser = argparse.ArgumentParser(
+        description='Análise comparativa do Staircase Problem.',
+        epilog='Exemplo: python main.py 5 10 15 20 --algo dp --algo fast')
+    parser.add_argument('values', nargs='*', type=int,
+                        help='Valores de N (sem valores: modo interativo)')
+    parser.add_argument('--algo', action='append', choices=list(ALGORITHMS),
+                        help='Algoritmo a executar (pode repetir; padrão: todos)')
+    parser.add_argument('--steps', type=parse_steps,
+                        help='Passos permitidos, ex.: 1,3,5 ou 1-4 (algoritmos steps/kitamasa)')
+    parser.add_argument('--mod', type=parse_modulus,
+                        help='Calcula f(n) mod M, ex.: 1000000007, 1e9+7 ou 2^64')
+    parser.add_argument('--batch', action='store_true',
+                        help='Responde todos os N em lote (uma varredura) e compara com uma chamada por N')
+    parser.add_argument('--stream', metavar='ARQUIVO',
+                        help="Grava f(1), ..., f(max N) em blocos no arquivo ('-' = saída padrão)")
+    parser.add_argument('--instrument', action='store_true',
+                        help='Conta chamadas, repetições e profundidade da recursão pura')
+    parser.add_argument('--output', metavar='ARQUIVO',
+                        help='Grava cada registro ao ser medido, em CSV ou JSONL (pela extensão), '
+                             'em vez de perguntar no final')
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_FLUSH_EVERY,
+                        help=f'Registros por escrita com --output (padrão: {DEFAULT_FLUSH_EVERY})')
+    parser.add_argument('--fsync-interval', type=float, default=DEFAULT_FSYNC_INTERVAL,
+                        help=f'Segundos entre fsyncs com --output (padrão: {DEFAULT_FSYNC_INTERVAL:g}; '
+                             f'0 = a cada escrita)')
+    parser.add_argument('--result-format', choices=RESULT_FORMATS, default=DEFAULT_RESULT_FORMAT,
+                        help="Exibição dos resultados: 'auto' (resume acima de 60 dígitos), "
+                             "'completo' ou 'pontas' (só primeiros e últimos dígitos)")
+    parser.add_argument('--time-limit', type=float, default=DEFAULT_TIME_LIMIT,
+                        help=f'Pula testes cuja execução tem tempo previsto acima deste '
+                             f'limite em segundos (padrão: {DEFAULT_TIME_LIMIT:g}; 0 = nunca pula)')
+    args = parser.parse_args(argv)
+    
+    if args.steps is not None and args.steps != DEFAULT_STEPS and args.algo:
+        invalid = [key for key in args.algo if key not in STEP_ALGORITHMS]
+        if invalid:
+            parser.error(f"--steps só se aplica a {', '.join(STEP_ALGORITHMS)} "
+                         f"(recebido: {', '.join(invalid)})")
+    
+    modular_only = [key for key in (args.algo or []) if key in MODULAR_ALGORITHMS]
+    if modular_only and (args.mod is None or args.mod > MAX_MODULUS):
+        parser.error(f"{', '.join(modular_only)} exige --mod M com M <= {MAX_MODULUS}")
+    return args
 
 
 def main():
     """Função principal."""
+    args = parse_args()
+    
+    if args.stream is not None:
+        if not args.values:
+            print("ERRO: --stream exige ao menos um valor de N")
+            sys.exit(1)
+        run_stream(max(args.values), args.stream, mod=args.mod)
+        return
+    
     print_header()
     
-    if len(sys.argv) > 1:
+    if args.values:
         # Modo linha de comando
-        try:
-            test_values = [int(x) for x in sys.argv[1:]]
-            test_values.sort()
-            print(f"Testando com valores: {test_values}\n")
-            run_comparison(test_values)
-        except ValueError:
-            print("ERRO: Argumentos inválidos. Use números inteiros.")
-            print("Exemplo: python main.py 5 10 15 20")
-            sys.exit(1)
+        test_values = sorted(args.values)
+        print(f"Testando com valores: {test_values}\n")
+        if args.batch:
+            run_batch(args.values, mod=args.mod, result_format=args.result_format)
+        else:
+            sink = None
+            if args.output is not None:
+                sink = open_sink(args.output, flush_every=args.flush_every,
+                                 fsync_interval=args.fsync_interval)
+            try:
+                run_comparison(test_values, algorithms=args.algo, steps=args.steps, mod=args.mod,
+                               instrument=args.instrument, time_limit=args.time_limit or None,
+                               sink=sink, result_format=args.result_format)
+            finally:
+                if sink is not None:
+                    sink.close()
     else:
         # Modo interativo
-        interactive_mode()
+        interactive_mode(args.algo, args.steps, args.mod, args.instrument, args.result_format)
     
     print("\n" + "="*80)
     print(" "*25 + "ANÁLISE CONCLUÍDA")
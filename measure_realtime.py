@@ -7,12 +7,15 @@ sem estatísticas (mediana/média) – apenas o tempo direto de uma rodada.
 Uso:
     python measure_realtime.py --algo brute -n 30
     python measure_realtime.py --algo dp -n 900
+    python measure_realtime.py --algo fast -n 1000000
+    python measure_realtime.py --algo dp -n 1000000 --mod 1e9+7
     python measure_realtime.py --algo dp --from-inputs   # usa inputs.txt
 
 Opções:
   --repeat R            Executa R vezes e mostra o tempo de cada uma e média simples
   --from-inputs         Lê N do arquivo inputs.txt (uma execução por N)
   --no-digits           Não calcula/mostra número de dígitos do resultado
+  --mod M               Calcula f(n) mod M (ex.: 1000000007, 1e9+7, 2^64)
 
 Observações:
     - Força Bruta tem limite de segurança N <= 35 (evita travar a máquina)
@@ -20,10 +23,12 @@ Observações:
 
 import argparse
 import time
+from functools import partial
 from typing import Callable, List
 
-from dpclimb import climb_stairs_dp
-from recursiveclimb import climb_stairs_recursive
+from dpclimb import climb_stairs_dp, climb_stairs_fast, parse_modulus
+from recursiveclimb import climb_stairs_recursive, climb_stairs_iterative_stack
+from resultformat import decimal_digits
 
 DEFAULT_INPUTS_FILE = 'inputs.txt'
 
@@ -65,22 +70,19 @@ def measure_once(func: Callable[[int], int], n: int, show_digits: bool = True) -
     end = time.perf_counter()
     elapsed = end - start
     if show_digits:
-        # Evitar custo de conversão muito grande quando n é pequeno está ok; para n grandes, custo é aceitável fora da medição
-        try:
-            digits = len(str(result))
-            print(f"  • Resultado tem {digits} dígitos")
-        except Exception:
-            pass
+        # Contagem por bit_length: sem a conversão decimal, quadrática para n grandes
+        print(f"  • Resultado tem {decimal_digits(result)} dígitos")
     return elapsed
 
 
 def main():
-    parser = argparse.ArgumentParser(description='Medir tempo real (uma rodada) de um algoritmo (brute, dp).')
-    parser.add_argument('--algo', choices=['brute', 'dp'], required=True, help='Algoritmo: brute (força bruta), dp (bottom-up com tabela)')
+    parser = argparse.ArgumentParser(description='Medir tempo real (uma rodada) de um algoritmo (brute, stack, dp, fast).')
+    parser.add_argument('--algo', choices=['brute', 'stack', 'dp', 'fast'], required=True, help='Algoritmo: brute (força bruta), stack (força bruta com pilha explícita), dp (bottom-up com tabela), fast (fast doubling)')
     parser.add_argument('-n', type=int, help='Tamanho N da escada')
     parser.add_argument('--from-inputs', action='store_true', help='Ler Ns de inputs.txt e medir uma vez cada')
     parser.add_argument('--repeat', type=int, default=1, help='Repetições por medição (default: 1)')
     parser.add_argument('--no-digits', action='store_true', help='Não calcular/mostrar número de dígitos do resultado')
+    parser.add_argument('--mod', type=parse_modulus, help='Calcular f(n) mod M (ex.: 1e9+7, 2^64)')
     args = parser.parse_args()
 
     # Selecionar função
@@ -88,10 +90,22 @@ def main():
         func = climb_stairs_recursive
         algo_name = 'Recursão Pura (FORÇA BRUTA)'
         max_n = None
+    elif args.algo == 'stack':
+        func = climb_stairs_iterative_stack
+        algo_name = 'Força Bruta (pilha explícita)'
+        max_n = None
     elif args.algo == 'dp':
         func = climb_stairs_dp
         algo_name = 'Programação Dinâmica BOTTOM-UP'
         max_n = None
+    elif args.algo == 'fast':
+        func = climb_stairs_fast
+        algo_name = 'Fast Doubling O(log n)'
+        max_n = None
+
+    if args.mod is not None:
+        func = partial(func, mod=args.mod)
+        algo_name = f'{algo_name} mod {args.mod}'
 
     # Determinar lista de Ns
     ns: List[int] = []
@@ -0,0 +1,248 @@
+"""
+Módulo com o protocolo de medição de tempo e memória.
+
+O tracemalloc intercepta cada alocação e deixa o código medido mais lento,
+então medir o tempo com ele ativo infla os tempos. Por isso há dois
+protocolos, e o nome do protocolo usado acompanha cada resultado:
+
+- 'separado' (padrão): execuções de aquecimento descartadas; passagens de
+  tempo com o coletor de lixo (gc) desligado e sem tracemalloc; passagens
+  de memória próprias, com tracemalloc
+- 'combinado': tempo e memória na mesma execução, com tracemalloc ativo
+  (protocolo original, mantido para comparar com resultados antigos)
+
+Resultados de protocolos diferentes não devem ser comparados entre si.
+
+AMOSTRAGEM ADAPTATIVA: em vez de um número fixo de execuções, a amostragem
+continua até o intervalo de confiança da mediana ficar estreito o bastante
+ou o orçamento de tempo acabar (ver median_confidence_interval).
+
+As amostras não precisam ficar guardadas: o IC também pode ser lido de um
+esboço de quantis (sketch.TDigest, ver digest_confidence_interval).
+"""
+
+import gc
+import math
+import time
+from statistics import NormalDist, median
+
+from memoryconsumer import measure_memory
+
+
+PROTOCOL_SEPARATE = 'separado'
+PROTOCOL_COMBINED = 'combinado'
+
+# Protocolos disponíveis: nome -> descrição
+PROTOCOLS = {
+    PROTOCOL_SEPARATE: 'aquecimento + tempo com gc desligado e sem tracemalloc + memória à parte',
+    PROTOCOL_COMBINED: 'tempo e memória na mesma execução, com tracemalloc ativo',
+}
+DEFAULT_PROTOCOL = PROTOCOL_SEPARATE
+
+# Execuções de aquecimento e passagens de memória do protocolo 'separado'
+DEFAULT_WARMUP = 1
+DEFAULT_MEMORY_EXECUTIONS = 3
+
+# Amostragem adaptativa: nível de confiança, largura relativa alvo do IC
+# da mediana, orçamento de tempo por teste (s) e limites de execuções
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_TARGET_CI = 0.05
+DEFAULT_TIME_BUDGET = 10.0
+DEFAULT_MIN_EXECUTIONS = 5
+DEFAULT_MAX_EXECUTIONS = 10000
+
+
+def check_protocol(protocol):
+    """
+    Valida o nome de um protocolo de medição.
+
+    Args:
+        protocol (str): Nome do protocolo
+
+    Raises:
+        ValueError: Se o protocolo não existir
+    """
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"protocolo desconhecido: {protocol!r} "
+                         f"(opções: {', '.join(PROTOCOLS)})")
+
+
+def describe_protocol(protocol, warmup=DEFAULT_WARMUP, memory_executions=DEFAULT_MEMORY_EXECUTIONS):
+    """
+    Descreve um protocolo com seus parâmetros, para registro nas saídas.
+
+    Args:
+        protocol (str): Nome do protocolo
+        warmup (int): Execuções de aquecimento
+        memory_executions (int): Passagens de memória
+
+    Returns:
+        str: Descrição legível do protocolo
+    """
+    check_protocol(protocol)
+    if protocol == PROTOCOL_COMBINED:
+        return f"{protocol} ({PROTOCOLS[protocol]})"
+    return (f"{protocol} ({warmup} aquecimento(s), tempo com gc desligado e sem tracemalloc, "
+            f"{memory_executions} passagem(ns) de memória à parte)")
+
+
+def warm_up(func, *args, runs=DEFAULT_WARMUP, **kwargs):
+    """
+    Executa a função sem medir, para aquecer caches e o interpretador.
+
+    Args:
+        func: Função a ser executada
+        *args: Argumentos posicionais para a função
+        runs (int): Número de execuções
+        **kwargs: Argumentos nomeados para a função
+
+    Returns:
+        Resultado da última execução (None se runs == 0)
+    """
+    result = None
+    for _ in range(runs):
+        result = func(*args, **kwargs)
+    return result
+
+
+def measure_time_without_gc(func, *args, **kwargs):
+    """
+    Mede o tempo de uma execução com o coletor de lixo desligado.
+
+    O estado anterior do gc é restaurado ao final, mesmo em caso de erro.
+
+    Args:
+        func: Função a ser executada
+        *args: Argumentos posicionais para a função
+        **kwargs: Argumentos nomeados para a função
+
+    Returns:
+        tuple: (resultado, tempo_em_segundos)
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        end_time = time.perf_counter()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return result, end_time - start_time
+
+
+def measure_separately(func, n, warmup=DEFAULT_WARMUP):
+    """
+    Mede uma execução de tempo e uma de memória no protocolo 'separado'.
+
+    Args:
+        func: Função a ser executada
+        n (int): Parâmetro para a função
+        warmup (int): Execuções de aquecimento antes das medições
+
+    Returns:
+        tuple: (resultado, tempo_em_segundos, memoria_em_bytes)
+    """
+    warm_up(func, n, runs=warmup)
+    result, exec_time = measure_time_without_gc(func, n)
+    _, memory = measure_memory(func, n)
+    return result, exec_time, memory
+
+
+def median_ci_ranks(count, confidence=DEFAULT_CONFIDENCE):
+    """
+    Posições (0-based) na amostra ordenada dos limites do IC da mediana.
+
+    Args:
+        count (int): Tamanho da amostra (ao menos 1)
+        confidence (float): Nível de confiança, entre 0 e 1
+
+    Returns:
+        tuple: (posição_inferior, posição_superior)
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * math.sqrt(count) / 2
+    # Posições 1-based j e k convertidas para índices 0-based
+    low = max(0, math.floor(count / 2 - half_width) - 1)
+    high = min(count - 1, math.ceil(count / 2 + half_width))
+    return low, high
+
+
+def median_confidence_interval(samples, confidence=DEFAULT_CONFIDENCE):
+    """
+    Intervalo de confiança da mediana por estatísticas de ordem.
+
+    Não supõe nenhuma distribuição para os tempos: usa a aproximação normal
+    da binomial(n, 1/2) para escolher as posições j e k da amostra ordenada
+    (j = n/2 - z·√n/2, k = 1 + n/2 + z·√n/2). Com poucas amostras o
+    intervalo se reduz a [mínimo, máximo].
+
+    Args:
+        samples (list): Amostras (ao menos uma)
+        confidence (float): Nível de confiança, entre 0 e 1
+
+    Returns:
+        tuple: (limite_inferior, limite_superior)
+    """
+    if not samples:
+        raise ValueError("é preciso ao menos uma amostra")
+    data = sorted(samples)
+    low, high = median_ci_ranks(len(data), confidence)
+    return data[low], data[high]
+
+
+def relative_ci_width(samples, confidence=DEFAULT_CONFIDENCE):
+    """
+    Largura do intervalo de confiança da mediana relativa à mediana.
+
+    Args:
+        samples (list): Amostras (ao menos uma)
+        confidence (float): Nível de confiança
+
+    Returns:
+        float: (superior - inferior) / mediana (inf se a mediana for 0)
+    """
+    low, high = median_confidence_interval(samples, confidence)
+    return _relative_width(low, high, median(samples))
+
+
+def _relative_width(low, high, center):
+    """(superior - inferior) / centro, com 0 e inf para centro nulo."""
+    if center == 0:
+        return 0.0 if high == low else math.inf
+    return (high - low) / center
+
+
+def digest_confidence_interval(digest, confidence=DEFAULT_CONFIDENCE):
+    """
+    Intervalo de confiança da mediana a partir de um t-digest.
+
+    Usa as mesmas posições de median_confidence_interval, lidas como
+    quantis do esboço; enquanto o esboço não funde amostras (poucas
+    centenas), o resultado é idêntico ao calculado com a amostra inteira.
+
+    Args:
+        digest (sketch.TDigest): Esboço das amostras (não vazio)
+        confidence (float): Nível de confiança
+
+    Returns:
+        tuple: (limite_inferior, limite_superior)
+    """
+    count = digest.count
+    low, high = median_ci_ranks(count, confidence)
+    return digest.quantile((low + 0.5) / count), digest.quantile((high + 0.5) / count)
+
+
+def digest_relative_ci_width(digest, confidence=DEFAULT_CONFIDENCE):
+    """
+    Largura relativa do IC da mediana a partir de um t-digest.
+
+    Args:
+        digest (sketch.TDigest): Esboço das amostras (não vazio)
+        confidence (float): Nível de confiança
+
+    Returns:
+        float: (superior - inferior) / mediana (inf se a mediana for 0)
+    """
+    low, high = digest_confidence_interval(digest, confidence)
+    return _relative_width(low, high, digest.quantile(0.5))
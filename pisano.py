@@ -0,0 +1,170 @@
+"""
+Cache de períodos de Pisano para consultas modulares do Staircase Problem.
+
+A sequência f(n) = F(n+1) calculada por climb_stairs_dp é periódica
+módulo m (período de Pisano π(m) <= 6m). Encontrando o período uma vez
+por módulo e guardando os resíduos em um array compacto, qualquer consulta
+f(n) mod m, inclusive n = 10^18, vira uma única consulta a índice.
+
+ABORDAGEM:
+- Percorre F(i) mod m até o par (F(i), F(i+1)) voltar a (0, 1)
+- Guarda F(0..π(m)-1) mod m em um array.array com o menor tipo que comporte m
+- Mantém vários módulos em um cache LRU com contadores de acertos/faltas
+
+Adequado para módulos pequenos (<= MAX_MODULUS); para módulos grandes use
+climb_stairs_fast(n, mod=m).
+"""
+
+from array import array
+from collections import OrderedDict
+
+from dpclimb import check_modulus
+
+
+# Maior módulo aceito: o período pode chegar a 6m resíduos
+MAX_MODULUS = 10**6
+
+
+def _typecode_for(mod):
+    """Retorna o menor typecode de array.array capaz de guardar 0..mod-1."""
+    for typecode in ('B', 'H', 'I', 'L', 'Q'):
+        if mod - 1 < 2 ** (8 * array(typecode).itemsize):
+            return typecode
+    raise ValueError(f"módulo grande demais para array.array: {mod}")
+
+
+def compute_pisano_residues(mod):
+    """
+    Calcula um período completo de F(i) mod m.
+
+    Args:
+        mod (int): Módulo (>= 1)
+
+    Returns:
+        array.array: Resíduos F(0), F(1), ..., F(π(m) - 1) módulo m
+
+    Complexidade:
+        Tempo: O(π(m)) = O(m)
+        Espaço: O(π(m)) elementos de tamanho fixo
+    """
+    check_modulus(mod)
+    residues = array(_typecode_for(mod))
+    start = (0, 1 % mod)
+    a, b = start
+    while True:
+        residues.append(a)
+        a, b = b, (a + b) % mod
+        if (a, b) == start:
+            return residues
+
+
+class PisanoCache:
+    """Cache LRU de períodos de Pisano, indexado pelo módulo."""
+
+    def __init__(self, maxsize=8, max_modulus=MAX_MODULUS):
+        """
+        Inicializa o cache.
+
+        Args:
+            maxsize (int): Número máximo de módulos guardados
+            max_modulus (int): Maior módulo aceito
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize deve ser >= 1")
+        self.maxsize = maxsize
+        self.max_modulus = max_modulus
+        self.hits = 0
+        self.misses = 0
+        self._periods = OrderedDict()
+
+    def residues(self, mod):
+        """
+        Retorna os resíduos de um período, calculando-os se necessário.
+
+        Args:
+            mod (int): Módulo (1 <= mod <= max_modulus)
+
+        Returns:
+            array.array: Resíduos F(0..π(m)-1) módulo m
+        """
+        check_modulus(mod)
+        if mod > self.max_modulus:
+            raise ValueError(f"módulo {mod} acima do limite do cache ({self.max_modulus}); "
+                             f"use climb_stairs_fast(n, mod=m)")
+
+        residues = self._periods.get(mod)
+        if residues is not None:
+            self.hits += 1
+            self._periods.move_to_end(mod)
+            return residues
+
+        self.misses += 1
+        residues = compute_pisano_residues(mod)
+        self._periods[mod] = residues
+        if len(self._periods) > self.maxsize:
+            self._periods.popitem(last=False)  # remove o menos usado recentemente
+        return residues
+
+    def period(self, mod):
+        """Retorna o período de Pisano π(m)."""
+        return len(self.residues(mod))
+
+    def query(self, n, mod):
+        """
+        Retorna f(n) mod m com uma única consulta ao período.
+
+        Args:
+            n (int): Número de degraus da escada (qualquer tamanho)
+            mod (int): Módulo
+
+        Returns:
+            int: f(n) mod m
+        """
+        residues = self.residues(mod)
+        if n <= 0:
+            return 0
+        # f(n) = F(n+1)
+        return residues[(n + 1) % len(residues)]
+
+    def cache_info(self):
+        """
+        Retorna as estatísticas do cache.
+
+        Returns:
+            dict: hits, misses, maxsize, currsize e bytes ocupados pelos resíduos
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'maxsize': self.maxsize,
+            'currsize': len(self._periods),
+            'bytes': sum(r.itemsize * len(r) for r in self._periods.values()),
+        }
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores."""
+        self._periods.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Cache compartilhado pelas consultas de climb_stairs_pisano
+default_cache = PisanoCache()
+
+
+def climb_stairs_pisano(n, mod):
+    """
+    Resolve o problema da escada módulo m usando o período de Pisano.
+
+    Args:
+        n (int): Número de degraus da escada
+        mod (int): Módulo (1 <= mod <= MAX_MODULUS)
+
+    Returns:
+        int: f(n) mod m
+
+    Complexidade:
+        Tempo: O(1) com o período em cache; O(m) na primeira consulta
+        Espaço: O(π(m)) por módulo em cache
+    """
+    return default_cache.query(n, mod)
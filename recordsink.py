@@ -0,0 +1,200 @@
+"""
+Gravação incremental dos registros de uma DataSheet (CSV ou JSONL).
+
+DataSheet.save_to_csv grava tudo de uma vez no final; se o processo cair
+antes, nada é salvo, e a planilha inteira fica em memória até lá. Um
+coletor (sink) ligado à DataSheet grava cada registro assim que ele chega:
+
+- os registros são acumulados em lotes de flush_every e escritos no
+  arquivo (aberto em modo de acréscimo) a cada lote
+- os.fsync é chamado no máximo a cada fsync_interval segundos (0: a cada
+  lote), equilibrando segurança contra quedas e custo de E/S
+- a memória do coletor é limitada pelo tamanho do lote
+
+Após uma queda, o arquivo contém todos os lotes já escritos; no pior caso
+a última linha fica truncada. Ao reabrir o arquivo, essa linha incompleta
+é descartada (truncate_partial_line), para que o primeiro registro novo
+não seja colado a ela.
+
+    with open_sink('resultados.jsonl') as sink:
+        sheet = DataSheet(sink=sink, keep_records=False)
+        ...
+"""
+
+import abc
+import csv
+import io
+import json
+import os
+import time
+
+from resultformat import to_decimal
+
+
+# Registros por lote escrito e intervalo máximo entre fsyncs (segundos)
+DEFAULT_FLUSH_EVERY = 1
+DEFAULT_FSYNC_INTERVAL = 1.0
+
+# Colunas gravadas, na ordem de DataSheet.save_to_csv
+FIELDNAMES = ['algorithm', 'n', 'result', 'execution_time', 'memory_usage',
+              'calls', 'max_depth', 'repeated_calls', 'protocol']
+
+
+def truncate_partial_line(path, chunk_size=4096):
+    """
+    Remove a última linha do arquivo se ela não terminar em quebra de linha.
+
+    Uma queda no meio de uma escrita deixa uma linha incompleta no fim do
+    arquivo; acrescentar depois dela colaria o registro novo ao fragmento,
+    corrompendo os dois.
+
+    Args:
+        path (str): Arquivo (inexistente: nada a fazer)
+        chunk_size (int): Bytes lidos por vez, do fim para o começo
+
+    Returns:
+        int: Bytes removidos
+    """
+    try:
+        f = open(path, 'r+b')
+    except FileNotFoundError:
+        return 0
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            chunk = f.read(end - start)
+            if end == size and chunk.endswith(b'\n'):
+                return 0
+            newline = chunk.rfind(b'\n')
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        f.truncate(end)
+        return size - end
+
+
+class RecordSink(abc.ABC):
+    """Base dos coletores: lotes em memória, escrita em acréscimo e fsync periódico."""
+
+    def __init__(self, path, flush_every=DEFAULT_FLUSH_EVERY,
+                 fsync_interval=DEFAULT_FSYNC_INTERVAL):
+        """
+        Abre o arquivo em modo de acréscimo, descartando antes uma linha
+        incompleta deixada por uma queda.
+
+        Args:
+            path (str): Arquivo de saída
+            flush_every (int): Registros acumulados antes de cada escrita
+            fsync_interval (float): Intervalo mínimo entre fsyncs, em
+                segundos (0: fsync a cada escrita)
+        """
+        if flush_every < 1:
+            raise ValueError("flush_every deve ser >= 1")
+        self.path = path
+        self.flush_every = flush_every
+        self.fsync_interval = fsync_interval
+        self.count = 0
+        self._pending = []
+        truncate_partial_line(path)
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._last_sync = time.monotonic()
+        if self._file.tell() == 0:
+            self._write_header()
+            self._file.flush()
+
+    def _write_header(self):
+        """Escreve o cabeçalho de um arquivo novo (nada, por padrão)."""
+
+    @abc.abstractmethod
+    def _serialize(self, record):
+        """Converte um registro em texto (uma linha, com quebra)."""
+
+    def write(self, record):
+        """
+        Acrescenta um registro.
+
+        Args:
+            record (dict): Registro com as chaves de FIELDNAMES
+        """
+        self._pending.append(self._serialize(record))
+        self.count += 1
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self, sync=False):
+        """
+        Escreve o lote pendente e, se já passou o intervalo, faz fsync.
+
+        Args:
+            sync (bool): Se True, faz fsync independentemente do intervalo
+        """
+        if self._pending:
+            self._file.write(''.join(self._pending))
+            self._pending = []
+        self._file.flush()
+        now = time.monotonic()
+        if sync or now - self._last_sync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+
+    def close(self):
+        """Grava o que falta, com fsync, e fecha o arquivo."""
+        if self._file.closed:
+            return
+        self.flush(sync=True)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class CSVSink(RecordSink):
+    """Coletor em CSV, com as colunas de FIELDNAMES (contadores vazios se ausentes)."""
+
+    def _write_header(self):
+        self._file.write(','.join(FIELDNAMES) + '\r\n')
+
+    def _serialize(self, record):
+        line = io.StringIO()
+        csv.writer(line).writerow(['' if record.get(field) is None else
+                                   to_decimal(record[field]) if field == 'result' else record[field]
+                                   for field in FIELDNAMES])
+        return line.getvalue()
+
+
+class JSONLSink(RecordSink):
+    """Coletor em JSON Lines: um objeto JSON por linha."""
+
+    def _serialize(self, record):
+        # O resultado vira um número JSON via to_decimal: json.dumps usaria
+        # str(), recusada acima de 4300 dígitos
+        result = record.get('result')
+        fields = {field: record.get(field) for field in FIELDNAMES}
+        fields['result'] = None
+        text = json.dumps(fields, ensure_ascii=False)
+        if isinstance(result, int):
+            text = text.replace('"result": null', f'"result": {to_decimal(result)}', 1)
+        return text + '\n'
+
+
+def open_sink(path, **options):
+    """
+    Abre o coletor adequado à extensão do arquivo.
+
+    Args:
+        path (str): Arquivo de saída (.jsonl ou .ndjson: JSONL; outros: CSV)
+        **options: flush_every e fsync_interval
+
+    Returns:
+        RecordSink: Coletor aberto
+    """
+    if path.lower().endswith(('.jsonl', '.ndjson')):
+        return JSONLSink(path, **options)
+    return CSVSink(path, **options)
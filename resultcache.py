@@ -0,0 +1,262 @@
+"""
+Cache de resultados do benchmark, indexado pelo código medido.
+
+Um benchmark completo mede todas as implementações, mesmo quando só uma
+mudou. Este módulo guarda as estatísticas de cada par (algoritmo, N) em um
+arquivo JSON (benchmark_cache.json) sob uma chave que combina:
+
+- a impressão digital do código: bytecode e fonte da função medida e,
+  transitivamente, dos nomes globais que ela usa (funções Python, classes
+  com seus métodos e constantes simples), além dos argumentos fixados por
+  functools.partial
+- o N de entrada
+- as opções de medição (protocolo, execuções, aquecimento, ...)
+- a versão do interpretador e a impressão digital da máquina
+
+Se a chave confere, o resultado guardado é reaproveitado sem executar;
+qualquer mudança no código, nas opções ou no ambiente gera outra chave.
+Com --force o benchmark mede tudo de novo e sobrescreve o cache.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import platform
+import sys
+import types
+from datetime import datetime
+
+from history import machine_fingerprint
+
+
+DEFAULT_CACHE = 'benchmark_cache.json'
+
+# Versão do formato das chaves e das estatísticas: incrementar invalida caches antigos
+CACHE_VERSION = 3
+
+
+def _code_material(code):
+    """
+    Partes de um code object que determinam seu comportamento.
+
+    Inclui recursivamente os code objects aninhados (funções internas,
+    lambdas, compreensões).
+    """
+    parts = [code.co_code, repr(code.co_names).encode(), repr(code.co_varnames).encode()]
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            parts.extend(_code_material(const))
+        else:
+            parts.append(repr(const).encode())
+    return parts
+
+
+def _constant_material(value):
+    """
+    Representação estável de uma constante global simples.
+
+    Returns:
+        bytes | None: Material para o hash, ou None se o valor não for
+            None, bool, int, float, str, bytes ou tupla desses tipos
+    """
+    if value is None or isinstance(value, (bool, float, str, bytes)):
+        return repr(value).encode()
+    if isinstance(value, int):
+        return hex(value).encode()  # repr recusa inteiros com mais de 4300 dígitos
+    if isinstance(value, tuple):
+        parts = [_constant_material(item) for item in value]
+        if None not in parts:
+            return b'(' + b','.join(parts) + b')'
+    return None
+
+
+def _global_dependencies(func):
+    """
+    Dependências de func referenciadas por nome global em seu código.
+
+    Returns:
+        tuple: (funções Python e classes, lista de (nome, material) das
+            constantes simples)
+    """
+    names = set()
+    stack = [func.__code__]
+    while stack:
+        code = stack.pop()
+        names.update(code.co_names)
+        stack.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+
+    dependencies = []
+    constants = []
+    for name in sorted(names):
+        if name not in func.__globals__:
+            continue
+        value = func.__globals__[name]
+        if isinstance(value, (types.FunctionType, type)):
+            dependencies.append(value)
+        else:
+            material = _constant_material(value)
+            if material is not None:
+                constants.append((name, material))
+    return dependencies, constants
+
+
+def _class_members(cls):
+    """
+    Conteúdo de uma classe que determina seu comportamento.
+
+    Returns:
+        tuple: (métodos como funções Python e classes aninhadas, lista de
+            (nome, material) dos atributos constantes simples)
+    """
+    members = []
+    constants = []
+    for name, value in sorted(vars(cls).items()):
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        if isinstance(value, property):
+            members.extend(f for f in (value.fget, value.fset, value.fdel)
+                           if isinstance(f, types.FunctionType))
+        elif isinstance(value, (types.FunctionType, type)):
+            members.append(value)
+        elif not name.startswith('__'):
+            material = _constant_material(value)
+            if material is not None:
+                constants.append((name, material))
+    members.extend(base for base in cls.__bases__ if base is not object)
+    return members, constants
+
+
+def code_fingerprint(func):
+    """
+    Impressão digital do código de uma implementação.
+
+    Cobre o bytecode e o fonte da função e, transitivamente, de tudo o que
+    ela referencia por nome global: funções (ex.: climb_stairs_fast ->
+    _fib_pair), classes, com cada método e classe base (ex.:
+    climb_stairs_checkpointed -> CheckpointedDPTable.__getitem__), e
+    constantes simples (int, str, tupla...). Um functools.partial
+    contribui também com os argumentos fixados.
+
+    Args:
+        func: Função ou functools.partial de uma função
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    digest = hashlib.sha256()
+    if isinstance(func, functools.partial):
+        digest.update(repr((func.args, sorted(func.keywords.items()))).encode())
+        func = func.func
+
+    seen = set()
+    pending = [func]
+    while pending:
+        current = pending.pop()
+        name = f"{current.__module__}.{current.__qualname__}"
+        if name in seen:
+            continue
+        seen.add(name)
+        digest.update(name.encode())
+        if isinstance(current, type):
+            dependencies, constants = _class_members(current)
+        else:
+            for part in _code_material(current.__code__):
+                digest.update(part)
+            digest.update(repr(current.__defaults__).encode())
+            dependencies, constants = _global_dependencies(current)
+        for constant_name, material in constants:
+            digest.update(f"{name}:{constant_name}=".encode())
+            digest.update(material)
+        try:
+            digest.update(inspect.getsource(current).encode())
+        except (OSError, TypeError):
+            pass
+        pending.extend(dependencies)
+    return digest.hexdigest()
+
+
+def interpreter_version():
+    """Implementação e versão completa do interpretador (ex.: 'CPython 3.11.7')."""
+    return f"{platform.python_implementation()} {sys.version.split()[0]}"
+
+
+def cache_key(func, n, options):
+    """
+    Chave de cache de uma medição.
+
+    Args:
+        func: Implementação medida
+        n (int): Tamanho da entrada
+        options (dict): Opções de medição (protocolo, execuções etc.),
+            serializáveis em JSON
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    material = {
+        'version': CACHE_VERSION,
+        'code': code_fingerprint(func),
+        'n': n,
+        'options': options,
+        'python': interpreter_version(),
+        'machine': machine_fingerprint(),
+    }
+    raw = json.dumps(material, sort_keys=True, default=repr)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Estatísticas de benchmark persistidas em um arquivo JSON, por chave."""
+
+    def __init__(self, path=DEFAULT_CACHE):
+        """
+        Carrega o cache (vazio se o arquivo não existir ou estiver corrompido).
+
+        Args:
+            path (str): Arquivo JSON do cache
+        """
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            print(f"⚠ Cache ilegível ({path}); começando vazio")
+
+    def get(self, key):
+        """
+        Retorna as estatísticas guardadas sob a chave.
+
+        Returns:
+            dict | None: Cópia das estatísticas, ou None se não houver
+        """
+        entry = self.entries.get(key)
+        return dict(entry['stats']) if entry else None
+
+    def put(self, key, stats, algorithm=None, n=None):
+        """
+        Guarda estatísticas e grava o arquivo imediatamente.
+
+        A gravação passa por um arquivo temporário substituído de uma vez,
+        para que uma interrupção não deixe o cache pela metade.
+
+        Args:
+            key (str): Chave de cache_key
+            stats (dict): Estatísticas de run_benchmark
+            algorithm (str): Nome do algoritmo (só informativo)
+            n (int): Tamanho da entrada (só informativo)
+        """
+        self.entries[key] = {'algorithm': algorithm, 'n': n,
+                             'created_at': datetime.now().isoformat(timespec='seconds'),
+                             'stats': stats}
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1)
+        os.replace(temporary, self.path)
+
+    def __len__(self):
+        return len(self.entries)
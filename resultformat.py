@@ -0,0 +1,189 @@
+"""
+Exibição dos resultados f(n), sem a conversão decimal quadrática.
+
+f(n) tem ~0,209·n dígitos. A conversão int -> str do CPython é quadrática
+no número de dígitos: para n na casa das centenas de milhares ela custa
+mais do que calcular f(n), e a partir de 4300 dígitos
+(sys.get_int_max_str_digits) ela é recusada com ValueError. Este módulo
+oferece:
+
+- decimal_digits: contagem de dígitos por bit_length e uma estimativa
+  logarítmica, sem converter o número (a potência de 10 só é calculada
+  quando a estimativa cai perto de uma fronteira)
+- to_decimal: conversão completa por divisão e conquista, com as metades
+  combinadas no módulo decimal (multiplicação subquadrática da libmpdec),
+  que não está sujeita ao limite de dígitos
+- format_result: texto para relatórios; resultados longos aparecem só com
+  os primeiros e os últimos dígitos e a contagem
+
+Modos de format_result:
+
+- 'auto' (padrão): completo até AUTO_MAX_DIGITS dígitos, senão resumido
+- 'completo': sempre todos os dígitos (via to_decimal)
+- 'pontas': sempre resumido quando houver mais de 2·edge_digits dígitos
+"""
+
+import decimal
+import math
+
+
+FORMAT_AUTO = 'auto'
+FORMAT_FULL = 'completo'
+FORMAT_EDGES = 'pontas'
+RESULT_FORMATS = (FORMAT_AUTO, FORMAT_FULL, FORMAT_EDGES)
+DEFAULT_RESULT_FORMAT = FORMAT_AUTO
+
+# Dígitos exibidos em cada ponta no modo resumido
+DEFAULT_EDGE_DIGITS = 20
+
+# Maior resultado exibido por completo no modo 'auto'
+AUTO_MAX_DIGITS = 60
+
+# Abaixo deste tamanho str() é rápida e está bem longe do limite de 4300 dígitos
+SMALL_BITS = 8192
+
+# log10(2): dígitos decimais por bit
+LOG10_2 = math.log10(2)
+
+
+def decimal_digits(value):
+    """
+    Número de dígitos decimais de um inteiro, sem convertê-lo para texto.
+
+    log10(value) é estimado pelos 53 bits mais altos e pelo deslocamento;
+    só quando a estimativa fica perto de um inteiro (value perto de uma
+    potência de 10) a fronteira é confirmada com uma comparação exata.
+
+    Args:
+        value (int): Inteiro (o sinal é ignorado)
+
+    Returns:
+        int: Quantidade de dígitos (1 para zero)
+
+    Complexidade:
+        Tempo: O(1) fora das fronteiras, contra O(d²) de len(str(value))
+    """
+    value = abs(value)
+    if value < 10:
+        return 1
+    shift = max(value.bit_length() - 53, 0)
+    estimate = math.log10(value >> shift) + shift * LOG10_2
+    nearest = round(estimate)
+    if abs(estimate - nearest) > 1e-10 * estimate + 1e-10:
+        return math.floor(estimate) + 1
+    # Perto de 10**nearest: a estimativa não decide o lado da fronteira
+    return nearest + 1 if value >= 10 ** nearest else nearest
+
+
+def to_decimal(value):
+    """
+    Representação decimal completa de um inteiro.
+
+    Números pequenos usam str(). Os grandes são divididos em metades de
+    bits (alta · 2**k + baixa), convertidas recursivamente para Decimal e
+    recombinadas com aritmética decimal exata; as potências de 2 são
+    reaproveitadas entre as chamadas.
+
+    Args:
+        value (int): Inteiro
+
+    Returns:
+        str: Todos os dígitos (com '-' se negativo)
+
+    Complexidade:
+        Tempo: O(M(d) log d), com M a multiplicação da libmpdec
+    """
+    if value < 0:
+        return '-' + to_decimal(-value)
+    if value.bit_length() <= SMALL_BITS:
+        return str(value)
+
+    with decimal.localcontext() as context:
+        context.prec = decimal.MAX_PREC
+        context.Emax = decimal.MAX_EMAX
+        context.Emin = decimal.MIN_EMIN
+        context.traps[decimal.Inexact] = True
+        powers = {}
+
+        def power_of_two(k):
+            if k not in powers:
+                if k <= SMALL_BITS:
+                    powers[k] = decimal.Decimal(1 << k)
+                else:
+                    half = power_of_two(k >> 1)
+                    powers[k] = half * half * 2 if k & 1 else half * half
+            return powers[k]
+
+        def convert(v, bits):
+            if bits <= SMALL_BITS:
+                return decimal.Decimal(v)
+            low_bits = bits >> 1
+            high = convert(v >> low_bits, bits - low_bits)
+            return high * power_of_two(low_bits) + convert(v & ((1 << low_bits) - 1), low_bits)
+
+        return str(convert(value, value.bit_length()))
+
+
+def leading_digits(value, count, digits=None):
+    """
+    Primeiros dígitos de um inteiro não negativo.
+
+    Args:
+        value (int): Inteiro não negativo
+        count (int): Quantos dígitos
+        digits (int): decimal_digits(value), se já conhecido
+
+    Returns:
+        str: Os count primeiros dígitos (todos, se houver menos)
+    """
+    if digits is None:
+        digits = decimal_digits(value)
+    if digits <= count:
+        return to_decimal(value)
+    # Quociente pequeno: a divisão é linear no tamanho de value
+    return str(value // 10 ** (digits - count))
+
+
+def trailing_digits(value, count):
+    """
+    Últimos dígitos de um inteiro não negativo (com zeros à esquerda).
+
+    Args:
+        value (int): Inteiro não negativo
+        count (int): Quantos dígitos
+
+    Returns:
+        str: Os count últimos dígitos
+    """
+    return str(value % 10 ** count).zfill(count)
+
+
+def format_result(value, mode=DEFAULT_RESULT_FORMAT, edge_digits=DEFAULT_EDGE_DIGITS):
+    """
+    Texto de um resultado para relatórios.
+
+    Args:
+        value: Resultado (inteiros são formatados; o resto usa str)
+        mode (str): 'auto', 'completo' ou 'pontas' (ver RESULT_FORMATS)
+        edge_digits (int): Dígitos exibidos em cada ponta no modo resumido
+
+    Returns:
+        str: Todos os dígitos, ou no modo resumido algo como
+            '70330367711422815821...91902245245323403501 (209 dígitos)'
+
+    Raises:
+        ValueError: Se o modo for desconhecido
+    """
+    if mode not in RESULT_FORMATS:
+        raise ValueError(f"modo de exibição desconhecido: {mode!r} "
+                         f"(use {', '.join(RESULT_FORMATS)})")
+    if not isinstance(value, int) or isinstance(value, bool):
+        return str(value)
+
+    sign, magnitude = ('-', -value) if value < 0 else ('', value)
+    digits = decimal_digits(magnitude)
+    if (mode == FORMAT_FULL or digits <= 2 * edge_digits
+            or (mode == FORMAT_AUTO and digits <= AUTO_MAX_DIGITS)):
+        return to_decimal(value)
+    return (f"{sign}{leading_digits(magnitude, edge_digits, digits)}..."
+            f"{trailing_digits(magnitude, edge_digits)} ({digits} dígitos)")
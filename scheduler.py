@@ -0,0 +1,180 @@
+"""
+Escalonador de medições em paralelo, com cada processo preso a um núcleo.
+
+Cada tarefa roda em um subprocesso novo (método 'spawn'), fixado com
+os.sched_setaffinity em um núcleo livre, de modo que duas medições nunca
+disputam o mesmo núcleo. Alguns núcleos podem ficar reservados (ociosos)
+para o sistema operacional e o processo principal, reduzindo o ruído.
+
+As tarefas são iniciadas da mais longa para a mais curta, pelo custo
+previsto: começar pelas longas evita que uma tarefa longa iniciada por
+último estique o tempo total (heurística LPT, longest processing time).
+
+Em sistemas sem os.sched_setaffinity (macOS, Windows), os processos não
+são fixados, mas o limite de processos simultâneos continua valendo.
+"""
+
+import contextlib
+import math
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+
+# Núcleos deixados ociosos por padrão
+DEFAULT_RESERVED_CORES = 1
+
+
+def available_cores(reserved=DEFAULT_RESERVED_CORES):
+    """
+    Núcleos em que as medições podem rodar.
+
+    Args:
+        reserved (int): Núcleos deixados ociosos (os de número mais baixo,
+            onde o sistema costuma atender interrupções)
+
+    Returns:
+        list: Identificadores dos núcleos (ao menos um)
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+    return cores[reserved:] or cores[-1:]
+
+
+def pin_to_core(cpu):
+    """
+    Fixa o processo atual em um núcleo.
+
+    Args:
+        cpu (int): Identificador do núcleo
+
+    Returns:
+        bool: True se o processo foi fixado, False se o sistema não permite
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError:
+        return False
+    return True
+
+
+class Task:
+    """Uma medição a escalonar: chave, custo previsto e função do subprocesso."""
+
+    def __init__(self, key, target, args, cost=None):
+        """
+        Inicializa a tarefa.
+
+        Args:
+            key: Identificador da tarefa nos resultados (ex.: (algoritmo, n))
+            target: Função de módulo chamada no subprocesso como
+                target(conn, *args); deve enviar (status, payload) por conn
+            args (tuple): Argumentos de target (serializáveis)
+            cost (float): Custo previsto em segundos (None: desconhecido)
+        """
+        self.key = key
+        self.target = target
+        self.args = args
+        self.cost = cost
+
+    def __repr__(self):
+        return f"Task({self.key!r}, cost={self.cost!r})"
+
+
+def longest_first(tasks):
+    """
+    Ordena as tarefas da mais longa para a mais curta.
+
+    Tarefas de custo desconhecido vêm primeiro: podem ser as mais longas.
+
+    Args:
+        tasks (list): Tarefas
+
+    Returns:
+        list: Nova lista ordenada (ordem original mantida em empates)
+    """
+    return sorted(tasks, key=lambda task: -(math.inf if task.cost is None else task.cost))
+
+
+def _pinned_worker(conn, cpu, target, args):
+    """Corpo do subprocesso: fixa o núcleo e roda a tarefa sem poluir o terminal."""
+    pin_to_core(cpu)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        target(conn, *args)
+
+
+def run_tasks(tasks, cores, timeout=None, skip=None, on_done=None):
+    """
+    Executa as tarefas em paralelo, no máximo uma por núcleo.
+
+    Args:
+        tasks (list): Tarefas (iniciadas da mais longa para a mais curta)
+        cores (list): Núcleos disponíveis (ver available_cores)
+        timeout (float): Limite de tempo por tarefa (None: sem limite)
+        skip: Função (task) -> bool consultada antes de iniciar cada
+            tarefa; se True, a tarefa não roda e termina como 'skipped'
+        on_done: Função (task, outcome) chamada a cada tarefa concluída
+
+    Returns:
+        dict: Chave -> (status, payload), com status 'ok', 'error',
+            'timeout' ou 'skipped'
+    """
+    context = multiprocessing.get_context('spawn')
+    pending = longest_first(tasks)
+    free_cores = list(cores)
+    running = {}  # receiver -> (task, process, cpu, deadline)
+    outcomes = {}
+
+    def finish(task, outcome):
+        outcomes[task.key] = outcome
+        if on_done is not None:
+            on_done(task, outcome)
+
+    while pending or running:
+        # Ocupa os núcleos livres com as tarefas mais longas
+        while pending and free_cores:
+            task = pending.pop(0)
+            if skip is not None and skip(task):
+                finish(task, ('skipped', None))
+                continue
+            cpu = free_cores.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_pinned_worker,
+                                      args=(sender, cpu, task.target, task.args))
+            process.start()
+            sender.close()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            running[receiver] = (task, process, cpu, deadline)
+        if not running:
+            continue
+
+        deadlines = [entry[3] for entry in running.values() if entry[3] is not None]
+        wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        ready = wait(list(running), wait_time)
+
+        now = time.monotonic()
+        for receiver in list(running):
+            task, process, cpu, deadline = running[receiver]
+            if receiver in ready:
+                # Resposta ou EOF (subprocesso morreu sem responder)
+                try:
+                    outcome = receiver.recv()
+                except EOFError:
+                    process.join()
+                    outcome = ('error', f"subprocesso encerrado com código {process.exitcode}")
+            elif deadline is not None and now >= deadline:
+                process.terminate()
+                outcome = ('timeout', None)
+            else:
+                continue
+            process.join()
+            receiver.close()
+            del running[receiver]
+            free_cores.append(cpu)
+            finish(task, outcome)
+    return outcomes
@@ -0,0 +1,288 @@
+"""
+Estatísticas em fluxo (streaming), com memória limitada e combináveis.
+
+- RunningStats: contagem, média e variância acumuladas (Welford); duas
+  instâncias se combinam pela fórmula de Chan et al.
+- TDigest: esboço (sketch) de quantis de Dunning. Guarda no máximo
+  ~compression centróides (média, peso), mais densos nas caudas, e estima
+  qualquer quantil (p50, p90, p99, ...) com erro relativo pequeno
+  justamente nas caudas. Dois t-digests se combinam sem as amostras
+  originais: basta reunir os centróides e recomprimir.
+
+Com poucas amostras (até ~0.6 · compression) nenhum centróide é fundido e os
+quantis são exatos, com a mesma interpolação de statistics.median.
+
+Ambas as estruturas viram dicionários JSON (to_dict/from_dict), para
+atravessar pipes entre processos, o cache e o diário do benchmark.
+"""
+
+import math
+
+
+# Fator de compressão padrão do t-digest (~número máximo de centróides)
+DEFAULT_COMPRESSION = 200
+
+# Percentis reportados por padrão
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+class RunningStats:
+    """Contagem, média e variância acumuladas (algoritmo de Welford)."""
+
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self):
+        """Inicializa sem observações."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        """
+        Acrescenta uma observação em O(1), sem guardar a série.
+
+        Args:
+            value (float): Valor observado
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """
+        Incorpora as observações de outra instância (fórmula de Chan).
+
+        Args:
+            other (RunningStats): Estatísticas a incorporar
+
+        Returns:
+            RunningStats: A própria instância
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        return self
+
+    @classmethod
+    def from_summary(cls, count, mean, stdev):
+        """
+        Reconstrói o acumulador a partir de contagem, média e desvio padrão.
+
+        Args:
+            count (int): Número de observações
+            mean (float): Média
+            stdev (float): Desvio padrão amostral
+
+        Returns:
+            RunningStats: Acumulador equivalente
+        """
+        stats = cls()
+        stats.count = count
+        stats.mean = mean
+        stats._m2 = stdev * stdev * (count - 1) if count > 1 else 0.0
+        return stats
+
+    @property
+    def total(self):
+        """Soma das observações."""
+        return self.mean * self.count
+
+    @property
+    def variance(self):
+        """Variância amostral (0 com menos de duas observações)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        """Desvio padrão amostral."""
+        return math.sqrt(self.variance)
+
+
+class TDigest:
+    """Esboço de quantis t-digest (variante com fusão, escala k1)."""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        """
+        Inicializa um t-digest vazio.
+
+        Args:
+            compression (float): Fator de compressão δ; a memória é O(δ)
+        """
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = []
+        self._weights = []
+        self._buffer = []
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value, weight=1):
+        """
+        Acrescenta uma observação.
+
+        As observações ficam em um buffer e são fundidas aos centróides em
+        lote, quando o buffer enche.
+
+        Args:
+            value (float): Valor observado
+            weight (float): Peso (número de observações representadas)
+
+        Complexidade:
+            Tempo: O(log δ) amortizado
+        """
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other):
+        """
+        Incorpora outro t-digest, sem precisar das amostras originais.
+
+        Args:
+            other (TDigest): Esboço a incorporar
+
+        Returns:
+            TDigest: A própria instância
+        """
+        other._compress()
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _scale(self, q):
+        """Função de escala k1: centróides pequenos perto de q = 0 e q = 1."""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(1.0, max(0.0, q)) - 1)
+
+    def _compress(self):
+        """Funde o buffer aos centróides respeitando o limite de tamanho."""
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        means, weights = [], []
+        total = self.count
+        before = 0  # peso dos centróides já fechados
+        mean, weight = points[0]
+        for value, w in points[1:]:
+            # Funde enquanto o centróide couber em uma unidade da escala k
+            if self._scale((before + weight + w) / total) - self._scale(before / total) <= 1:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                mean, weight = value, w
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    def quantile(self, q):
+        """
+        Estima o quantil q.
+
+        Interpola linearmente entre os centros dos centróides (e entre o
+        mínimo/máximo e os centróides das pontas).
+
+        Args:
+            q (float): Quantil, entre 0 e 1
+
+        Returns:
+            float: Valor estimado
+
+        Raises:
+            ValueError: Se o esboço estiver vazio ou q fora de [0, 1]
+        """
+        if self.count == 0:
+            raise ValueError("t-digest vazio")
+        if not 0 <= q <= 1:
+            raise ValueError("q deve estar entre 0 e 1")
+        self._compress()
+        means, weights = self._means, self._weights
+        target = q * self.count
+
+        # Antes do centro do primeiro centróide: entre o mínimo e ele
+        first = weights[0] / 2
+        if target <= first:
+            if weights[0] == 1:
+                return means[0]
+            return self.min + (means[0] - self.min) * target / first
+
+        cumulative = 0
+        for i in range(len(means) - 1):
+            left = cumulative + weights[i] / 2
+            right = cumulative + weights[i] + weights[i + 1] / 2
+            if target <= right:
+                return means[i] + (means[i + 1] - means[i]) * (target - left) / (right - left)
+            cumulative += weights[i]
+
+        # Depois do centro do último centróide: entre ele e o máximo
+        last = self.count - weights[-1] / 2
+        if weights[-1] == 1:
+            return means[-1]
+        return means[-1] + (self.max - means[-1]) * (target - last) / (self.count - last)
+
+    def percentiles(self, ps=DEFAULT_PERCENTILES):
+        """
+        Estima vários percentis.
+
+        Args:
+            ps (iterable): Percentis, entre 0 e 100
+
+        Returns:
+            dict: Percentil -> valor estimado
+        """
+        return {p: self.quantile(p / 100) for p in ps}
+
+    @property
+    def centroids(self):
+        """Número de centróides guardados (após fundir o buffer)."""
+        self._compress()
+        return len(self._means)
+
+    def to_dict(self):
+        """
+        Representação serializável em JSON.
+
+        Returns:
+            dict: compression, count, min, max e centróides [média, peso]
+        """
+        self._compress()
+        return {'compression': self.compression, 'count': self.count,
+                'min': self.min, 'max': self.max,
+                'centroids': [[m, w] for m, w in zip(self._means, self._weights)]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstrói um t-digest de to_dict.
+
+        Args:
+            data (dict): Saída de to_dict
+
+        Returns:
+            TDigest: Esboço equivalente
+        """
+        digest = cls(data['compression'])
+        digest.count = data['count']
+        digest.min = data['min']
+        digest.max = data['max']
+        digest._means = [m for m, _ in data['centroids']]
+        digest._weights = [w for _, w in data['centroids']]
+        return digest
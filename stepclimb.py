@@ -0,0 +1,198 @@
+"""
+Módulo para resolver a GENERALIZAÇÃO do Staircase Problem.
+
+O problema: Dado uma escada com n degraus e um conjunto de passos
+permitidos (ex.: {1, 3, 5} ou {1, 2, ..., k}), de quantas formas
+diferentes podemos subir a escada?
+
+Recorrência: f(i) = soma de f(i - s) para cada passo s, com f(0) = 1
+(forma vazia) e f(i) = 0 para i < 0. Com passos {1, 2} a sequência é
+a mesma de climb_stairs_dp: f(1)=1, f(2)=2, f(3)=3, ...
+
+ABORDAGENS:
+- Janela deslizante: DP bottom-up com buffer circular de tamanho max(passos)
+  Tempo O(n · |passos|), Espaço O(max(passos))
+- Kitamasa: calcula x^n módulo o polinômio característico da recorrência
+  Tempo O(max(passos)² · log n), adequado para n muito grande
+
+Ambas aceitam mod=m e devolvem f(n) mod m (ver dpclimb.check_modulus).
+"""
+
+from dpclimb import check_modulus
+
+
+def _normalize_steps(steps):
+    """
+    Valida e normaliza o conjunto de passos.
+
+    Args:
+        steps (iterable): Passos permitidos (inteiros positivos)
+
+    Returns:
+        tuple: Passos ordenados e sem repetição
+    """
+    normalized = tuple(sorted(set(steps)))
+    if not normalized:
+        raise ValueError("o conjunto de passos não pode ser vazio")
+    if normalized[0] < 1:
+        raise ValueError("os passos devem ser inteiros positivos")
+    return normalized
+
+
+def parse_steps(text):
+    """
+    Converte um texto como "1,3,5" ou "1-4" em um conjunto de passos.
+
+    Args:
+        text (str): Passos separados por vírgula; "a-b" denota o intervalo a..b
+
+    Returns:
+        tuple: Passos ordenados e sem repetição
+    """
+    steps = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            low, high = part.split('-', 1)
+            steps.extend(range(int(low), int(high) + 1))
+        else:
+            steps.append(int(part))
+    return _normalize_steps(steps)
+
+
+def climb_stairs_steps(n, steps=(1, 2), mod=None):
+    """
+    Resolve o problema com passos arbitrários usando JANELA DESLIZANTE.
+
+    Mantém apenas os últimos max(passos) valores em um buffer circular,
+    em vez de uma tabela com n+1 posições.
+
+    Args:
+        n (int): Número de degraus da escada
+        steps (iterable): Passos permitidos (padrão: 1 e 2)
+        mod (int): Se informado, devolve o resultado módulo mod
+
+    Returns:
+        int: Número de formas diferentes de subir a escada
+
+    Complexidade:
+        Tempo: O(n · |passos|)
+        Espaço: O(max(passos)) - buffer circular
+    """
+    steps = _normalize_steps(steps)
+    check_modulus(mod)
+    if n <= 0:
+        return 0
+
+    size = steps[-1]
+    # window[i % size] guarda f(i) para os últimos `size` degraus
+    window = [0] * size
+    window[0] = 1 if mod is None else 1 % mod  # f(0) = 1
+
+    for i in range(1, n + 1):
+        total = 0
+        for s in steps:
+            if s > i:
+                break
+            total += window[(i - s) % size]
+        # A posição de f(i - size) já não é mais necessária
+        window[i % size] = total if mod is None else total % mod
+
+    return window[n % size]
+
+
+def _reduce(poly, steps, order, mod=None):
+    """
+    Reduz um polinômio módulo x^order - soma(x^(order - s)).
+
+    Args:
+        poly (list): Coeficientes (poly[i] multiplica x^i), modificado in-place
+        steps (tuple): Passos da recorrência
+        order (int): Ordem da recorrência (max(passos))
+        mod (int): Se informado, os coeficientes são reduzidos módulo mod
+
+    Returns:
+        list: Coeficientes de grau < order
+    """
+    # x^d = x^(d - order) · x^order = soma de x^(d - s) para cada passo s
+    for d in range(len(poly) - 1, order - 1, -1):
+        coef = poly[d]
+        if coef:
+            if mod is not None:
+                coef %= mod
+            for s in steps:
+                poly[d - s] += coef
+    del poly[order:]
+    if mod is not None:
+        poly[:] = [c % mod for c in poly]
+    return poly
+
+
+def _poly_mulmod(a, b, steps, order, mod=None):
+    """Multiplica dois polinômios de grau < order e reduz o resultado."""
+    product = [0] * (2 * order - 1)
+    for i, ai in enumerate(a):
+        if ai:
+            for j, bj in enumerate(b):
+                product[i + j] += ai * bj
+    return _reduce(product, steps, order, mod)
+
+
+def climb_stairs_steps_kitamasa(n, steps=(1, 2), mod=None):
+    """
+    Resolve o problema com passos arbitrários usando o MÉTODO DE KITAMASA.
+
+    Escreve f(n) como combinação linear dos valores iniciais
+    f(0), ..., f(k-1) (k = max(passos)), cujos coeficientes são os de
+    x^n módulo o polinômio característico. A potência é obtida por
+    quadrados sucessivos, como em uma exponenciação de matriz, mas com
+    custo O(k²) por passo em vez de O(k³).
+
+    Args:
+        n (int): Número de degraus da escada
+        steps (iterable): Passos permitidos (padrão: 1 e 2)
+        mod (int): Se informado, devolve o resultado módulo mod
+
+    Returns:
+        int: Número de formas diferentes de subir a escada
+
+    Complexidade:
+        Tempo: O(k² · log n) operações com inteiros
+        Espaço: O(k)
+    """
+    steps = _normalize_steps(steps)
+    check_modulus(mod)
+    if n <= 0:
+        return 0
+
+    order = steps[-1]
+
+    # Valores iniciais f(0), ..., f(order - 1)
+    initial = [0] * order
+    initial[0] = 1
+    for i in range(1, order):
+        initial[i] = sum(initial[i - s] for s in steps if s <= i)
+    if mod is not None:
+        initial = [v % mod for v in initial]
+
+    if n < order:
+        return initial[n]
+
+    # result = x^0, base = x (ambos já reduzidos)
+    result = _reduce([1], steps, order, mod)
+    base = _reduce([0, 1], steps, order, mod)
+    result += [0] * (order - len(result))
+    base += [0] * (order - len(base))
+
+    e = n
+    while e:
+        if e & 1:
+            result = _poly_mulmod(result, base, steps, order, mod)
+        e >>= 1
+        if e:
+            base = _poly_mulmod(base, base, steps, order, mod)
+
+    total = sum(c * v for c, v in zip(result, initial))
+    return total if mod is None else total % mod
@@ -5,12 +5,38 @@ Execute com: python -m pytest test_staircase.py -v
 ou: python test_staircase.py
 """
 
+import contextlib
+import gc
+import io
+import itertools
 import unittest
-from dpclimb import climb_stairs_dp
-from recursiveclimb import climb_stairs_recursive
-from executiontime import measure_execution_time, format_time
+from dpclimb import (climb_stairs_dp, climb_stairs_fast, climb_stairs_checkpointed,
+                     CheckpointedDPTable, parse_modulus, climb_stairs_dp_many,
+                     climb_stairs_fast_many, climb_stairs_stream, write_stream)
+from recursiveclimb import (climb_stairs_recursive, climb_stairs_iterative_stack, profile_recursion,
+                            instrumentation_for, climb_stairs_recursive_parallel, expand_frontier)
+from stepclimb import climb_stairs_steps, climb_stairs_steps_kitamasa, parse_steps
+from pisano import PisanoCache, compute_pisano_residues
+from vectorclimb import climb_stairs_mod_vectorized
+from executiontime import measure_execution_time, format_time, autorange, measure_per_call_time
 from memoryconsumer import measure_memory, format_memory
 from datasheet import DataSheet
+from recordsink import CSVSink, JSONLSink, open_sink
+from columnar import encode_big_ints, decode_big_ints, load_columns, load_big_ints
+from resultformat import decimal_digits, to_decimal, format_result, FORMAT_FULL, FORMAT_EDGES
+from complexity import fit_complexity, fit_model, RuntimePredictor, PHI
+from history import (record_run, connect, compare_runs, resolve_run, student_t_sf, welch_test,
+                     main as history_main)
+from resultcache import ResultCache, cache_key, code_fingerprint
+from journal import Journal, read_journal
+from scheduler import Task, available_cores, longest_first, run_tasks
+from sketch import TDigest, RunningStats
+from benchmark import (run_isolated_benchmark, is_timeout, run_benchmark, _isolated_worker, combine_stats,
+                       save_results_to_csv, summarize_samples, calibrated_predictor,
+                       benchmark_configuration, save_results_to_file)
+from measurement import (measure_time_without_gc, describe_protocol, PROTOCOL_COMBINED,
+                         median_confidence_interval, relative_ci_width)
+from functools import partial
 
 
 class TestStaircaseSolutions(unittest.TestCase):
@@ -20,17 +46,21 @@ class TestStaircaseSolutions(unittest.TestCase):
         """Testa os casos base."""
         # n = 0
         self.assertEqual(climb_stairs_dp(0), 0)
-        # otimizado removido
+        self.assertEqual(climb_stairs_fast(0), 0)
+        self.assertEqual(climb_stairs_fast(-3), 0)
+        self.assertEqual(climb_stairs_iterative_stack(0), 0)
+        self.assertEqual(climb_stairs_iterative_stack(1), 1)
+        self.assertEqual(climb_stairs_iterative_stack(2), 2)
         
         # n = 1
         self.assertEqual(climb_stairs_recursive(1), 1)
         self.assertEqual(climb_stairs_dp(1), 1)
-        # otimizado removido
+        self.assertEqual(climb_stairs_fast(1), 1)
         
         # n = 2
         self.assertEqual(climb_stairs_recursive(2), 2)
         self.assertEqual(climb_stairs_dp(2), 2)
-        # otimizado removido
+        self.assertEqual(climb_stairs_fast(2), 2)
     
     def test_valores_pequenos(self):
         """Testa com valores pequenos."""
@@ -69,6 +99,7 @@ class TestStaircaseSolutions(unittest.TestCase):
         expected = 573147844013817084101
         
         self.assertEqual(climb_stairs_dp(n), expected)
+        self.assertEqual(climb_stairs_fast(n), expected)
     
     def test_consistencia_entre_metodos(self):
         """Verifica se todos os métodos retornam o mesmo resultado."""
@@ -77,6 +108,14 @@ class TestStaircaseSolutions(unittest.TestCase):
                 result_dp = climb_stairs_dp(n)
                 result_rec = climb_stairs_recursive(n)
                 self.assertEqual(result_dp, result_rec)
+                self.assertEqual(climb_stairs_fast(n), result_dp)
+                self.assertEqual(climb_stairs_iterative_stack(n), result_rec)
+    
+    def test_fast_doubling_contra_dp(self):
+        """Compara o fast doubling com a DP para valores grandes."""
+        for n in [31, 64, 127, 128, 1000, 4097]:
+            with self.subTest(n=n):
+                self.assertEqual(climb_stairs_fast(n), climb_stairs_dp(n))
     
     def test_relacao_fibonacci(self):
         """Verifica que a sequência segue o padrão de Fibonacci."""
@@ -91,6 +130,825 @@ class TestStaircaseSolutions(unittest.TestCase):
                 self.assertEqual(result_n, result_n1 + result_n2)
 
 
+class TestCheckpointedDPTable(unittest.TestCase):
+    """Testa a tabela DP com checkpoints."""
+    
+    def test_acesso_aleatorio(self):
+        """Cada posição deve coincidir com a tabela dp[] completa."""
+        n = 200
+        table = CheckpointedDPTable(n)
+        self.assertEqual(len(table), n + 1)
+        self.assertEqual(table[0], 0)
+        for i in [1, 2, 3, 14, 15, 16, 99, 199, 200]:
+            with self.subTest(i=i):
+                self.assertEqual(table[i], climb_stairs_dp(i))
+        self.assertEqual(table[-1], climb_stairs_dp(n))
+    
+    def test_iteracao_e_intervalo(self):
+        """A iteração percorre a tabela inteira para qualquer k."""
+        expected = [0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89]
+        for k in [1, 3, 4, 11, 50]:
+            with self.subTest(k=k):
+                self.assertEqual(list(CheckpointedDPTable(10, k)), expected)
+    
+    def test_indice_invalido(self):
+        """Índices fora da tabela levantam IndexError."""
+        table = CheckpointedDPTable(10)
+        with self.assertRaises(IndexError):
+            table[11]
+    
+    def test_resultado_final(self):
+        """climb_stairs_checkpointed segue o mesmo contrato da DP."""
+        for n in [0, 1, 2, 3, 10, 500]:
+            with self.subTest(n=n):
+                self.assertEqual(climb_stairs_checkpointed(n), climb_stairs_dp(n))
+
+
+class TestGeneralizedSteps(unittest.TestCase):
+    """Testa as implementações com conjunto arbitrário de passos."""
+    
+    @staticmethod
+    def brute_force(n, steps):
+        """Conta as sequências de passos por enumeração direta."""
+        if n < 0:
+            return 0
+        if n == 0:
+            return 1
+        return sum(TestGeneralizedSteps.brute_force(n - s, steps) for s in steps)
+    
+    def test_passos_1_e_2_igual_dp(self):
+        """Com passos {1, 2} as duas abordagens coincidem com a DP."""
+        for n in [0, 1, 2, 3, 10, 100, 1000]:
+            with self.subTest(n=n):
+                self.assertEqual(climb_stairs_steps(n), climb_stairs_dp(n))
+                self.assertEqual(climb_stairs_steps_kitamasa(n), climb_stairs_dp(n))
+    
+    def test_passos_arbitrarios(self):
+        """Compara com a enumeração direta para vários conjuntos de passos."""
+        for steps in [(1,), (2,), (1, 3, 5), (2, 3), (1, 2, 3, 4), (3, 7)]:
+            for n in range(1, 20):
+                with self.subTest(steps=steps, n=n):
+                    expected = self.brute_force(n, steps)
+                    self.assertEqual(climb_stairs_steps(n, steps), expected)
+                    self.assertEqual(climb_stairs_steps_kitamasa(n, steps), expected)
+    
+    def test_kitamasa_n_grande(self):
+        """Kitamasa concorda com a janela deslizante para n grande."""
+        steps = (1, 3, 5)
+        self.assertEqual(climb_stairs_steps_kitamasa(3000, steps),
+                         climb_stairs_steps(3000, steps))
+    
+    def test_parse_steps(self):
+        """Converte o texto da CLI em passos."""
+        self.assertEqual(parse_steps("1,3,5"), (1, 3, 5))
+        self.assertEqual(parse_steps("1-4"), (1, 2, 3, 4))
+        self.assertEqual(parse_steps("5,1,1"), (1, 5))
+        with self.assertRaises(ValueError):
+            parse_steps("0,1")
+
+
+class TestModularMode(unittest.TestCase):
+    """Testa o modo modular (mod=) de todas as implementações."""
+    
+    MODULI = [1, 2, 7, 10**9 + 7, 2**64]
+    
+    def test_todas_as_implementacoes(self):
+        """Cada implementação devolve f(n) mod m."""
+        engines = [climb_stairs_dp, climb_stairs_fast, climb_stairs_checkpointed,
+                   climb_stairs_steps, climb_stairs_steps_kitamasa]
+        for mod in self.MODULI:
+            for n in [0, 1, 2, 3, 10, 93, 94, 500]:
+                expected = climb_stairs_dp(n) % mod
+                for engine in engines:
+                    with self.subTest(engine=engine.__name__, n=n, mod=mod):
+                        self.assertEqual(engine(n, mod=mod), expected)
+    
+    def test_recursao_modular(self):
+        """As forças brutas aceitam o mesmo parâmetro mod."""
+        for n in range(0, 21):
+            with self.subTest(n=n):
+                self.assertEqual(climb_stairs_recursive(n, mod=7), climb_stairs_dp(n) % 7)
+                self.assertEqual(climb_stairs_iterative_stack(n, mod=7), climb_stairs_dp(n) % 7)
+    
+    def test_valores_intermediarios_pequenos(self):
+        """A tabela com checkpoints guarda apenas resíduos."""
+        mod = 1000
+        table = CheckpointedDPTable(400, mod=mod)
+        self.assertTrue(all(0 <= value < mod for value in table))
+    
+    def test_modulo_invalido(self):
+        """mod deve ser um inteiro positivo."""
+        with self.assertRaises(ValueError):
+            climb_stairs_dp(10, mod=0)
+        with self.assertRaises(ValueError):
+            climb_stairs_fast(10, mod=-7)
+    
+    def test_parse_modulus(self):
+        """Converte o texto das CLIs em um módulo."""
+        self.assertEqual(parse_modulus("1000000007"), 10**9 + 7)
+        self.assertEqual(parse_modulus("1e9+7"), 10**9 + 7)
+        self.assertEqual(parse_modulus("2^64"), 2**64)
+        self.assertEqual(parse_modulus("2**61-1"), 2**61 - 1)
+        for text in ["0", "abc", "2^^3", ""]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_modulus(text)
+
+
+class TestPisanoCache(unittest.TestCase):
+    """Testa o cache de períodos de Pisano."""
+    
+    def test_periodos_conhecidos(self):
+        """π(2)=3, π(3)=8, π(10)=60, π(1)=1."""
+        for mod, period in [(1, 1), (2, 3), (3, 8), (10, 60), (1000, 1500)]:
+            with self.subTest(mod=mod):
+                self.assertEqual(len(compute_pisano_residues(mod)), period)
+    
+    def test_consultas_contra_fast_doubling(self):
+        """As consultas coincidem com o fast doubling, inclusive n = 10^18."""
+        cache = PisanoCache()
+        for mod in [1, 7, 1000, 10**6]:
+            for n in [0, 1, 2, 3, 100, 12345, 10**18]:
+                with self.subTest(mod=mod, n=n):
+                    self.assertEqual(cache.query(n, mod), climb_stairs_fast(n, mod=mod))
+    
+    def test_lru_e_contadores(self):
+        """Evicção LRU entre módulos e contadores de acertos/faltas."""
+        cache = PisanoCache(maxsize=2)
+        cache.query(10, 7)
+        cache.query(10, 11)
+        cache.query(20, 7)       # acerto; 11 passa a ser o menos usado
+        cache.query(10, 13)      # remove 11
+        cache.query(10, 11)      # falta novamente
+        info = cache.cache_info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 4)
+        self.assertEqual(info['currsize'], 2)
+    
+    def test_modulo_acima_do_limite(self):
+        """Módulos grandes são recusados."""
+        cache = PisanoCache(max_modulus=100)
+        with self.assertRaises(ValueError):
+            cache.query(10, 101)
+
+
+class TestBatchQueries(unittest.TestCase):
+    """Testa as consultas em lote."""
+    
+    def test_ordem_de_entrada(self):
+        """Resultados voltam na ordem de entrada, com repetições e n <= 0."""
+        ns = [41, 10, 0, 35, 10, -2, 1, 2, 300, 20]
+        expected = [climb_stairs_dp(n) for n in ns]
+        self.assertEqual(climb_stairs_dp_many(ns), expected)
+        self.assertEqual(climb_stairs_fast_many(ns), expected)
+    
+    def test_modo_modular(self):
+        """O lote aceita o mesmo parâmetro mod."""
+        ns = list(range(0, 200, 7)) + [1000]
+        for mod in [1, 97, 10**9 + 7]:
+            with self.subTest(mod=mod):
+                expected = [climb_stairs_dp(n, mod=mod) for n in ns]
+                self.assertEqual(climb_stairs_dp_many(ns, mod=mod), expected)
+                self.assertEqual(climb_stairs_fast_many(ns, mod=mod), expected)
+    
+    def test_lote_vazio(self):
+        """Um lote vazio devolve uma lista vazia."""
+        self.assertEqual(climb_stairs_dp_many([]), [])
+        self.assertEqual(climb_stairs_fast_many([]), [])
+
+
+class TestVectorizedQueries(unittest.TestCase):
+    """Testa a avaliação vetorizada (NumPy) de consultas modulares."""
+    
+    def test_contra_fast_doubling(self):
+        """Cada posição coincide com climb_stairs_fast(n, mod=m)."""
+        ns = [-3, 0, 1, 2, 3, 10, 93, 1000, 123456789, 10**12, 10**18]
+        for mod in [1, 7, 10**9 + 7, 2**31, 2**61 - 1, 2**64]:
+            with self.subTest(mod=mod):
+                result = climb_stairs_mod_vectorized(ns, mod)
+                self.assertEqual([int(x) for x in result],
+                                 [climb_stairs_fast(n, mod=mod) for n in ns])
+    
+    def test_forma_preservada(self):
+        """O resultado tem a mesma forma do array de entrada."""
+        result = climb_stairs_mod_vectorized([[1, 2], [3, 4]], 1000)
+        self.assertEqual(result.shape, (2, 2))
+        self.assertEqual(result.tolist(), [[1, 2], [3, 5]])
+    
+    def test_mod_obrigatorio(self):
+        """Sem módulo não há como usar aritmética de tamanho fixo."""
+        with self.assertRaises(ValueError):
+            climb_stairs_mod_vectorized([1, 2, 3], None)
+
+
+class TestStream(unittest.TestCase):
+    """Testa a geração sob demanda da sequência."""
+    
+    def setUp(self):
+        """Tabela de referência f(0..199)."""
+        self.reference = [0] + [climb_stairs_dp(n) for n in range(1, 200)]
+    
+    def test_fatiamento(self):
+        """start/stop/step seguem a semântica de fatiamento."""
+        for start, stop, step in [(1, 11, 1), (0, 50, 1), (5, 200, 3), (0, 200, 7), (100, 101, 1), (10, 5, 1)]:
+            with self.subTest(start=start, stop=stop, step=step):
+                self.assertEqual(list(climb_stairs_stream(start, stop, step)),
+                                 self.reference[start:stop:step])
+    
+    def test_sequencia_infinita(self):
+        """Sem stop, a sequência pode ser consumida com islice."""
+        self.assertEqual(list(itertools.islice(climb_stairs_stream(), 10)), self.reference[1:11])
+    
+    def test_modo_modular(self):
+        """O gerador aceita o parâmetro mod."""
+        values = list(climb_stairs_stream(3, 200, 4, mod=97))
+        self.assertEqual(values, [v % 97 for v in self.reference[3:200:4]])
+    
+    def test_gravacao_em_blocos(self):
+        """write_stream grava todos os valores, um bloco por vez."""
+        buffer = io.StringIO()
+        count = write_stream(buffer, 1, 11, chunk_size=3)
+        self.assertEqual(count, 10)
+        self.assertEqual(buffer.getvalue().split(), [str(v) for v in self.reference[1:11]])
+
+
+class TestRecursionInstrumentation(unittest.TestCase):
+    """Testa a instrumentação da recursão pura."""
+    
+    def test_arvore_n5(self):
+        """Contadores da árvore de f(5) (ver ABORDAGENS.md)."""
+        result, stats = profile_recursion(5)
+        self.assertEqual(result, 8)
+        self.assertEqual(stats.calls, 9)
+        self.assertEqual(stats.max_depth, 4)
+        self.assertEqual(stats.hits[3], 2)
+        self.assertEqual(stats.hits[2], 3)
+        self.assertEqual(stats.repeated_calls, 4)
+    
+    def test_crescimento_das_chamadas(self):
+        """O total de chamadas é 2·f(n-1) - 1, crescendo como φ^n."""
+        for n in range(2, 21):
+            with self.subTest(n=n):
+                _, stats = profile_recursion(n)
+                self.assertEqual(stats.calls, 2 * climb_stairs_dp(n - 1) - 1)
+    
+    def test_instrumentation_for(self):
+        """Só a recursão pura tem versão instrumentada; partials são aceitos."""
+        self.assertIsNone(instrumentation_for(climb_stairs_dp))
+        profiler = instrumentation_for(partial(climb_stairs_recursive, mod=7))
+        result, stats = profiler(15)
+        self.assertEqual(result, climb_stairs_dp(15) % 7)
+        self.assertGreater(stats.calls, 0)
+
+
+class TestParallelBruteForce(unittest.TestCase):
+    """Testa a força bruta paralela."""
+    
+    def test_fronteira_preserva_resultado(self):
+        """Folhas + multiplicidade · f(k) reconstroem f(n) em qualquer profundidade."""
+        for depth in [0, 1, 2, 5, 30]:
+            with self.subTest(depth=depth):
+                leaves, frontier = expand_frontier(20, depth)
+                total = leaves + sum(count * climb_stairs_dp(k) for k, count in frontier.items())
+                self.assertEqual(total, climb_stairs_dp(20))
+        # Profundidade d: no máximo d + 1 subárvores distintas, de n - 2d a n - d
+        _, frontier = expand_frontier(35, 8)
+        self.assertLessEqual(len(frontier), 9)
+        self.assertEqual((min(frontier), max(frontier)), (19, 27))
+    
+    def test_igual_a_sequencial(self):
+        """O resultado paralelo é exatamente o da recursão sequencial."""
+        for n, workers, depth in [(0, 2, None), (2, 2, None), (22, 2, None), (22, 3, 1), (25, 2, 8)]:
+            with self.subTest(n=n, workers=workers, depth=depth):
+                self.assertEqual(climb_stairs_recursive_parallel(n, workers, depth),
+                                 climb_stairs_recursive(n))
+        self.assertEqual(climb_stairs_recursive_parallel(22, 2, mod=97), climb_stairs_dp(22) % 97)
+
+
+class TestIsolatedBenchmark(unittest.TestCase):
+    """Testa as medições em subprocesso com limite de tempo."""
+    
+    def test_medicao_concluida(self):
+        """Uma medição rápida devolve as estatísticas do subprocesso."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_isolated_benchmark(climb_stairs_dp, 100, num_executions=3, timeout=60)
+        self.assertFalse(is_timeout(stats))
+        self.assertEqual(stats['num_executions'], 3)
+        self.assertGreater(stats['median_time'], 0)
+    
+    def test_timeout(self):
+        """Uma medição lenta demais é interrompida e registrada como timeout."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_isolated_benchmark(climb_stairs_recursive, 60, num_executions=1, timeout=0.5)
+        self.assertTrue(is_timeout(stats))
+        self.assertEqual(stats['timeout'], 0.5)
+        self.assertEqual(stats['num_executions'], 0)
+    
+    def test_erro_no_subprocesso(self):
+        """Exceções do subprocesso chegam ao chamador."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(RuntimeError):
+                run_isolated_benchmark(partial(climb_stairs_dp, mod=0), 10, num_executions=1, timeout=60)
+
+
+class TestScheduler(unittest.TestCase):
+    """Testa o escalonador paralelo com processos presos a núcleos."""
+    
+    @staticmethod
+    def task(key, func, n, cost=None):
+        """Tarefa que mede func(n) com uma execução."""
+        return Task(key, _isolated_worker, (func, n, 1, False, {}), cost=cost)
+    
+    def test_nucleos_disponiveis(self):
+        """Núcleos reservados ficam de fora, mas sempre resta ao menos um."""
+        every = available_cores(0)
+        self.assertGreaterEqual(len(every), 1)
+        self.assertEqual(available_cores(1), every[1:] or every[-1:])
+        self.assertEqual(len(available_cores(len(every) + 5)), 1)
+    
+    def test_mais_longas_primeiro(self):
+        """Custo desconhecido primeiro, depois do maior para o menor."""
+        tasks = [Task('a', None, (), 1.0), Task('b', None, (), None), Task('c', None, (), 5.0),
+                 Task('d', None, (), 1.0)]
+        self.assertEqual([t.key for t in longest_first(tasks)], ['b', 'c', 'a', 'd'])
+    
+    def test_execucao(self):
+        """Conclusões, timeouts, erros e tarefas puladas são todos reportados."""
+        tasks = [self.task('ok', climb_stairs_dp, 100, cost=0.1),
+                 self.task('lenta', climb_stairs_recursive, 60, cost=10.0),
+                 self.task('erro', partial(climb_stairs_dp, mod=0), 10),
+                 self.task('pulada', climb_stairs_dp, 10, cost=0.0)]
+        done = []
+        outcomes = run_tasks(tasks, available_cores(0), timeout=2.0,
+                             skip=lambda task: task.key == 'pulada',
+                             on_done=lambda task, outcome: done.append(task.key))
+        self.assertEqual(sorted(done), sorted(outcomes))
+        self.assertEqual(outcomes['ok'][0], 'ok')
+        self.assertEqual(outcomes['ok'][1]['num_executions'], 1)
+        self.assertEqual(outcomes['lenta'], ('timeout', None))
+        self.assertEqual(outcomes['erro'][0], 'error')
+        self.assertEqual(outcomes['pulada'], ('skipped', None))
+
+
+class TestMeasurementProtocol(unittest.TestCase):
+    """Testa os protocolos de medição."""
+    
+    def test_gc_desligado_e_restaurado(self):
+        """O gc fica desligado durante a medição e volta ao estado anterior."""
+        result, _ = measure_time_without_gc(lambda: gc.isenabled())
+        self.assertFalse(result)
+        self.assertTrue(gc.isenabled())
+        with self.assertRaises(ZeroDivisionError):
+            measure_time_without_gc(lambda: 1 / 0)
+        self.assertTrue(gc.isenabled())
+    
+    def test_protocolo_separado(self):
+        """Tempo e memória vêm de passagens separadas, registradas nas estatísticas."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_benchmark(climb_stairs_dp, 50, num_executions=4, warmup=2, memory_executions=10)
+        self.assertEqual(stats['protocol'], 'separado')
+        self.assertEqual(stats['warmup'], 2)
+        self.assertEqual(stats['memory_executions'], 4)  # nunca mais que as de tempo
+        self.assertEqual(stats['num_executions'], 4)
+        self.assertGreater(stats['median_memory'], 0)
+    
+    def test_protocolo_combinado(self):
+        """O protocolo antigo continua disponível e é identificado."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_benchmark(climb_stairs_dp, 50, num_executions=3, protocol=PROTOCOL_COMBINED)
+        self.assertEqual(stats['protocol'], PROTOCOL_COMBINED)
+        self.assertEqual(stats['memory_executions'], 3)
+        self.assertEqual(stats['warmup'], 0)
+    
+    def test_protocolo_invalido(self):
+        """Protocolos desconhecidos são rejeitados."""
+        with self.assertRaises(ValueError):
+            describe_protocol('outro')
+        with self.assertRaises(ValueError):
+            run_benchmark(climb_stairs_dp, 10, num_executions=1, protocol='outro')
+
+
+class TestAdaptiveSampling(unittest.TestCase):
+    """Testa o intervalo de confiança da mediana e a amostragem adaptativa."""
+    
+    def test_ic_da_amostra_exata(self):
+        """Com as amostras brutas, mediana e IC são exatos, mesmo com o esboço já fundido."""
+        import random
+        import statistics
+        rng = random.Random(7)
+        samples = [rng.lognormvariate(0, 1) for _ in range(5000)]
+        times, time_stats = TDigest(), RunningStats()
+        memories, memory_stats = TDigest(), RunningStats()
+        for value in samples:
+            times.add(value)
+            time_stats.add(value)
+        memories.add(64)
+        memory_stats.add(64)
+        stats = summarize_samples(times, time_stats, memories, memory_stats, samples=samples)
+        self.assertEqual(stats['median_time'], statistics.median(samples))
+        self.assertEqual((stats['ci_low_time'], stats['ci_high_time']),
+                         median_confidence_interval(samples))
+        self.assertEqual(stats['ci_relative_width'], relative_ci_width(samples))
+    
+    def test_intervalo_contem_mediana(self):
+        """O IC é formado por amostras e contém a mediana."""
+        samples = [float(x) for x in range(1, 101)]
+        low, high = median_confidence_interval(samples)
+        self.assertIn(low, samples)
+        self.assertIn(high, samples)
+        self.assertLess(low, 50.5)
+        self.assertGreater(high, 50.5)
+        # Mais confiança -> intervalo mais largo
+        low99, high99 = median_confidence_interval(samples, confidence=0.99)
+        self.assertLessEqual(low99, low)
+        self.assertGreaterEqual(high99, high)
+    
+    def test_poucas_amostras(self):
+        """Com poucas amostras o IC é [mínimo, máximo]."""
+        self.assertEqual(median_confidence_interval([3.0]), (3.0, 3.0))
+        self.assertEqual(median_confidence_interval([2.0, 1.0, 3.0]), (1.0, 3.0))
+        self.assertEqual(relative_ci_width([2.0, 2.0]), 0.0)
+        with self.assertRaises(ValueError):
+            median_confidence_interval([])
+    
+    def test_para_no_orcamento(self):
+        """Um alvo inatingível encerra a amostragem pelo orçamento de tempo."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_benchmark(climb_stairs_dp, 100, adaptive=True, target_ci=0.0,
+                                  time_budget=0.05, max_executions=10**6)
+        self.assertTrue(stats['adaptive'])
+        self.assertGreater(stats['num_executions'], 1)
+        self.assertLessEqual(stats['ci_low_time'], stats['median_time'])
+        self.assertGreaterEqual(stats['ci_high_time'], stats['median_time'])
+    
+    def test_para_na_precisao(self):
+        """Um alvo folgado encerra a amostragem logo após o mínimo."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_benchmark(climb_stairs_dp, 100, adaptive=True, target_ci=float('inf'),
+                                  min_executions=7)
+        self.assertEqual(stats['num_executions'], 7)
+    
+    def test_relatorio_descreve_a_politica_usada(self):
+        """O relatório salvo traz a política de amostragem e os N realmente usados."""
+        import os
+        import tempfile
+        configuration = benchmark_configuration(adaptive=True, target_ci=0.02, time_budget=5,
+                                                input_file='n.txt', inputs=[5, 50])
+        self.assertIn('adaptativo', configuration[0])
+        self.assertIn('2%', configuration[0])
+        self.assertIn('Conjunto de dados: n.txt (5, 50)', configuration)
+        self.assertEqual(benchmark_configuration(num_executions=7)[0],
+                         'Número de execuções por teste: 7')
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'r.txt')
+            save_results_to_file({}, path, configuration=configuration)
+            with open(path, encoding='utf-8') as f:
+                report = f.read()
+        self.assertIn(configuration[0], report)
+        self.assertNotIn(': 30', report)
+        self.assertNotIn('100, 1000, 10000', report)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    """Testa os esboços de quantis (t-digest) e os acumuladores de Welford."""
+    
+    @staticmethod
+    def samples(count, seed=7):
+        """Amostras com cauda longa, como tempos de execução."""
+        import random
+        generator = random.Random(seed)
+        return [generator.lognormvariate(0, 1) for _ in range(count)]
+    
+    @staticmethod
+    def digest(values):
+        """t-digest com os valores dados."""
+        digest = TDigest()
+        for value in values:
+            digest.add(value)
+        return digest
+    
+    def test_exato_com_poucas_amostras(self):
+        """Com poucas amostras, mediana e IC coincidem com o cálculo direto."""
+        import statistics
+        from measurement import digest_confidence_interval
+        for count in (1, 2, 3, 30, 31, 100):
+            values = self.samples(count)
+            digest = self.digest(values)
+            self.assertAlmostEqual(digest.quantile(0.5), statistics.median(values))
+            self.assertEqual(digest_confidence_interval(digest), median_confidence_interval(values))
+            self.assertEqual((digest.min, digest.max), (min(values), max(values)))
+    
+    def test_percentis_e_memoria_limitada(self):
+        """p50/p90/p99 com erro pequeno e poucos centróides para 100 mil amostras."""
+        values = self.samples(100000)
+        digest = self.digest(values)
+        ordered = sorted(values)
+        for p, estimate in digest.percentiles((50, 90, 99)).items():
+            exact = ordered[int(p / 100 * len(ordered))]
+            self.assertLess(abs(estimate - exact) / exact, 0.02)
+        self.assertLessEqual(digest.centroids, digest.compression)
+    
+    def test_combinacao(self):
+        """Esboços e acumuladores combinados equivalem aos de todas as amostras."""
+        import json
+        import statistics
+        values = self.samples(20000)
+        parts = [values[i::4] for i in range(4)]
+        merged = TDigest()
+        running = RunningStats()
+        for part in parts:
+            # Ida e volta por JSON, como entre processos
+            merged.merge(TDigest.from_dict(json.loads(json.dumps(self.digest(part).to_dict()))))
+            partial_stats = RunningStats()
+            for value in part:
+                partial_stats.add(value)
+            running.merge(RunningStats.from_summary(partial_stats.count, partial_stats.mean,
+                                                    partial_stats.stdev))
+        whole = self.digest(values)
+        self.assertEqual(merged.count, len(values))
+        for q in (0.5, 0.9, 0.99):
+            self.assertLess(abs(merged.quantile(q) - whole.quantile(q)) / whole.quantile(q), 0.02)
+        self.assertAlmostEqual(running.mean, statistics.mean(values))
+        self.assertAlmostEqual(running.stdev, statistics.stdev(values))
+        with self.assertRaises(ValueError):
+            TDigest().quantile(0.5)
+    
+    def test_estatisticas_do_benchmark(self):
+        """run_benchmark reporta percentis, e resultados de processos se combinam."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = run_benchmark(climb_stairs_dp, 200, num_executions=10, batch_short_runs=False)
+            second = run_benchmark(climb_stairs_dp, 200, num_executions=20, batch_short_runs=False)
+        for key in ('p50_time', 'p90_time', 'p99_time', 'p50_memory', 'p99_memory'):
+            self.assertIn(key, first)
+        self.assertLessEqual(first['p50_time'], first['p90_time'])
+        self.assertLessEqual(first['p90_time'], first['p99_time'])
+        
+        combined = combine_stats([first, second])
+        self.assertEqual(combined['num_executions'], 30)
+        self.assertEqual(combined['memory_executions'],
+                         first['memory_executions'] + second['memory_executions'])
+        self.assertEqual(combined['min_time'], min(first['min_time'], second['min_time']))
+        self.assertEqual(combined['max_time'], max(first['max_time'], second['max_time']))
+        expected_mean = (10 * first['mean_time'] + 20 * second['mean_time']) / 30
+        self.assertAlmostEqual(combined['mean_time'], expected_mean)
+
+
+class TestComplexityFit(unittest.TestCase):
+    """Testa o ajuste de complexidade e a previsão de tempo."""
+    
+    def test_recupera_modelo(self):
+        """Séries sintéticas são atribuídas ao modelo que as gerou."""
+        import math
+        series = {
+            'O(n)': [1000, 2000, 4000, 8000, 16000],
+            'O(n²)': [1000, 2000, 4000, 8000, 16000],
+            'O(n log n)': [1000, 10000, 100000, 1000000],
+            'O(φ^n)': [10, 15, 20, 25, 30],
+        }
+        growth = {
+            'O(n)': lambda n: n,
+            'O(n²)': lambda n: n * n,
+            'O(n log n)': lambda n: n * math.log2(n),
+            'O(φ^n)': lambda n: PHI ** n,
+        }
+        for model, ns in series.items():
+            with self.subTest(model=model):
+                times = [1e-6 + 1e-9 * growth[model](n) for n in ns]
+                best = fit_complexity(ns, times)[0]
+                self.assertEqual(best.model, model)
+                self.assertLess(best.rms_residual, 1e-6)
+    
+    def test_previsao(self):
+        """O modelo ajustado extrapola para n não medidos."""
+        predictor = RuntimePredictor()
+        for n in (10, 12, 14):
+            predictor.add(n, 1e-5 * PHI ** n)
+            if n < 14:
+                self.assertIsNone(predictor.predict(30))
+        self.assertEqual(predictor.best_fit().model, 'O(φ^n)')
+        self.assertAlmostEqual(predictor.predict(30), 1e-5 * PHI ** 30, delta=1e-5 * PHI ** 30 * 1e-6)
+    
+    def test_previsao_nao_confiavel(self):
+        """Tempos curtos demais ou extrapolação infinita de um modelo escolhido não preveem."""
+        noisy = RuntimePredictor()
+        for n, seconds in ((10, 3e-6), (20, 2e-6), (30, 9e-6)):
+            noisy.add(n, seconds)
+        self.assertIsNone(noisy.best_fit())
+        self.assertIsNone(noisy.predict(5000))
+        
+        chosen = RuntimePredictor()
+        for n in (10, 12, 14):
+            chosen.add(n, 1e-5 * PHI ** n)
+        self.assertEqual(chosen.best_fit().model, 'O(φ^n)')
+        self.assertIsNone(chosen.predict(5000))
+        
+        imposed = RuntimePredictor(models=['O(φ^n)'])
+        for n in (10, 12, 14):
+            imposed.add(n, 1e-5 * PHI ** n)
+        self.assertEqual(imposed.predict(5000), float('inf'))
+    
+    def test_modelo_inaplicavel(self):
+        """φ^n não cabe em float para n grande: o modelo é descartado."""
+        self.assertIsNone(fit_model('O(φ^n)', [10**4, 10**5, 10**6], [1.0, 2.0, 3.0]))
+        models = [fit.model for fit in fit_complexity([10**4, 10**5, 10**6], [1.0, 2.0, 3.0])]
+        self.assertNotIn('O(φ^n)', models)
+    
+    def test_calibracao(self):
+        """A calibração mede a implementação real em n pequenos."""
+        predictor = RuntimePredictor()
+        predictor.calibrate(climb_stairs_recursive, (12, 14, 16, 18, 20, 22))
+        self.assertEqual(len(predictor.ns), 6)
+        self.assertGreater(predictor.predict(40), predictor.predict(30))
+    
+    def test_preditor_do_benchmark_so_exponencial(self):
+        """O benchmark só prevê (e pula) os algoritmos exponenciais, com O(φ^n) imposto."""
+        for name, func in (('4. DP com Checkpoints (√n)', climb_stairs_checkpointed),
+                           ('6. Passos Genéricos (Kitamasa) [mod 97]', climb_stairs_fast)):
+            self.assertIsNone(calibrated_predictor(name, func))
+        predictor = calibrated_predictor('1. Recursão Pura (FORÇA BRUTA)', climb_stairs_recursive)
+        self.assertEqual(predictor.best_fit().model, 'O(φ^n)')
+        self.assertGreater(predictor.predict(40), predictor.predict(30))
+
+
+class TestBenchmarkHistory(unittest.TestCase):
+    """Testa o histórico SQLite e a detecção de regressões."""
+    
+    def setUp(self):
+        """Cria um banco temporário."""
+        import os
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, 'historico.db')
+    
+    def tearDown(self):
+        """Remove o banco temporário."""
+        self.tmp.cleanup()
+    
+    @staticmethod
+    def results(mean_time, mean_memory=1000.0):
+        """Resultados sintéticos no formato de run_full_benchmark."""
+        stats = {'median_time': mean_time, 'mean_time': mean_time, 'stdev_time': mean_time * 0.02,
+                 'num_executions': 30, 'median_memory': mean_memory, 'mean_memory': mean_memory,
+                 'stdev_memory': 0, 'memory_executions': 3, 'protocol': 'separado'}
+        timeout = {'status': 'timeout', 'timeout': 1.0, 'num_executions': 0}
+        return {'DP': {100: stats}, 'Força Bruta': {41: timeout}}
+    
+    def test_distribuicao_t(self):
+        """Caudas da t de Student conferem com valores tabelados."""
+        self.assertAlmostEqual(student_t_sf(2.0, 10), 0.03669, places=4)
+        self.assertAlmostEqual(student_t_sf(1.812, 10), 0.05, places=3)
+        self.assertAlmostEqual(student_t_sf(0.0, 5), 0.5)
+        self.assertLess(welch_test(1.0, 0.1, 30, 1.2, 0.1, 30), 1e-6)
+        self.assertGreater(welch_test(1.0, 0.1, 30, 0.9, 0.1, 30), 0.99)
+    
+    def test_detecta_regressoes(self):
+        """Lentidão e aumento de memória significativos são apontados."""
+        base = record_run(self.results(1e-3), self.db, label='completo', commit='aaa')
+        same = record_run(self.results(1e-3), self.db, label='completo', commit='bbb')
+        slow = record_run(self.results(2e-3, 4000.0), self.db, label='completo', commit='ccc')
+        connection = connect(self.db)
+        try:
+            self.assertEqual(compare_runs(connection, base, same), [])
+            metrics = {r['metric'] for r in compare_runs(connection, base, slow)}
+            self.assertEqual(metrics, {'tempo', 'memória'})
+            # Mais rápido não é regressão
+            self.assertEqual(compare_runs(connection, slow, base), [])
+            # Referências: commit, 'anterior' (mesmo rótulo), 'ultima'
+            self.assertEqual(resolve_run(connection, 'bb')['id'], same)
+            latest = resolve_run(connection, 'ultima')
+            self.assertEqual(latest['id'], slow)
+            self.assertEqual(resolve_run(connection, 'anterior', latest)['id'], same)
+        finally:
+            connection.close()
+    
+    def test_codigo_de_saida(self):
+        """compare sai com 1 se houver regressão e 0 caso contrário."""
+        record_run(self.results(1e-3), self.db, commit='aaa')
+        record_run(self.results(1e-3), self.db, commit='bbb')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(history_main(['--db', self.db, 'compare']), 0)
+            record_run(self.results(5e-3), self.db, commit='ccc')
+            self.assertEqual(history_main(['--db', self.db, 'compare']), 1)
+            self.assertEqual(history_main(['--db', self.db, 'compare', '--baseline', 'zzz']), 2)
+
+
+class TestResultCache(unittest.TestCase):
+    """Testa o cache de resultados indexado pelo código medido."""
+    
+    @staticmethod
+    def engine(helper_body):
+        """Cria uma implementação que depende de uma função auxiliar."""
+        namespace = {}
+        exec(f"def helper(n):\n    {helper_body}\n"
+             "def engine(n, mod=None):\n    return helper(n)\n", namespace)
+        return namespace['engine']
+    
+    def test_impressao_digital(self):
+        """Mudanças no código, inclusive em funções chamadas, mudam a impressão digital."""
+        self.assertEqual(code_fingerprint(climb_stairs_fast), code_fingerprint(climb_stairs_fast))
+        self.assertNotEqual(code_fingerprint(climb_stairs_fast), code_fingerprint(climb_stairs_dp))
+        self.assertEqual(code_fingerprint(self.engine("return n")),
+                         code_fingerprint(self.engine("return n")))
+        self.assertNotEqual(code_fingerprint(self.engine("return n")),
+                            code_fingerprint(self.engine("return n + 1")))
+        self.assertNotEqual(code_fingerprint(partial(climb_stairs_dp, mod=97)),
+                            code_fingerprint(partial(climb_stairs_dp, mod=101)))
+    
+    def test_impressao_digital_de_classes_e_constantes(self):
+        """Métodos de classes e constantes globais usados também entram na impressão digital."""
+        import dpclimb
+        original = code_fingerprint(climb_stairs_checkpointed)
+        getitem = dpclimb.CheckpointedDPTable.__getitem__
+        try:
+            dpclimb.CheckpointedDPTable.__getitem__ = lambda self, i: 0
+            self.assertNotEqual(code_fingerprint(climb_stairs_checkpointed), original)
+        finally:
+            dpclimb.CheckpointedDPTable.__getitem__ = getitem
+        self.assertEqual(code_fingerprint(climb_stairs_checkpointed), original)
+        
+        def engine(limit):
+            namespace = {'LIMIT': limit}
+            exec("def engine(n, mod=None):\n    return min(n, LIMIT)\n", namespace)
+            return namespace['engine']
+        self.assertEqual(code_fingerprint(engine(10)), code_fingerprint(engine(10)))
+        self.assertNotEqual(code_fingerprint(engine(10)), code_fingerprint(engine(11)))
+        self.assertNotEqual(code_fingerprint(engine(10)), code_fingerprint(engine(10 ** 5000)))
+    
+    def test_chave_e_persistencia(self):
+        """A chave depende de N e das opções; o cache sobrevive a uma nova instância."""
+        import os
+        import tempfile
+        options = {'num_executions': 30, 'protocol': 'separado'}
+        key = cache_key(climb_stairs_dp, 10, options)
+        self.assertEqual(key, cache_key(climb_stairs_dp, 10, dict(options)))
+        self.assertNotEqual(key, cache_key(climb_stairs_dp, 11, options))
+        self.assertNotEqual(key, cache_key(climb_stairs_dp, 10, {**options, 'protocol': 'combinado'}))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.json')
+            cache = ResultCache(path)
+            self.assertIsNone(cache.get(key))
+            cache.put(key, {'median_time': 1e-6}, 'DP', 10)
+            reloaded = ResultCache(path)
+            self.assertEqual(len(reloaded), 1)
+            self.assertEqual(reloaded.get(key), {'median_time': 1e-6})
+            # Arquivo corrompido: começa vazio em vez de falhar
+            with open(path, 'w') as f:
+                f.write('{')
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(len(ResultCache(path)), 0)
+
+
+class TestJournal(unittest.TestCase):
+    """Testa o diário de medições usado por --resume."""
+    
+    def setUp(self):
+        """Cria um diretório temporário para o diário."""
+        import os
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'diario.jsonl')
+    
+    def tearDown(self):
+        """Remove o diretório temporário."""
+        self.tmp.cleanup()
+    
+    def test_retomada(self):
+        """Pares registrados voltam na retomada com as mesmas opções."""
+        options = {'num_executions': 30, 'protocol': 'separado', 'timeout': None}
+        journal = Journal(self.path, options)
+        journal.record('DP', 10, {'median_time': 1e-6})
+        journal.record('DP', 20, {'status': 'timeout', 'timeout': 1.0, 'num_executions': 0})
+        
+        resumed = Journal(self.path, dict(options), resume=True)
+        self.assertEqual(len(resumed), 2)
+        self.assertEqual(resumed.get('DP', 10), {'median_time': 1e-6})
+        self.assertIsNone(resumed.get('DP', 30))
+        # Sem --resume, o diário recomeça
+        self.assertEqual(len(Journal(self.path, options)), 0)
+        self.assertEqual(read_journal(self.path), (options, {}))
+    
+    def test_opcoes_diferentes_e_linha_truncada(self):
+        """Opções diferentes descartam o diário; uma linha truncada é ignorada."""
+        journal = Journal(self.path, {'protocol': 'separado'})
+        journal.record('DP', 10, {'median_time': 1e-6})
+        with open(self.path, 'a') as f:
+            f.write('{"type": "cell", "algorithm": "DP", "n": 2')
+        resumed = Journal(self.path, {'protocol': 'separado'}, resume=True)
+        self.assertEqual(len(resumed), 1)
+        # O par gravado após a retomada não se perde na retomada seguinte
+        resumed.record('DP', 20, {'median_time': 2e-6})
+        resumed = Journal(self.path, {'protocol': 'separado'}, resume=True)
+        self.assertEqual(resumed.get('DP', 20), {'median_time': 2e-6})
+        self.assertEqual(len(resumed), 2)
+        
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            journal = Journal(self.path, {'protocol': 'combinado'}, resume=True)
+        self.assertEqual(len(journal), 0)
+        self.assertIn('outras opções', output.getvalue())
+
+
 class TestExecutionTime(unittest.TestCase):
     """Testa o módulo de medição de tempo."""
     
@@ -108,6 +966,30 @@ class TestExecutionTime(unittest.TestCase):
         self.assertIn("µs", format_time(0.000001))
         self.assertIn("ms", format_time(0.001))
         self.assertIn("s", format_time(1.0))
+    
+    def test_autorange(self):
+        """O lote escolhido é da sequência 1, 2, 5, 10, ... e cresce para chamadas rápidas."""
+        number = autorange(climb_stairs_dp, 10, min_time=0.001)
+        self.assertGreater(number, 1)
+        self.assertIn(int(str(number)[0]), (1, 2, 5))
+        self.assertEqual(set(str(number)[1:]), set('0') if number >= 10 else set())
+    
+    def test_measure_per_call_time(self):
+        """Tempo por chamada de um lote, já sem o custo do laço."""
+        result, per_call, number = measure_per_call_time(climb_stairs_dp, 10, number=1000)
+        self.assertEqual(result, 89)
+        self.assertEqual(number, 1000)
+        self.assertGreaterEqual(per_call, 0)
+        _, total = measure_execution_time(lambda: [climb_stairs_dp(10) for _ in range(1000)])
+        self.assertLess(per_call, total)
+    
+    def test_benchmark_agrupa_execucoes_curtas(self):
+        """run_benchmark agrupa chamadas curtas, a menos que desativado."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            batched = run_benchmark(climb_stairs_dp, 10, num_executions=3, min_sample_time=0.001)
+            single = run_benchmark(climb_stairs_dp, 10, num_executions=3, batch_short_runs=False)
+        self.assertGreater(batched['calls_per_sample'], 1)
+        self.assertEqual(single['calls_per_sample'], 1)
 
 
 class TestMemoryConsumer(unittest.TestCase):
@@ -142,6 +1024,28 @@ class TestDataSheet(unittest.TestCase):
         self.assertEqual(self.datasheet.data[0]['algorithm'], "Test")
         self.assertEqual(self.datasheet.data[0]['n'], 10)
     
+    def test_add_record_com_contadores(self):
+        """Contadores da instrumentação são opcionais."""
+        self.datasheet.add_record("Rec", 5, 8, 0.001, 0, calls=9, max_depth=4, repeated_calls=4)
+        self.datasheet.add_record("DP", 5, 8, 0.001, 64)
+        self.assertEqual(self.datasheet.data[0]['calls'], 9)
+        self.assertIsNone(self.datasheet.data[1]['calls'])
+    
+    def test_protocolo_no_csv(self):
+        """O protocolo de medição é gravado em uma coluna do CSV."""
+        import csv
+        import os
+        import tempfile
+        sheet = DataSheet(protocol='separado')
+        sheet.add_record("DP", 5, 8, 0.001, 64)
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'dados.csv')
+            with contextlib.redirect_stdout(io.StringIO()):
+                sheet.save_to_csv(filename)
+            with open(filename, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]['protocol'], 'separado')
+    
     def test_get_summary(self):
         """Testa geração de resumo."""
         self.datasheet.add_record("Algo1", 10, 89, 0.001, 1024)
@@ -154,11 +1058,345 @@ class TestDataSheet(unittest.TestCase):
         self.assertIn("Algo2", summary)
         self.assertEqual(summary["Algo1"]["count"], 2)
         self.assertEqual(summary["Algo2"]["count"], 1)
+    
+    def test_resumo_acumulado(self):
+        """Média e desvio acumulados (Welford) conferem com o cálculo direto."""
+        import statistics
+        times = [0.001 * (1 + (i * 37) % 11) for i in range(200)]
+        for i, t in enumerate(times):
+            self.datasheet.add_record("DP" if i % 2 else "Rec", i, i, t, 100 + i)
+        summary = self.datasheet.get_summary()
+        for algo, selected in (("DP", times[1::2]), ("Rec", times[0::2])):
+            self.assertEqual(summary[algo]["count"], len(selected))
+            self.assertAlmostEqual(summary[algo]["avg_time"], statistics.mean(selected))
+            self.assertAlmostEqual(summary[algo]["stdev_time"], statistics.stdev(selected))
+            self.assertAlmostEqual(summary[algo]["total_time"], sum(selected))
+    
+    def test_percentis_por_algoritmo(self):
+        """Por padrão, um esboço por algoritmo, independente do número de N."""
+        sheet = DataSheet(keep_records=False)
+        for i in range(1, 1001):
+            sheet.add_record("DP", i, 0, i / 1000, 64)
+        self.assertEqual(len(sheet._sketches), 1)
+        self.assertLessEqual(sheet._sketches[0][0].centroids, 2 * sheet._sketches[0][0].compression)
+        row = sheet.get_percentiles()["DP"]
+        self.assertEqual(row['count'], 1000)
+        self.assertAlmostEqual(row['p50_time'], 0.5, delta=0.005)
+        self.assertAlmostEqual(row['p99_time'], 0.99, delta=0.002)
+        with self.assertRaises(ValueError):
+            sheet.get_percentiles(by_n=True)
+    
+    def test_percentis_por_algoritmo_e_n(self):
+        """Com percentiles_by_n=True, percentis para cada par (algoritmo, N)."""
+        self.datasheet = DataSheet(percentiles_by_n=True)
+        for i in range(1, 101):
+            self.datasheet.add_record("DP", 10, 89, i / 1000, 64)
+        self.datasheet.add_record("DP", 20, 10946, 0.5, 128)
+        percentiles = self.datasheet.get_percentiles(by_n=True)
+        self.assertEqual(set(percentiles["DP"]), {10, 20})
+        row = percentiles["DP"][10]
+        self.assertEqual(row['count'], 100)
+        self.assertAlmostEqual(row['p50_time'], 0.0505)
+        self.assertAlmostEqual(row['p90_time'], 0.0905)
+        self.assertAlmostEqual(row['p99_time'], 0.0995)
+        self.assertEqual(row['p99_memory'], 64)
+        self.assertEqual(percentiles["DP"][20]['p50_time'], 0.5)
+    
+    def test_armazenamento_por_coluna(self):
+        """Colunas tipadas, nomes internados e visão de registros."""
+        from array import array
+        self.datasheet.add_record("DP", 5, 8, 0.5, 64)
+        self.datasheet.add_record("Rec", 6, 13, 0.25, 32, calls=25, max_depth=5, repeated_calls=14)
+        self.datasheet.add_record("DP", 7, 21, 0.125, 64)
+        self.assertEqual(len(self.datasheet), 3)
+        self.assertIsInstance(self.datasheet.column('execution_time'), array)
+        self.assertEqual(list(self.datasheet.column('n')), [5, 6, 7])
+        self.assertEqual(self.datasheet.column('algorithm'), ["DP", "Rec", "DP"])
+        self.assertEqual(self.datasheet.data[-1]['result'], 21)
+        self.assertEqual([r['n'] for r in self.datasheet.data[1:]], [6, 7])
+        self.assertEqual(self.datasheet.data[1]['repeated_calls'], 14)
+        with self.assertRaises(IndexError):
+            self.datasheet.data[3]
+        with self.assertRaises(KeyError):
+            self.datasheet.column('inexistente')
+    
+    def test_n_alem_de_64_bits(self):
+        """N >= 2**63 (consultas de Pisano) cabe na planilha e no .npz."""
+        import os
+        import tempfile
+        sheet = DataSheet()
+        sheet.add_record("A", 10, 89, 0.1, 8)
+        sheet.add_record("Pisano", 10**20, 5, 0.2, 8)
+        sheet.add_record("B", 30, 1346269, 0.3, 8)
+        self.assertEqual([r['n'] for r in sheet.data], [10, 10**20, 30])
+        self.assertEqual(sheet.column('algorithm'), ["A", "Pisano", "B"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'p.npz')
+            with contextlib.redirect_stdout(io.StringIO()):
+                sheet.save_to_npz(path)
+            self.assertEqual(load_big_ints(path, 'n'), [10, 10**20, 30])
+    
+    def test_registro_invalido_nao_desalinha(self):
+        """Um registro rejeitado não altera colunas, contagem nem resumo."""
+        sheet = DataSheet()
+        sheet.add_record("A", 10, 89, 0.1, 8)
+        with self.assertRaises(ValueError):
+            sheet.add_record("X", 20, 1, 0.1, 2**70)
+        with self.assertRaises(TypeError):
+            sheet.add_record("X", 20, 1, 0.1, 8, calls="muitas")
+        sheet.add_record("B", 20, 10946, 0.2, 8)
+        self.assertEqual(len(sheet), 2)
+        self.assertEqual([r['algorithm'] for r in sheet.data], ["A", "B"])
+        self.assertEqual(list(sheet.get_summary()), ["A", "B"])
+
+
+class TestRecordSink(unittest.TestCase):
+    """Testa a gravação incremental dos registros (CSV e JSONL)."""
+    
+    def setUp(self):
+        """Cria um diretório temporário."""
+        import os
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.tmp.name, name)
+    
+    def tearDown(self):
+        """Remove o diretório temporário."""
+        self.tmp.cleanup()
+    
+    def test_formatos(self):
+        """A extensão escolhe o formato; contadores ausentes ficam vazios/nulos."""
+        import csv
+        import json
+        for name, sink_type in (('r.csv', CSVSink), ('r.jsonl', JSONLSink)):
+            with open_sink(self.path(name)) as sink:
+                self.assertIsInstance(sink, sink_type)
+                sheet = DataSheet(protocol='separado', sink=sink)
+                sheet.add_record("DP", 100, 573147844013817084101, 0.001, 64)
+                sheet.add_record("Rec", 5, 8, 0.002, 0, calls=15, max_depth=5, repeated_calls=6)
+            with open(self.path(name), newline='', encoding='utf-8') as f:
+                if sink_type is CSVSink:
+                    rows = list(csv.DictReader(f))
+                    self.assertEqual(rows[0]['calls'], '')
+                    self.assertEqual(int(rows[0]['result']), 573147844013817084101)
+                else:
+                    rows = [json.loads(line) for line in f]
+                    self.assertIsNone(rows[0]['calls'])
+                    self.assertEqual(rows[0]['result'], 573147844013817084101)
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(str(rows[1]['calls']), '15')
+            self.assertEqual(rows[1]['protocol'], 'separado')
+    
+    def test_lotes_e_queda(self):
+        """Lotes completos chegam ao arquivo antes do fechamento, sem repetir o cabeçalho."""
+        path = self.path('r.csv')
+        sink = CSVSink(path, flush_every=2, fsync_interval=0)
+        sheet = DataSheet(sink=sink, keep_records=False)
+        sheet.add_record("DP", 1, 1, 0.1, 8)
+        with open(path) as f:
+            self.assertEqual(len(f.readlines()), 1)  # só o cabeçalho
+        sheet.add_record("DP", 2, 2, 0.2, 8)
+        # Sem fechar (como em uma queda): o lote já está no disco
+        with open(path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        sheet.close()
+        
+        with CSVSink(path) as sink:
+            sink.write({'algorithm': 'DP', 'n': 3})
+        with open(path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(sum(line.startswith('algorithm,') for line in lines), 1)
+    
+    def test_reabertura_apos_queda(self):
+        """Uma linha truncada por queda é descartada antes de acrescentar."""
+        import json
+        from recordsink import RecordSink
+        for name in ('r.csv', 'r.jsonl'):
+            path = self.path(name)
+            with open_sink(path) as sink:
+                sink.write({'algorithm': 'A', 'n': 10, 'result': 89})
+                sink.write({'algorithm': 'A', 'n': 20, 'result': 10946})
+            with open(path, 'rb+') as f:
+                f.truncate(f.seek(0, 2) - 4)  # queda no meio da segunda linha
+            with open_sink(path) as sink:
+                sink.write({'algorithm': 'B', 'n': 30, 'result': 1346269})
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            if name.endswith('.jsonl'):
+                self.assertEqual([json.loads(line)['n'] for line in lines], [10, 30])
+            else:
+                self.assertEqual([line.split(',')[1] for line in lines], ['n', '10', '30'])
+        with self.assertRaises(TypeError):
+            RecordSink(self.path('base.txt'))
+    
+    def test_planilha_sem_registros_em_memoria(self):
+        """Com keep_records=False, só agregados e o último registro ficam em memória."""
+        with open_sink(self.path('r.jsonl')) as sink:
+            sheet = DataSheet(sink=sink, keep_records=False)
+            for i in range(10):
+                sheet.add_record("DP", i, i, i / 100, 8)
+        self.assertEqual(len(sheet), 10)
+        self.assertEqual(len(sheet.data), 0)
+        self.assertEqual(sheet.last_record['n'], 9)
+        self.assertEqual(sheet.get_summary()["DP"]["count"], 10)
+        self.assertEqual(sink.count, 10)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            sheet.display()
+        self.assertIn('10 registro(s)', output.getvalue())
+
+
+class TestResultFormat(unittest.TestCase):
+    """Testa a exibição de resultados grandes sem a conversão decimal quadrática."""
+    
+    @contextlib.contextmanager
+    def unlimited_str_digits(self):
+        """Desliga o limite de dígitos de str() (Python 3.11+) para as referências."""
+        import sys
+        previous = sys.get_int_max_str_digits() if hasattr(sys, 'get_int_max_str_digits') else None
+        if previous is not None:
+            sys.set_int_max_str_digits(0)
+        try:
+            yield
+        finally:
+            if previous is not None:
+                sys.set_int_max_str_digits(previous)
+    
+    def test_digitos_decimais(self):
+        """A contagem por bit_length confere com len(str) nas fronteiras de potências de 10."""
+        values = [0, 1, 9, 10, 99, 100, climb_stairs_fast(1000), climb_stairs_fast(5000)]
+        for k in range(1, 60):
+            values += [10**k - 1, 10**k, 10**k + 1, 2**k, 2**k - 1]
+        for value in values:
+            self.assertEqual(decimal_digits(value), len(str(value)), value)
+    
+    def test_conversao_por_divisao_e_conquista(self):
+        """to_decimal confere com str, inclusive acima do limite de 4300 dígitos."""
+        self.assertEqual(to_decimal(10**5000), '1' + '0' * 5000)
+        self.assertEqual(to_decimal(-(2**20000)), '-' + to_decimal(2**20000))
+        for n in (0, 1, 90, 30000, 100000):
+            value = climb_stairs_fast(n)
+            with self.unlimited_str_digits():
+                self.assertEqual(to_decimal(value), str(value))
+    
+    def test_modos_de_exibicao(self):
+        """'auto' resume resultados longos; 'completo' nunca resume."""
+        small = climb_stairs_fast(90)
+        self.assertEqual(format_result(small), str(small))
+        value = climb_stairs_fast(1000)
+        text = str(value)
+        short = format_result(value)
+        self.assertEqual(short, f"{text[:20]}...{text[-20:]} ({len(text)} dígitos)")
+        self.assertEqual(format_result(value, FORMAT_FULL), text)
+        self.assertEqual(format_result(small, FORMAT_EDGES, edge_digits=5),
+                         f"{str(small)[:5]}...{str(small)[-5:]} ({len(str(small))} dígitos)")
+        self.assertEqual(format_result(-value, edge_digits=3), f"-{text[:3]}...{text[-3:]} (209 dígitos)")
+        self.assertEqual(format_result(10**100, FORMAT_EDGES, edge_digits=2), "10...00 (101 dígitos)")
+        self.assertEqual(format_result(None), 'None')
+        with self.assertRaises(ValueError):
+            format_result(1, 'cientifico')
+    
+    def test_relatorios_com_resultados_enormes(self):
+        """Tabela, CSV e coletores aceitam resultados acima do limite de str()."""
+        import csv
+        import json
+        import os
+        import tempfile
+        value = climb_stairs_fast(50000)
+        sheet = DataSheet()
+        sheet.add_record("Fast", 50000, value, 0.001, 64)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            sheet.display()
+        self.assertIn(f"({decimal_digits(value)} dígitos)", output.getvalue())
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('p.csv', 'r.csv', 'r.jsonl'):
+                path = os.path.join(tmp, name)
+                if name == 'p.csv':
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        sheet.save_to_csv(path)
+                else:
+                    with open_sink(path) as sink:
+                        sink.write(sheet.last_record)
+                with open(path, newline='', encoding='utf-8') as f, self.unlimited_str_digits():
+                    if name.endswith('.csv'):
+                        written = int(next(csv.DictReader(f))['result'])
+                    else:
+                        written = json.loads(f.readline())['result']
+                self.assertEqual(written, value, name)
+
+
+class TestColumnarFormat(unittest.TestCase):
+    """Testa o formato binário por colunas (.npz)."""
+    
+    def setUp(self):
+        """Cria um diretório temporário."""
+        import os
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.tmp.name, name)
+    
+    def tearDown(self):
+        """Remove o diretório temporário."""
+        self.tmp.cleanup()
+    
+    def test_inteiros_grandes_ida_e_volta(self):
+        """Os bytes brutos reconstroem os inteiros exatamente."""
+        values = [0, 1, 255, 256, climb_stairs_fast(2000), 7]
+        data, offsets, digits = encode_big_ints(values)
+        self.assertEqual(decode_big_ints(data, offsets), values)
+        self.assertEqual(digits.tolist(), [len(str(v)) for v in values])
+        self.assertLess(len(data), len(str(values[4])))
+        with self.assertRaises(ValueError):
+            encode_big_ints([-1])
+    
+    def test_benchmark_npz_igual_ao_csv(self):
+        """O .npz tem as mesmas colunas do CSV e carrega só as pedidas."""
+        stats = {'median_time': 0.5, 'mean_time': 0.5, 'min_time': 0.4, 'max_time': 0.6,
+                 'stdev_time': 0.1, 'median_memory': 100, 'mean_memory': 100,
+                 'min_memory': 90, 'max_memory': 110, 'stdev_memory': 5,
+                 'num_executions': 3, 'protocol': 'separado'}
+        results = {'1. A': {10: stats, 20: {'status': 'timeout', 'protocol': 'separado'}}}
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_results_to_csv(results, self.path('r.csv'))
+            save_results_to_csv(results, self.path('r.npz'))
+        columns = ['Algoritmo', 'N', 'Mediana_Tempo_s', 'Chamadas', 'Status', 'Inexistente']
+        from_csv = load_columns(self.path('r.csv'), columns)
+        from_npz = load_columns(self.path('r.npz'), columns)
+        self.assertEqual(sorted(from_npz.columns), sorted(from_csv.columns))
+        self.assertNotIn('Inexistente', from_npz.columns)
+        for column in columns[:-1]:
+            self.assertEqual(from_npz[column].fillna(-1).tolist(),
+                             from_csv[column].fillna(-1).tolist(), column)
+    
+    def test_planilha_npz(self):
+        """DataSheet grava colunas tipadas e resultados em bytes brutos."""
+        sheet = DataSheet(protocol='separado')
+        sheet.add_record("DP", 3000, climb_stairs_fast(3000), 0.01, 64)
+        sheet.add_record("Rec", 5, 8, 0.02, 0, calls=15, max_depth=5, repeated_calls=6)
+        path = self.path('p.npz')
+        with contextlib.redirect_stdout(io.StringIO()):
+            sheet.save_to_csv(path)
+        df = load_columns(path)
+        self.assertEqual(df['algorithm'].tolist(), ["DP", "Rec"])
+        self.assertEqual(df['calls'].tolist(), [-1, 15])
+        self.assertEqual(df['result_digits'].tolist(), [len(str(climb_stairs_fast(3000))), 1])
+        self.assertEqual(set(df['protocol']), {'separado'})
+        self.assertEqual(load_big_ints(path, 'result'), [climb_stairs_fast(3000), 8])
 
 
 class TestPerformanceComparison(unittest.TestCase):
     """Testa comparações de desempenho."""
     
+    def test_pilha_sem_limite_de_recursao(self):
+        """A pilha explícita não depende do limite de recursão."""
+        import sys
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            self.assertEqual(climb_stairs_iterative_stack(22), climb_stairs_dp(22))
+        finally:
+            sys.setrecursionlimit(limit)
+    
     def test_dp_faster_than_recursion(self):
         """Verifica que DP é mais rápido que recursão pura."""
         n = 30
@@ -178,9 +1416,30 @@ def run_tests():
     
     # Adicionar todos os testes
     suite.addTests(loader.loadTestsFromTestCase(TestStaircaseSolutions))
+    suite.addTests(loader.loadTestsFromTestCase(TestCheckpointedDPTable))
+    suite.addTests(loader.loadTestsFromTestCase(TestGeneralizedSteps))
+    suite.addTests(loader.loadTestsFromTestCase(TestModularMode))
+    suite.addTests(loader.loadTestsFromTestCase(TestPisanoCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchQueries))
+    suite.addTests(loader.loadTestsFromTestCase(TestVectorizedQueries))
+    suite.addTests(loader.loadTestsFromTestCase(TestStream))
+    suite.addTests(loader.loadTestsFromTestCase(TestRecursionInstrumentation))
+    suite.addTests(loader.loadTestsFromTestCase(TestParallelBruteForce))
+    suite.addTests(loader.loadTestsFromTestCase(TestIsolatedBenchmark))
+    suite.addTests(loader.loadTestsFromTestCase(TestScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestMeasurementProtocol))
+    suite.addTests(loader.loadTestsFromTestCase(TestAdaptiveSampling))
+    suite.addTests(loader.loadTestsFromTestCase(TestQuantileSketch))
+    suite.addTests(loader.loadTestsFromTestCase(TestComplexityFit))
+    suite.addTests(loader.loadTestsFromTestCase(TestBenchmarkHistory))
+    suite.addTests(loader.loadTestsFromTestCase(TestResultCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestJournal))
     suite.addTests(loader.loadTestsFromTestCase(TestExecutionTime))
     suite.addTests(loader.loadTestsFromTestCase(TestMemoryConsumer))
     suite.addTests(loader.loadTestsFromTestCase(TestDataSheet))
+    suite.addTests(loader.loadTestsFromTestCase(TestRecordSink))
+    suite.addTests(loader.loadTestsFromTestCase(TestResultFormat))
+    suite.addTests(loader.loadTestsFromTestCase(TestColumnarFormat))
     suite.addTests(loader.loadTestsFromTestCase(TestPerformanceComparison))
     
     # Executar os testes
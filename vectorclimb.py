@@ -0,0 +1,78 @@
+"""
+Avaliação vetorizada (NumPy) de consultas modulares do Staircase Problem.
+
+Para um lote grande de consultas f(n) mod m, eleva a matriz de transição
+M = [[1, 1], [1, 0]] à potência n para TODOS os n de um ndarray ao mesmo
+tempo: M^n = [[F(n+1), F(n)], [F(n), F(n-1)]], logo f(n) = F(n+1) é a
+entrada (0, 0).
+
+ABORDAGEM: Exponenciação binária em lote
+- As potências M^(2^j) são iguais para todas as consultas (escalares)
+- Para cada bit j de max(n), um único passo vetorizado multiplica o
+  acumulador das consultas cujo bit j vale 1
+- Como M^k é simétrica, o acumulador 2x2 é guardado como (F(k), F(k+1))
+- Custo: O(log max(n)) passos, cada um O(len(ns)) em código nativo
+"""
+
+import numpy as np
+
+from dpclimb import check_modulus
+
+
+# Com mod <= 2^31, produtos < 2^62 e a soma de dois produtos cabe em int64
+INT64_SAFE_MODULUS = 2**31
+
+
+def climb_stairs_mod_vectorized(ns, mod):
+    """
+    Calcula f(n) mod m para um array de n com exponenciação de matriz em lote.
+
+    Args:
+        ns (array_like): Valores de n (inteiros que caibam em int64)
+        mod (int): Módulo (obrigatório)
+
+    Returns:
+        numpy.ndarray: f(n) mod m para cada n, na mesma forma de ns
+            (dtype int64 se mod <= 2^31, senão object com inteiros Python)
+
+    Complexidade:
+        Tempo: O(len(ns) · log max(ns)) operações vetorizadas
+        Espaço: O(len(ns)) - dois arrays do acumulador
+    """
+    if mod is None:
+        raise ValueError("climb_stairs_mod_vectorized exige mod")
+    check_modulus(mod)
+
+    ns = np.asarray(ns, dtype=np.int64)
+    # Acima de 2^31 os produtos estourariam int64: usa inteiros Python (object)
+    dtype = np.int64 if mod <= INT64_SAFE_MODULUS else object
+
+    positive = ns > 0
+    exponents = np.where(positive, ns, 0)
+
+    # Como toda potência M^k é [[F(k+1), F(k)], [F(k), F(k-1)]], o
+    # acumulador 2x2 fica determinado por (a, b) = (F(k), F(k+1)):
+    # R = M^0 = I para cada consulta
+    a = np.zeros(ns.shape, dtype=dtype)
+    b = np.full(ns.shape, 1 % mod, dtype=dtype)
+
+    # Base B = M^(2^j), igual para todas as consultas: (p, q) = (F(2^j), F(2^j+1))
+    p, q = 1 % mod, 1 % mod
+
+    max_n = int(exponents.max()) if exponents.size else 0
+    for j in range(max_n.bit_length()):
+        bit = ((exponents >> j) & 1).astype(bool)
+        if bit.any():
+            # R @ B:  F(k+l) = F(k)·F(l-1) + F(k+1)·F(l)
+            #         F(k+l+1) = F(k)·F(l) + F(k+1)·F(l+1)
+            c = (q - p) % mod  # F(2^j - 1)
+            new_a = (a * c + b * p) % mod
+            new_b = (a * p + b * q) % mod
+            a = np.where(bit, new_a, a)
+            b = np.where(bit, new_b, b)
+        # B = B @ B (escalares Python, sem risco de estouro)
+        p, q = p * (2 * q - p) % mod, (p * p + q * q) % mod
+
+    # f(n) = F(n+1) = entrada (0, 0) de M^n
+    zero = np.zeros(ns.shape, dtype=dtype)
+    return np.where(positive, b, zero)